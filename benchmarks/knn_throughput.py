@@ -0,0 +1,63 @@
+# knn_throughput.py
+# date: 2026-10-19
+
+import click
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import NearestNeighbors
+from threadpoolctl import threadpool_limits
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.knn_kernel import gemm_kneighbors, squared_norms
+
+def measure(function):
+    '''Return the wall time and peak traced memory (in MiB) of a call.'''
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak
+
+@click.command()
+@click.option('--n-queries', type=int, help="Number of query rows", default=200000)
+@click.option('--n-reference', type=int, help="Number of reference rows", default=400)
+@click.option('--n-features', type=int, help="Number of features", default=26)
+@click.option('--n-neighbors', type=int, help="Number of neighbours", default=4)
+@click.option('--tile-mb', type=int, multiple=True, help="Tile budgets to compare, in MiB (repeatable)", default=[1, 4, 16, 64])
+@click.option('--blas-threads', type=int, multiple=True, help="BLAS thread counts to compare (repeatable)", default=[1, os.cpu_count()])
+@click.option('--seed', type=int, help="Random seed", default=123)
+@click.option('--results-to', type=str, help="Optional: directory where knn_throughput.csv will be written to")
+
+def main(n_queries, n_reference, n_features, n_neighbors, tile_mb, blas_threads, seed, results_to):
+    '''Compares the throughput and peak memory of the tiled matrix product
+    k-nn kernel with scikit-learn's brute force k-nn search on random data.'''
+    rng = np.random.default_rng(seed)
+    reference = rng.normal(size=(n_reference, n_features))
+    queries = rng.normal(size=(n_queries, n_features))
+    reference_norms = squared_norms(reference)
+    sklearn_knn = NearestNeighbors(n_neighbors=n_neighbors, algorithm='brute').fit(reference)
+
+    rows = []
+    for threads in sorted(set(blas_threads)):
+        with threadpool_limits(limits=threads):
+            elapsed, peak = measure(lambda: sklearn_knn.kneighbors(queries))
+            rows.append({'engine': 'sklearn', 'tile_mb': None, 'threads': threads,
+                         'rows_per_s': n_queries / elapsed, 'peak_mb': peak})
+            for budget in tile_mb:
+                elapsed, peak = measure(lambda: gemm_kneighbors(queries, reference, n_neighbors, reference_norms,
+                                                                tile_bytes=budget * 2 ** 20))
+                rows.append({'engine': 'gemm', 'tile_mb': budget, 'threads': threads,
+                             'rows_per_s': n_queries / elapsed, 'peak_mb': peak})
+
+    throughput = pd.DataFrame(rows)
+    click.echo(throughput.to_string(index=False))
+    if results_to:
+        throughput.to_csv(os.path.join(results_to, "knn_throughput.csv"), index=False)
+
+if __name__ == '__main__':
+    main()
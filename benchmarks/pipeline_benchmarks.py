@@ -0,0 +1,211 @@
+# pipeline_benchmarks.py
+# date: 2026-10-19
+
+import click
+import contextlib
+import functools
+import os
+import sys
+import tempfile
+import threading
+import zipfile
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# the grid search refits 33 k-nn models on 30 folds, so by default it stops at this size
+GRID_SEARCH_MAX_ROWS = 10000
+CHUNK_SIZE = 10000
+LABELS = ['Benign', 'Malignant']
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def read_zip_case(context):
+    '''Download and extract the zipped raw data from a local HTTP server.'''
+    from src.read_zip import read_zip
+    serve_dir = os.path.join(context['workdir'], 'serve')
+    extract_dir = os.path.join(context['workdir'], 'extract')
+    os.makedirs(serve_dir)
+    os.makedirs(extract_dir)
+    with zipfile.ZipFile(os.path.join(serve_dir, 'wdbc.zip'), 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.write(context['raw_path'], 'wdbc.data')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_QuietHandler, directory=serve_dir))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/wdbc.zip"
+        yield lambda: read_zip(url, extract_dir)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextlib.contextmanager
+def clean_case(context):
+    '''Read the raw data, clean it and write it back out.'''
+    from src.clean_data import read_data, clean_data, write_data
+
+    def run():
+        cleaned = clean_data(read_data(context['raw_path'], context['colnames']), drop_columns=['id_number'])
+        write_data(cleaned, context['workdir'], 'cancer_clean.csv')
+    yield run
+
+
+@contextlib.contextmanager
+def validate_case(context):
+    '''Build the schema from the data configuration and validate the cleaned data.'''
+    from src.validate_data import build_schema_from_DataFrame, validate_data
+    expected = [name for name in context['colnames'] if name != 'id_number']
+
+    def run():
+        schema = build_schema_from_DataFrame(data_config=context['data_config'], expected_columns=expected)
+        validate_data(schema=schema, dataframe=context['cleaned'])
+    yield run
+
+
+@contextlib.contextmanager
+def split_scale_case(context):
+    '''Split the cleaned data into train and test sets and scale them.'''
+    from src.prepare_data import make_preprocessor, split_and_scale
+    yield lambda: split_and_scale(context['labelled'], make_preprocessor(), random_state=context['seed'])
+
+
+@contextlib.contextmanager
+def grid_search_case(context):
+    '''Tune k with the grid, folds and F2 scorer of the fit stage.'''
+    from sklearn.metrics import fbeta_score, make_scorer
+    from sklearn.model_selection import GridSearchCV
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import make_pipeline
+    from src.prepare_data import make_preprocessor
+    grid = GridSearchCV(
+        estimator=make_pipeline(make_preprocessor(), KNeighborsClassifier()),
+        param_grid={"kneighborsclassifier__n_neighbors": range(1, 100, 3)},
+        cv=30,
+        scoring=make_scorer(fbeta_score, pos_label='Malignant', beta=2)
+    )
+    labelled = context['labelled']
+    yield lambda: grid.fit(labelled.drop(columns=['class']), labelled['class'])
+
+
+def _chunks(dataframe):
+    return (dataframe.iloc[start:start + CHUNK_SIZE] for start in range(0, dataframe.shape[0], CHUNK_SIZE))
+
+
+@contextlib.contextmanager
+def evaluate_case(context):
+    '''Accumulate the confusion counts of the model chunk by chunk and score them.'''
+    from src.evaluation_metrics import accumulate_confusion_counts, scores_from_counts
+    from src.model_artifact import load_pipeline
+    pipeline = load_pipeline(context['pipeline_path'])
+
+    def run():
+        counts = accumulate_confusion_counts(_chunks(context['labelled']), pipeline.predict, LABELS)
+        scores_from_counts(counts, LABELS)
+    yield run
+
+
+def _predict_case(engine):
+    @contextlib.contextmanager
+    def case(context):
+        from src.batch_predict import load_engine, predict_chunk
+        model = load_engine(context['pipeline_path'], engine)
+        yield lambda: [predict_chunk(model, chunk) for chunk in _chunks(context['labelled'])]
+    case.__doc__ = f"Predict every row chunk by chunk with the {engine} engine."
+    return case
+
+
+# each case is set up (untimed) for a data size and yields the function to measure
+CASES = {
+    'read_zip': read_zip_case,
+    'clean': clean_case,
+    'validate': validate_case,
+    'split_scale': split_scale_case,
+    'grid_search': grid_search_case,
+    'evaluate': evaluate_case,
+    'predict': _predict_case('sklearn'),
+    'predict_numpy': _predict_case('numpy')
+}
+
+
+@click.command()
+@click.option('--raw-data', type=str, help="Path to raw data", default="data/raw/wdbc.data")
+@click.option('--name-file', type=str, help="Path to the names file of the raw data", default="data/raw/wdbc.names")
+@click.option('--data-config-file', type=str, help="Path to data configuration file", default="data/processed/data_config.csv")
+@click.option('--size', 'sizes', type=int, multiple=True, help="Numbers of rows to benchmark (repeatable)", default=[569, 10000, 100000, 1000000])
+@click.option('--benchmark', 'benchmarks', type=click.Choice(list(CASES)), multiple=True, help="Benchmarks to run (repeatable); by default all")
+@click.option('--repeats', type=int, help="Number of timed runs per benchmark; the fastest is kept", default=1)
+@click.option('--grid-search-max-rows', type=int, help="Largest size the grid search is run at", default=GRID_SEARCH_MAX_ROWS)
+@click.option('--seed', type=int, help="Random seed", default=123)
+@click.option('--results-to', type=str, help="Optional: JSON file the results will be written to, e.g. a new baseline")
+@click.option('--compare-to', type=str, help="Optional: baseline JSON file to compare the results to")
+@click.option('--tolerance', type=float, help="Relative slowdown or memory growth over the baseline reported as a regression", default=0.25)
+
+def main(raw_data, name_file, data_config_file, sizes, benchmarks, repeats, grid_search_max_rows, seed,
+         results_to, compare_to, tolerance):
+    '''Measures the wall time and peak memory of the pipeline steps, from
+    downloading the data to prediction, on the raw data resampled to each size.
+    Exits with an error if a result regresses against the baseline.'''
+    import pandas as pd
+    from sklearn import set_config
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import make_pipeline
+    from src.benchmarking import measure, resample_rows, write_results, read_results, compare_to_baseline
+    from src.clean_data import clean_data
+    from src.model_artifact import save_model_artifact
+    from src.prepare_data import read_column_names, make_preprocessor
+
+    set_config(transform_output="pandas")
+    baseline = read_results(compare_to) if compare_to else None
+    colnames = read_column_names(name_file)
+    raw = pd.read_csv(raw_data, header=None, names=colnames)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # predictions are benchmarked with a model fitted to the real data
+        labelled = clean_data(raw, drop_columns=['id_number']).rename(columns={'diagnosis': 'class'})
+        pipeline = make_pipeline(make_preprocessor(), KNeighborsClassifier(n_neighbors=7))
+        pipeline.fit(labelled.drop(columns=['class']), labelled['class'])
+        pipeline_path = os.path.join(workdir, 'cancer_pipeline')
+        save_model_artifact(pipeline, pipeline_path)
+
+        for n_rows in sizes:
+            sample = resample_rows(raw, n_rows, id_column='id_number', random_state=seed)
+            raw_path = os.path.join(workdir, 'wdbc.data')
+            sample.to_csv(raw_path, header=False, index=False)
+            cleaned = clean_data(sample, drop_columns=['id_number'])
+            context = {
+                'raw_path': raw_path, 'colnames': colnames, 'data_config': pd.read_csv(data_config_file),
+                'cleaned': cleaned, 'labelled': cleaned.rename(columns={'diagnosis': 'class'}),
+                'pipeline_path': pipeline_path, 'seed': seed
+            }
+            for name in benchmarks or CASES:
+                if name == 'grid_search' and n_rows > grid_search_max_rows:
+                    continue
+                with tempfile.TemporaryDirectory(dir=workdir) as case_dir:
+                    with CASES[name](dict(context, workdir=case_dir)) as function:
+                        measured = measure(function, repeats)
+                results.append({'benchmark': name, 'n_rows': n_rows, **measured,
+                                'rows_per_s': n_rows / measured['seconds']})
+                click.echo(f"{name:>14} {n_rows:>9} rows: {measured['seconds']:9.3f} s "
+                           f"{measured['peak_mb']:9.1f} MiB")
+
+    if results_to:
+        write_results(results, results_to)
+    if baseline is not None:
+        comparison = compare_to_baseline(results, baseline, tolerance)
+        click.echo(comparison.to_string(index=False))
+        regressions = comparison[comparison['regression']]
+        if not regressions.empty:
+            raise click.ClickException(
+                "Regressions over the baseline: " +
+                ', '.join(f"{row.benchmark} ({row.n_rows} rows)" for row in regressions.itertuples()) + "."
+            )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# startup_time.py
+# date: 2026-10-19
+
+import click
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# each path imports what it needs, loads the model and scores one row in a fresh interpreter
+PATHS = {
+    'sklearn pickle': '''
+import json, pickle, sys
+import pandas as pd
+from sklearn import set_config
+set_config(transform_output="pandas")
+cancer_fit = pickle.load(open(sys.argv[1], "rb"))
+print(cancer_fit.predict(pd.DataFrame([json.loads(sys.argv[2])]))[0])
+''',
+    'sklearn artifact': '''
+import json, sys
+import pandas as pd
+from sklearn import set_config
+from src.model_artifact import load_pipeline
+set_config(transform_output="pandas")
+cancer_fit = load_pipeline(sys.argv[1])
+print(cancer_fit.predict(pd.DataFrame([json.loads(sys.argv[2])]))[0])
+''',
+    'numpy artifact': '''
+import json, sys
+from src.numpy_predictor import NumpyKNNPredictor
+predictor = NumpyKNNPredictor.from_artifact(sys.argv[1])
+row = json.loads(sys.argv[2])
+print(predictor.predict([[row[name] for name in predictor.feature_names_in_]])[0])
+'''
+}
+
+def time_path(code, model_path, row, repeats):
+    '''Run a scoring path in `repeats` fresh interpreters; return the wall times and the prediction.'''
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code, model_path, row],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+    return times, result.stdout.strip()
+
+@click.command()
+@click.option('--pipeline-pickle', type=str, help="Path to the pickled pipeline object")
+@click.option('--pipeline-artifact', type=str, help="Path to the model artifact directory")
+@click.option('--sample-data', type=str, help="Path to a CSV file whose first row is scored")
+@click.option('--repeats', type=int, help="Number of cold starts per path", default=10)
+@click.option('--results-to', type=str, help="Optional: directory where startup_times.csv will be written to")
+
+def main(pipeline_pickle, pipeline_artifact, sample_data, repeats, results_to):
+    '''Measures the cold-start time (interpreter start, imports, model
+    load and one prediction) of the scikit-learn and NumPy scoring paths.'''
+    sample = pd.read_csv(sample_data, nrows=1).drop(columns=['class', 'diagnosis', 'id'], errors='ignore')
+    row = json.dumps(sample.iloc[0].to_dict())
+
+    rows = []
+    for name, code in PATHS.items():
+        model_path = pipeline_pickle if name == 'sklearn pickle' else pipeline_artifact
+        if not model_path:
+            continue
+        times, prediction = time_path(code, os.path.abspath(model_path), row, repeats)
+        rows.append({'path': name, 'median_s': statistics.median(times), 'min_s': min(times),
+                     'max_s': max(times), 'prediction': prediction})
+
+    startup_times = pd.DataFrame(rows)
+    click.echo(startup_times.to_string(index=False))
+    if results_to:
+        startup_times.to_csv(os.path.join(results_to, "startup_times.csv"), index=False)
+
+if __name__ == '__main__':
+    main()
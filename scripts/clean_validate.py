@@ -5,44 +5,55 @@
 import click
 import os
 import sys
-import pandas as pd
-import pandera as pa
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.clean_data import extract_column_name, read_data, clean_data, write_data
-from src.validate_data import build_schema_from_DataFrame, validate_data
+from src.profiling import profiled, record_rows
+from src.datasets import DATASETS
 
 @click.command()
-@click.option('--raw-data-file', type=str, help="Path to raw data file")
+@click.option('--raw-data-file', type=str, help="Path to raw data file, or a directory or glob pattern (quoted) of raw data shards")
 @click.option('--name-file', type=str, help="Path to names file")
 @click.option('--data-config-file', type=str, help="Path to data configuration file")
+@click.option('--dataset', type=click.Choice(list(DATASETS)), help="The data set of the archive the raw data is", default='wdbc')
 @click.option('--write-to', type=str, help="Path to directory where cleaned data will be written to")
-@click.option('--file-name', type=str, help="The name of the file will be written")
-
-def main(raw_data_file, name_file, data_config_file, write_to, written_file_name):
-    """Clean raw data and validate it."""
-    # Extract column names from .names file
-    with open(name_file, 'r') as f:
-        raw_lines = [line.strip() for line in f if not line.startswith('#') and line.strip()]
-
-    colnames = extract_column_name(raw_lines)
-
-    # Read raw data
-    imported_data = read_data(raw_data_file, colnames)
-
-    # Removing id column and relabel diagnosis column
-    cleaned_data = clean_data(imported_data)
-
-    
-    # Create schema
-    config_df = pd.read_csv(data_config_file)
-    
-    clean_colnames = colnames.remove("id_number")
-    schema = build_schema_from_DataFrame(data_config=config_df, expected_columns=clean_colnames)
-    # Validate cleaned data
-    validate_data(schema=schema, dataframe=cleaned_data)
-
-    # Write data to specified directory
-    write_data(cleaned_data, write_to, written_file_name)
+@click.option('--file-name', type=str, help="The name of the file will be written; for shards, the name (without extension) of the directory of partitions")
+@click.option('--report-to', type=str, help="Optional: path to the JSON validation report of shards (default: <file name>_validation_report.json in --write-to)")
+@click.option('--n-jobs', type=int, help="Number of worker processes validating shards", default=1)
+
+@profiled
+def main(raw_data_file, name_file, data_config_file, dataset, write_to, file_name, report_to, n_jobs):
+    """Clean raw data and validate it. A directory or glob pattern of shards is
+    cleaned and validated shard by shard in parallel, with the null fraction and
+    duplicate rows checks applied across all shards, and written as one
+    partition per shard with a consolidated validation report."""
+    import pandas as pd
+    from src.clean_data import write_data
+    from src.prepare_data import clean_and_validate, read_column_names
+    from src.sharded_data import find_shards, clean_and_validate_shards, write_report
+
+    if os.path.isfile(raw_data_file):
+        # Extract column names, read and clean the raw data, and validate it
+        cleaned_data = clean_and_validate(raw_data_file, name_file, pd.read_csv(data_config_file), DATASETS[dataset])
+        record_rows(cleaned_data.shape[0])
+
+        # Write data to specified directory
+        write_data(cleaned_data, write_to, file_name)
+        return
+
+    if not os.path.isdir(write_to):
+        raise FileNotFoundError('The directory provided does not exist.')
+    shards = find_shards(raw_data_file)
+    stem = os.path.splitext(file_name)[0]
+    report = clean_and_validate_shards(shards, read_column_names(name_file, DATASETS[dataset].statistics),
+                                       pd.read_csv(data_config_file), os.path.join(write_to, stem),
+                                       DATASETS[dataset], n_jobs)
+    record_rows(report['rows'])
+    report_to = report_to or os.path.join(write_to, stem + "_validation_report.json")
+    write_report(report, report_to)
+    if not report['valid']:
+        failed = sum(shard['failures'] > 0 for shard in report['shards'])
+        raise click.ClickException(f"Validation failed: {failed} of {len(shards)} shard(s) have invalid rows and "
+                                   f"{len(report['global_failures'])} check(s) across shards failed; see {report_to}.")
+    click.echo(f"Validated {report['rows']} rows in {len(shards)} shard(s) into {report['partitions']}.")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
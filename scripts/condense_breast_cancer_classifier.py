@@ -0,0 +1,105 @@
+# condense_breast_cancer_classifier.py
+# date: 2026-10-19
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled, record_rows
+
+@click.command()
+@click.option('--training-data', type=str, help="Path to training data")
+@click.option('--scaled-test-data', type=str, help="Path to test data used to compare the full and condensed models")
+@click.option('--columns-to-drop', type=str, help="Optional: columns to drop")
+@click.option('--pipeline-from', type=str, help="Path to the model artifact directory (or a pickled pipeline object)")
+@click.option('--method', type=click.Choice(['cnn', 'enn', 'enn+cnn', 'kmeans']), help="Condensation method", default='enn+cnn')
+@click.option('--n-prototypes', type=int, help="Prototypes per class (kmeans method only)", default=20)
+@click.option('--pipeline-to', type=str, help="Path to directory where the condensed model artifact will be written to")
+@click.option('--results-to', type=str, help="Path to directory where the comparison table will be written to")
+@click.option('--seed', type=int, help="Random seed", default=123)
+@click.option('--precision', type=click.Choice(['float64', 'float32']), help="Floating point precision of the training and test data", default='float64')
+
+@profiled
+def main(training_data, scaled_test_data, columns_to_drop, pipeline_from, method,
+         n_prototypes, pipeline_to, results_to, seed, precision):
+    '''Condenses the reference set stored by the tuned k-nn classifier,
+    saves the condensed model artifact and reports the change in
+    accuracy and F2 score against the full model.'''
+    import numpy as np
+    import pandas as pd
+    from sklearn import set_config
+    from sklearn.base import clone
+    from sklearn.pipeline import Pipeline
+    from sklearn.metrics import fbeta_score, accuracy_score
+    from src.condense_data import condense_data
+    from src.numeric_precision import cast_to_precision
+    from src.model_artifact import labels_from_probabilities, load_pipeline, save_model_artifact
+
+    np.random.seed(seed)
+    set_config(transform_output="pandas")
+
+    # read in data & cancer_fit (pipeline object)
+    cancer_train = cast_to_precision(pd.read_csv(training_data), precision)
+    cancer_test = cast_to_precision(pd.read_csv(scaled_test_data), precision)
+    if columns_to_drop:
+        to_drop = pd.read_csv(columns_to_drop).feats_to_drop.tolist()
+        cancer_train = cancer_train.drop(columns=to_drop)
+        cancer_test = cancer_test.drop(columns=to_drop)
+    full_pipeline = load_pipeline(pipeline_from)
+    record_rows(cancer_train.shape[0] + cancer_test.shape[0])
+
+    # condense the training set in the space the k-nn classifier measures distances in
+    preprocessor = full_pipeline[:-1]
+    knn_name, knn = full_pipeline.steps[-1]
+    scaled_cancer_train = preprocessor.transform(cancer_train.drop(columns=["class"]))
+    if not isinstance(scaled_cancer_train, pd.DataFrame):
+        # pipelines loaded from model artifacts scale to plain arrays
+        scaled_cancer_train = pd.DataFrame(scaled_cancer_train)
+    reference_X, reference_y = condense_data(
+        scaled_cancer_train,
+        cancer_train["class"],
+        method=method,
+        n_neighbors=knn.n_neighbors,
+        n_prototypes=n_prototypes,
+        random_state=seed
+    )
+
+    condensed_knn = clone(knn).set_params(
+        n_neighbors=min(knn.n_neighbors, reference_X.shape[0])
+    )
+    condensed_knn.fit(reference_X, reference_y)
+    condensed_pipeline = Pipeline(full_pipeline.steps[:-1] + [(knn_name, condensed_knn)])
+
+    # the condensed model keeps the decision threshold saved with the full one
+    decision_threshold = getattr(full_pipeline, 'artifact_metadata_', {}).get('decision_threshold')
+    condensed_metadata = {'condensation_method': method}
+    if decision_threshold is not None:
+        condensed_metadata['decision_threshold'] = decision_threshold
+    save_model_artifact(
+        condensed_pipeline,
+        os.path.join(pipeline_to, "cancer_pipeline_condensed"),
+        metadata=condensed_metadata
+    )
+
+    # compare the full and condensed models on the test data
+    scores = []
+    for model, pipeline, n_reference in [("full", full_pipeline, knn.n_samples_fit_),
+                                         ("condensed", condensed_pipeline, reference_X.shape[0])]:
+        predicted = labels_from_probabilities(pipeline.predict_proba(cancer_test.drop(columns=["class"])),
+                                              pipeline.classes_, decision_threshold)
+        scores.append({
+            'model': model,
+            'reference_set_size': n_reference,
+            'accuracy': accuracy_score(cancer_test["class"], predicted),
+            'F2 score (beta = 2)': fbeta_score(cancer_test["class"], predicted,
+                                               beta=2, pos_label='Malignant')
+        })
+    condensation_scores = pd.DataFrame(scores).set_index('model')
+    condensation_scores.loc['difference'] = (
+        condensation_scores.loc['condensed'] - condensation_scores.loc['full']
+    )
+    condensation_scores = condensation_scores.astype({'reference_set_size': int})
+    condensation_scores.to_csv(os.path.join(results_to, "condensation_scores.csv"))
+
+if __name__ == '__main__':
+    main()
@@ -6,20 +6,40 @@ import click
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.read_zip import read_zip
+from src.profiling import profiled, record_rows
 
 @click.command()
 @click.option('--url', type=str, help="URL of dataset to be downloaded")
 @click.option('--write-to', type=str, help="Path to directory where raw data will be written to")
+@click.option('--pipelined', is_flag=True, help="Extract each file of the zip file (and clean each data set, with --clean-to) while the rest is still downloading")
+@click.option('--clean-to', type=str, help="Optional: path to directory where each data set of the archive will be written to, cleaned and validated (with --pipelined)")
+
+@profiled
+def main(url, write_to, pipelined, clean_to):
+    """Downloads data zip data from the web to a local filepath and extracts it.
+    With --pipelined, the download, extraction and cleaning run concurrently,
+    connected by bounded queues."""
+    from src.read_zip import read_zip
+
+    if clean_to and not pipelined:
+        raise click.UsageError("--clean-to requires --pipelined.")
+
+    def fetch():
+        if not pipelined:
+            return read_zip(url, write_to)
+        from src.pipelined_ingest import ingest
+
+        result = ingest(url, write_to, clean_to=clean_to)
+        record_rows(sum(result['rows'].values()))
+        click.echo("Ingested {} files in {total:.2f} s (download {download:.2f} s, extract {extract:.2f} s, "
+                   "clean {parse:.2f} s).".format(len(result['members']), **result['seconds']))
 
-def main(url, write_to):
-    """Downloads data zip data from the web to a local filepath and extracts it."""
     try:
-        read_zip(url, write_to)
+        fetch()
     except FileNotFoundError as e:
         if e.args == 'The directory provided does not exist.':
             os.makedirs(write_to)
-            read_zip(url, write_to)
+            fetch()
         else:
             raise e
 
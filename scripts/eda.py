@@ -4,35 +4,39 @@
 
 import click
 import os
-import altair as alt
-import numpy as np
-import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled, record_rows
 
 @click.command()
 @click.option('--processed-training-data', type=str, help="Path to processed training data")
 @click.option('--plot-to', type=str, help="Path to directory where the plot will be written to")
 
+@profiled
 def main(processed_training_data, plot_to):
     '''Plots the densities of each feature in the processed training data
         by class and displays them as a grid of plots. Also saves the plot.'''
+    import altair as alt
+    import numpy as np
+    import pandas as pd
+    from src.feature_density import feature_densities
+    from src.figure_rendering import render_figures
 
     scaled_cancer_train = pd.read_csv(processed_training_data)
+    record_rows(scaled_cancer_train.shape[0])
 
-    # melt for plotting via facets 
-    cancer_train_melted = scaled_cancer_train.melt(
-        id_vars=['class'],
-        var_name='predictor',
-        value_name='value'
+    # estimate the densities here, so the chart only carries the grid points
+    # (classes x features x 200) instead of every observation; 4 decimals is
+    # well below what the plot can show and keeps the spec small
+    cancer_train_densities = feature_densities(scaled_cancer_train, target='class').round(
+        {'value': 4, 'density': 4}
     )
 
     # make columns names nicer for plotting
-    cancer_train_melted['predictor'] = cancer_train_melted['predictor'].str.replace('_',' ')
+    cancer_train_densities['predictor'] = cancer_train_densities['predictor'].str.replace('_',' ')
 
     # exploratory data analysis - visualize predictor distributions across classes
-    plot = alt.Chart(cancer_train_melted, width=150, height=100).transform_density(
-        'value',
-        groupby=['class', 'predictor']
-    ).mark_area(opacity=0.7).encode(
+    plot = alt.Chart(cancer_train_densities, width=150, height=100).mark_area(opacity=0.7).encode(
         x="value:Q",
         y=alt.Y('density:Q').stack(False),
         color='class:N'
@@ -43,8 +47,9 @@ def main(processed_training_data, plot_to):
         y='independent'
     )
 
-    plot.save(os.path.join(plot_to, "feature_densities_by_class.png"),
-              scale_factor=2.0)
+    # only re-rendered when the chart (including its data) changed
+    render_figures({os.path.join(plot_to, "feature_densities_by_class.png"): plot},
+                   scale_factor=2.0)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -4,64 +4,92 @@
 
 import click
 import os
-import numpy as np
-import pandas as pd
-import pickle
-from sklearn import set_config
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.compose import make_column_transformer, make_column_selector
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.pipeline import make_pipeline
-from sklearn.model_selection import GridSearchCV
-from sklearn.metrics import fbeta_score, make_scorer
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled, record_rows
 
 @click.command()
 @click.option('--scaled-test-data', type=str, help="Path to scaled test data")
 @click.option('--columns-to-drop', type=str, help="Optional: columns to drop")
-@click.option('--pipeline-from', type=str, help="Path to directory where the fit pipeline object lives")
-@click.option('--results-to', type=str, help="Path to directory where the plot will be written to")
+@click.option('--pipeline-from', type=str, help="Path to the model artifact directory (or a pickled pipeline object)")
+@click.option('--results-to', type=str, help="Path to directory where the evaluation results will be written to")
+@click.option('--pos-label', type=str, help="The class scored as positive by the F2 score", default='Malignant')
 @click.option('--seed', type=int, help="Random seed", default=123)
+@click.option('--precision', type=click.Choice(['float64', 'float32']), help="Floating point precision of the test data", default='float64')
+@click.option('--chunk-size', type=int, help="Optional: stream the test data in chunks of this many rows")
+@click.option('--bootstrap-replicates', type=int, help="Optional: number of bootstrap replicates for confidence intervals", default=0)
+@click.option('--confidence-level', type=float, help="Coverage of the bootstrap confidence intervals", default=0.95)
 
-def main(scaled_test_data, columns_to_drop, pipeline_from, results_to, seed):
+@profiled
+def main(scaled_test_data, columns_to_drop, pipeline_from, results_to, pos_label, seed, precision, chunk_size,
+         bootstrap_replicates, confidence_level):
     '''Evaluates the breast cancer classifier on the test data 
-    and saves the evaluation results.'''
+    and saves the evaluation results. The decision threshold saved in a
+    model artifact by threshold_analysis.py --save-threshold is applied;
+    the test scores then also list those of the most probable class.'''
+    import numpy as np
+    import pandas as pd
+    from sklearn import set_config
+    from src.numeric_precision import cast_to_precision
+    from src.model_artifact import load_pipeline, labels_from_probabilities
+    from src.evaluation_metrics import (confusion_counts, scores_from_counts, per_class_scores,
+                                        confusion_matrix_frame, bootstrap_scores)
+
     np.random.seed(seed)
     set_config(transform_output="pandas")
 
-    # read in data & cancer_fit (pipeline object)
-    cancer_test = pd.read_csv(scaled_test_data)
-    if columns_to_drop:
-        to_drop = pd.read_csv(columns_to_drop).feats_to_drop.tolist()
-        cancer_test = cancer_test.drop(columns=to_drop)
-    with open(pipeline_from, 'rb') as f:
-        cancer_fit = pickle.load(f)
-
-    # Compute accuracy
-    accuracy = cancer_fit.score(
-        cancer_test.drop(columns=["class"]),
-        cancer_test["class"]
+    # read in cancer_fit (pipeline object) & data, chunk by chunk when streaming
+    cancer_fit = load_pipeline(pipeline_from)
+    to_drop = pd.read_csv(columns_to_drop).feats_to_drop.tolist() if columns_to_drop else []
+    cancer_test = pd.read_csv(
+        scaled_test_data,
+        usecols=lambda col: col not in to_drop,
+        chunksize=chunk_size
     )
+    if not chunk_size:
+        cancer_test = [cancer_test]
 
-    # Compute F2 score (beta = 2)
-    cancer_preds = cancer_test.assign(
-        predicted=cancer_fit.predict(cancer_test)
-    )
-    f2_beta_2_score = fbeta_score(
-        cancer_preds['class'],
-        cancer_preds['predicted'],
-        beta=2,
-        pos_label='Malignant'
-    )
+    # predict once per row, with the decision threshold saved in the artifact (if any),
+    # as batch prediction and the server do; every metric is derived from the confusion counts.
+    # With a threshold, the counts of the most probable class are kept from the same probabilities
+    labels = list(cancer_fit.classes_)
+    decision_threshold = getattr(cancer_fit, 'artifact_metadata_', {}).get('decision_threshold')
+    counts = np.zeros((len(labels), len(labels)), dtype=np.int64)
+    most_probable_counts = np.zeros_like(counts)
+    for chunk in cancer_test:
+        if chunk.shape[0] == 0:
+            continue
+        chunk = cast_to_precision(chunk, precision)
+        probabilities = cancer_fit.predict_proba(chunk.drop(columns=["class"]))
+        counts += confusion_counts(chunk["class"], labels_from_probabilities(probabilities, labels, decision_threshold),
+                                   labels)
+        if decision_threshold is not None:
+            most_probable_counts += confusion_counts(chunk["class"], labels_from_probabilities(probabilities, labels),
+                                                     labels)
+    record_rows(counts.sum())
 
-    test_scores = pd.DataFrame({'accuracy': [accuracy], 'F2 score (beta = 2)': [f2_beta_2_score]})
+    # Compute accuracy and F2 score (beta = 2); the first row is the decision rule the model applies
+    scores = scores_from_counts(counts, labels, pos_label=pos_label, beta=2)
+    test_scores = pd.DataFrame({'accuracy': [scores['accuracy']], 'F2 score (beta = 2)': [scores['fbeta']]})
+    if decision_threshold is not None:
+        most_probable_scores = scores_from_counts(most_probable_counts, labels, pos_label=pos_label, beta=2)
+        test_scores.loc[1] = [most_probable_scores['accuracy'], most_probable_scores['fbeta']]
+        test_scores.insert(0, 'decision_rule', [f"saved threshold ({decision_threshold['threshold']:.3g})",
+                                                'most probable class'])
     test_scores.to_csv(os.path.join(results_to, "test_scores.csv"), index=False)
 
-    confusion_matrix = pd.crosstab(
-        cancer_preds["class"],
-        cancer_preds["predicted"],
-    )
-    confusion_matrix.to_csv(os.path.join(results_to, "confusion_matrix.csv"))
+    confusion_matrix_frame(counts, labels).to_csv(os.path.join(results_to, "confusion_matrix.csv"))
+    per_class_scores(counts, labels, beta=2).to_csv(os.path.join(results_to, "class_scores.csv"))
+
+    # Compute bootstrap confidence intervals from the same confusion counts
+    if bootstrap_replicates:
+        bootstrap_test_scores = bootstrap_scores(
+            counts, labels, pos_label=pos_label, beta=2,
+            n_replicates=bootstrap_replicates,
+            confidence_level=confidence_level,
+            random_state=seed
+        ).rename(index={'fbeta': 'F2 score (beta = 2)'})
+        bootstrap_test_scores.to_csv(os.path.join(results_to, "test_scores_bootstrap.csv"))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
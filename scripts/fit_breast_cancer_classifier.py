@@ -4,34 +4,47 @@
 
 import click
 import os
-import altair as alt
-import numpy as np
-import pandas as pd
+import sys
 import pickle
-from sklearn import set_config
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.pipeline import make_pipeline
-from sklearn.model_selection import GridSearchCV
-from sklearn.metrics import fbeta_score, make_scorer
-from joblib import dump
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled, record_rows
 
 @click.command()
 @click.option('--training-data', type=str, help="Path to training data")
 @click.option('--preprocessor', type=str, help="Path to preprocessor object")
 @click.option('--columns-to-drop', type=str, help="Optional: columns to drop")
-@click.option('--pipeline-to', type=str, help="Path to directory where the pipeline object will be written to")
-@click.option('--plot-to', type=str, help="Path to directory where the plot will be written to")
+@click.option('--pipeline-to', type=str, help="Path to directory where the model artifact will be written to")
+@click.option('--cv-results-to', type=str, help="Path to directory where the cross-validation results will be written to")
+@click.option('--pos-label', type=str, help="The class scored as positive by the F2 score", default='Malignant')
 @click.option('--seed', type=int, help="Random seed", default=123)
+@click.option('--precision', type=click.Choice(['float64', 'float32']), help="Floating point precision of the training data", default='float64')
+@click.option('--data-config-file', type=str, help="Optional: path to the data configuration; saves the training data profile used to monitor drift with the model artifact")
 
-def main(training_data, preprocessor, columns_to_drop, pipeline_to, plot_to, seed):
+@profiled
+def main(training_data, preprocessor, columns_to_drop, pipeline_to, cv_results_to, pos_label, seed, precision,
+         data_config_file):
     '''Fits a breast cancer classifier to the training data 
-    and saves the pipeline object.'''
+    and saves the best pipeline as a model artifact. The cross-validation
+    results are cached, so refitting on unchanged inputs skips the grid search.'''
+    import numpy as np
+    import pandas as pd
+    from sklearn import set_config
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import make_pipeline
+    from sklearn.model_selection import GridSearchCV
+    from sklearn.metrics import fbeta_score, make_scorer
+    from src.numeric_precision import cast_to_precision
+    from src.model_artifact import save_model_artifact
+    from src.tuning_cache import hash_inputs, hash_file, write_cv_results, read_cache_key, read_cv_results
+    from src.drift_monitor import DriftMonitor, DRIFT_REFERENCE_FILE
+
     np.random.seed(seed)
     set_config(transform_output="pandas")
 
     # read in data & preprocessor
-    cancer_train = pd.read_csv(training_data)
+    cancer_train = cast_to_precision(pd.read_csv(training_data), precision)
     cancer_preprocessor = pickle.load(open(preprocessor, "rb"))
+    record_rows(cancer_train.shape[0])
 
     if columns_to_drop:
         to_drop = pd.read_csv(columns_to_drop).feats_to_drop.tolist()
@@ -46,54 +59,56 @@ def main(training_data, preprocessor, columns_to_drop, pipeline_to, plot_to, see
     }
 
     cv = 30
-    cancer_tune_grid = GridSearchCV(
-        estimator=cancer_tune_pipe,
-        param_grid=parameter_grid,
-        cv=cv,
-        scoring=make_scorer(fbeta_score, pos_label='Malignant', beta=2)
-    )
-
-    cancer_fit = cancer_tune_grid.fit(
-        cancer_train.drop(columns=["class"]),
-        cancer_train["class"]
-    )
-
-    with open(os.path.join(pipeline_to, "cancer_pipeline.pickle"), 'wb') as f:
-        pickle.dump(cancer_fit, f)
-
-    accuracies_grid = pd.DataFrame(cancer_fit.cv_results_)
-
-    accuracies_grid = (
-        accuracies_grid[[
-            "param_kneighborsclassifier__n_neighbors",
-            "mean_test_score",
-            "std_test_score"
-        ]]
-        .assign(
-            sem_test_score=accuracies_grid["std_test_score"] / cv**(1/2),
-            # `lambda` allows access to the chained dataframe so that we can use the newly created `sem_test_score` column 
-            sem_test_score_lower=lambda df: df["mean_test_score"] - (df["sem_test_score"]/2),
-            sem_test_score_upper=lambda df: df["mean_test_score"] + (df["sem_test_score"]/2)
+    cache_key = hash_inputs(cancer_train, {
+        'parameter_grid': {name: list(values) for name, values in parameter_grid.items()},
+        'cv': cv,
+        'scoring': {'metric': 'fbeta_score', 'pos_label': pos_label, 'beta': 2},
+        'preprocessor': hash_file(preprocessor),
+        'seed': seed
+    })
+    cv_results_path = os.path.join(cv_results_to, "cv_results.npz")
+
+    if read_cache_key(cv_results_path) == cache_key:
+        # cache hit: only refit the best pipeline found by the cached grid search
+        cv_results = read_cv_results(cv_results_path)
+        best = cv_results.loc[cv_results["rank_test_score"].idxmin()]
+        best_params, best_score = best["params"], float(best["mean_test_score"])
+        cancer_fit = cancer_tune_pipe.set_params(**best_params).fit(
+            cancer_train.drop(columns=["class"]),
+            cancer_train["class"]
+        )
+    else:
+        cancer_tune_grid = GridSearchCV(
+            estimator=cancer_tune_pipe,
+            param_grid=parameter_grid,
+            cv=cv,
+            scoring=make_scorer(fbeta_score, pos_label=pos_label, beta=2)
         )
-        .rename(columns={"param_kneighborsclassifier__n_neighbors": "n_neighbors"})
-        .drop(columns=["std_test_score"])
-    )
-
-    line_n_point = alt.Chart(accuracies_grid, width=600).mark_line(color="black").encode(
-        x=alt.X("n_neighbors").title("Neighbors"),
-        y=alt.Y("mean_test_score")
-            .scale(zero=False) 
-            .title("F2 score (beta = 2)")
-    )
 
-    error_bar = alt.Chart(accuracies_grid).mark_errorbar().encode(
-        alt.Y("sem_test_score_upper:Q").scale(zero=False).title("F2 score (beta = 2)"),
-        alt.Y2("sem_test_score_lower:Q"),
-        alt.X("n_neighbors:Q").title("Neighbors")
+        cancer_tune_grid.fit(
+            cancer_train.drop(columns=["class"]),
+            cancer_train["class"]
+        )
+        write_cv_results(cancer_tune_grid.cv_results_, cv_results_path, cache_key)
+        best_params, best_score = cancer_tune_grid.best_params_, cancer_tune_grid.best_score_
+        cancer_fit = cancer_tune_grid.best_estimator_
+
+    # only the best estimator is kept, as memory-mappable arrays + a metadata header
+    save_model_artifact(
+        cancer_fit,
+        os.path.join(pipeline_to, "cancer_pipeline"),
+        metadata={
+            'best_params': {name: int(value) for name, value in best_params.items()},
+            'best_score': float(best_score),
+            'cv_results_key': cache_key
+        }
     )
 
-    plot = line_n_point + line_n_point.mark_circle(color='black') + error_bar
-    plot.save(os.path.join(plot_to, "cancer_choose_k.png"), scale_factor=2.0)
+    # the moments and histograms of the training features that scored data is compared to
+    if data_config_file:
+        DriftMonitor.from_training_data(cancer_train.drop(columns=["class"]), pd.read_csv(data_config_file)).save(
+            os.path.join(pipeline_to, "cancer_pipeline", DRIFT_REFERENCE_FILE)
+        )
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,40 @@
+# generate_synthetic_data.py
+# date: 2026-10-19
+
+import click
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled, record_rows
+
+@click.command()
+@click.option('--raw-data', type=str, help="Path to raw data the generator is fitted to")
+@click.option('--name-file', type=str, help="Path to the names file of the raw data")
+@click.option('--data-config-file', type=str, help="Path to data configuration file")
+@click.option('--write-to', type=str, help="Path to the .csv, .data, .zip or .parquet file the synthetic data will be written to")
+@click.option('--n-rows', type=int, help="Number of rows to generate", default=1000000)
+@click.option('--chunk-size', type=int, help="Number of rows generated at a time", default=100000)
+@click.option('--n-jobs', type=int, help="Number of worker processes (default: all cores)", default=os.cpu_count())
+@click.option('--null-fraction', type=float, help="Fraction of missing values in every feature column", default=0.0)
+@click.option('--seed', type=int, help="Random seed", default=123)
+
+@profiled
+def main(raw_data, name_file, data_config_file, write_to, n_rows, chunk_size, n_jobs, null_fraction, seed):
+    '''Generates synthetic tumour measurements in the layout of the raw
+    data, with its class-conditional feature distributions and correlations
+    and within the ranges of the data configuration, for load testing.'''
+    import pandas as pd
+    from src.clean_data import read_data
+    from src.prepare_data import read_column_names
+    from src.synthetic_data import fit_generator, write_synthetic_data
+
+    generator = fit_generator(read_data(raw_data, read_column_names(name_file)), pd.read_csv(data_config_file))
+    start = time.perf_counter()
+    write_synthetic_data(generator, write_to, n_rows, chunk_size, n_jobs, null_fraction, random_state=seed)
+    record_rows(n_rows)
+    elapsed = time.perf_counter() - start
+    click.echo(f"Wrote {n_rows} rows in {elapsed:.2f} s ({n_rows / elapsed:,.0f} rows/sec)")
+
+if __name__ == '__main__':
+    main()
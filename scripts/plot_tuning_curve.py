@@ -0,0 +1,59 @@
+# plot_tuning_curve.py
+# date: 2026-10-19
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled
+
+@click.command()
+@click.option('--cv-results', type=str, help="Path to the cross-validation results written by the fit stage")
+@click.option('--plot-to', type=str, help="Path to directory where the plot will be written to")
+
+@profiled
+def main(cv_results, plot_to):
+    '''Plots the cross-validated F2 score of the k-nn classifier
+    against the number of neighbours and saves the plot.'''
+    import altair as alt
+    from src.tuning_cache import read_cv_results
+    from src.figure_rendering import render_figures
+
+    accuracies_grid = read_cv_results(cv_results)
+    cv = accuracies_grid.columns.str.fullmatch(r"split\d+_test_score").sum()
+
+    accuracies_grid = (
+        accuracies_grid[[
+            "param_kneighborsclassifier__n_neighbors",
+            "mean_test_score",
+            "std_test_score"
+        ]]
+        .assign(
+            sem_test_score=accuracies_grid["std_test_score"] / cv**(1/2),
+            # `lambda` allows access to the chained dataframe so that we can use the newly created `sem_test_score` column 
+            sem_test_score_lower=lambda df: df["mean_test_score"] - (df["sem_test_score"]/2),
+            sem_test_score_upper=lambda df: df["mean_test_score"] + (df["sem_test_score"]/2)
+        )
+        .rename(columns={"param_kneighborsclassifier__n_neighbors": "n_neighbors"})
+        .drop(columns=["std_test_score"])
+    )
+
+    line_n_point = alt.Chart(accuracies_grid, width=600).mark_line(color="black").encode(
+        x=alt.X("n_neighbors").title("Neighbors"),
+        y=alt.Y("mean_test_score")
+            .scale(zero=False) 
+            .title("F2 score (beta = 2)")
+    )
+
+    error_bar = alt.Chart(accuracies_grid).mark_errorbar().encode(
+        alt.Y("sem_test_score_upper:Q").scale(zero=False).title("F2 score (beta = 2)"),
+        alt.Y2("sem_test_score_lower:Q"),
+        alt.X("n_neighbors:Q").title("Neighbors")
+    )
+
+    plot = line_n_point + line_n_point.mark_circle(color='black') + error_bar
+    # only re-rendered when the chart (including its data) changed
+    render_figures({os.path.join(plot_to, "cancer_choose_k.png"): plot}, scale_factor=2.0)
+
+if __name__ == '__main__':
+    main()
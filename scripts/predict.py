@@ -0,0 +1,81 @@
+# predict.py
+# date: 2026-10-19
+
+import click
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled, record_rows
+
+@click.command()
+@click.option('--input', 'input_path', type=str, help="Path to the CSV or Parquet file to score")
+@click.option('--raw', is_flag=True, help="The input is a raw wdbc.data file without a header row")
+@click.option('--pipeline-from', type=str, help="Path to the model artifact directory (or a pickled pipeline object)")
+@click.option('--predictions-to', type=str, help="Path to the CSV file the predictions will be written to")
+@click.option('--engine', type=click.Choice(['sklearn', 'numpy']), help="Scoring engine; numpy uses the tiled matrix product k-nn kernel on a model artifact", default='sklearn')
+@click.option('--tile-mb', type=int, help="Memory budget of one distance tile of the numpy engine, in MiB", default=16)
+@click.option('--cache-size', type=int, help="Optional: number of rows each worker caches predictions for (model artifacts only)", default=0)
+@click.option('--chunk-size', type=int, help="Number of rows scored at a time", default=10000)
+@click.option('--n-jobs', type=int, help="Number of worker processes (default: all cores)", default=os.cpu_count())
+@click.option('--drift-report-to', type=str, help="Optional: path to the CSV file a per-feature drift report of the input will be written to (needs a model artifact fitted with --data-config-file)")
+@click.option('--drift-state', type=str, help="Optional: JSON file the running drift statistics are resumed from, if it exists, and saved to, to monitor drift across runs")
+@click.option('--psi-threshold', type=float, help="Population stability index above which a feature is reported as drifted", default=0.2)
+
+@profiled
+def main(input_path, raw, pipeline_from, predictions_to, engine, tile_mb, cache_size, chunk_size, n_jobs,
+         drift_report_to, drift_state, psi_threshold):
+    '''Scores a file of tumour measurements with the breast cancer classifier
+    and saves the predicted class and class probabilities of every row,
+    in input order. With --drift-report-to, the running statistics of every
+    chunk's features are compared to the training data as it is read.'''
+    from src.batch_predict import read_chunks, ordered_map, init_worker, predict_in_worker
+
+    chunks = read_chunks(input_path, chunk_size, raw=raw)
+    monitor = None
+    if drift_report_to or drift_state:
+        from src.drift_monitor import DriftMonitor, DRIFT_REFERENCE_FILE
+
+        reference = os.path.join(pipeline_from, DRIFT_REFERENCE_FILE)
+        if drift_state and os.path.exists(drift_state):
+            monitor = DriftMonitor.load(drift_state)
+        elif os.path.exists(reference):
+            monitor = DriftMonitor.load(reference)
+        else:
+            raise click.ClickException(f"No training data profile at {reference}; "
+                                       f"fit the model with --data-config-file to monitor drift.")
+
+        def monitored(chunks):
+            # each chunk is merged into the running statistics once, before it is scored
+            for chunk in chunks:
+                monitor.update(chunk)
+                yield chunk
+        chunks = monitored(chunks)
+    n_rows = 0
+    start = time.perf_counter()
+
+    # each worker loads the pipeline once; chunks are read lazily and only
+    # a couple of chunks per worker are in flight at any time
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=init_worker,
+                             initargs=(pipeline_from, engine, tile_mb * 2 ** 20, cache_size)) as executor:
+        for predictions in ordered_map(predict_in_worker, chunks, executor, max_pending=2 * n_jobs):
+            predictions.to_csv(predictions_to, mode='w' if n_rows == 0 else 'a',
+                               header=n_rows == 0, index=False)
+            n_rows += predictions.shape[0]
+    record_rows(n_rows)
+
+    elapsed = time.perf_counter() - start
+    click.echo(f"Scored {n_rows} rows in {elapsed:.2f} s ({n_rows / elapsed:,.0f} rows/sec)")
+
+    if monitor is not None:
+        if drift_state:
+            monitor.save(drift_state)
+        report = monitor.report(psi_threshold)
+        if drift_report_to:
+            report.to_csv(drift_report_to)
+        drifted = report.index[report['drift']].tolist()
+        click.echo(f"Drifted features: {', '.join(drifted)}" if drifted else "No feature drifted from the training data.")
+
+if __name__ == '__main__':
+    main()
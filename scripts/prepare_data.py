@@ -0,0 +1,62 @@
+# prepare_data.py
+# date: 2026-10-19
+
+import click
+import os
+import sys
+import pickle
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled, record_rows
+from src.datasets import DATASETS
+
+# the data frames the script can write, and their file names
+OUTPUT_FILES = {
+    'clean': "cancer_clean.csv",
+    'train': "cancer_train.csv",
+    'test': "cancer_test.csv",
+    'scaled-train': "scaled_cancer_train.csv",
+    'scaled-test': "scaled_cancer_test.csv"
+}
+
+@click.command()
+@click.option('--raw-data', type=str, help="Path to raw data")
+@click.option('--name-file', type=str, help="Path to the names file of the raw data")
+@click.option('--data-config-file', type=str, help="Path to data configuration file")
+@click.option('--dataset', type=click.Choice(list(DATASETS)), help="The data set of the archive the raw data is", default='wdbc')
+@click.option('--data-to', type=str, help="Path to directory where processed data will be written to")
+@click.option('--preprocessor-to', type=str, help="Path to directory where the preprocessor object will be written to")
+@click.option('--write', 'outputs', type=click.Choice(list(OUTPUT_FILES)), multiple=True, help="Data to write (repeatable); by default the train and test sets and the scaled train set")
+@click.option('--seed', type=int, help="Random seed", default=123)
+@click.option('--precision', type=click.Choice(['float64', 'float32']), help="Floating point precision of the scaled features", default='float64')
+
+@profiled
+def main(raw_data, name_file, data_config_file, dataset, data_to, preprocessor_to, outputs, seed, precision):
+    '''Cleans and validates the raw data, splits it into train and test sets
+    and scales them in one process, without writing and re-reading intermediate
+    files. Writes the requested data sets and the preprocessor.'''
+    import numpy as np
+    import pandas as pd
+    from sklearn import set_config
+    from src.prepare_data import clean_and_validate, make_preprocessor, split_and_scale
+
+    np.random.seed(seed)
+    set_config(transform_output="pandas")
+
+    dataset = DATASETS[dataset]
+    cancer = clean_and_validate(raw_data, name_file, pd.read_csv(data_config_file), dataset)
+    record_rows(cancer.shape[0])
+    data = {'clean': cancer}
+
+    cancer_preprocessor = make_preprocessor(precision)
+    # the preprocessor is saved unfitted; the fit stage fits it within the model pipeline
+    pickle.dump(cancer_preprocessor, open(os.path.join(preprocessor_to, "cancer_preprocessor.pickle"), "wb"))
+
+    split = split_and_scale(cancer.rename(columns={dataset.target: 'class'}), cancer_preprocessor)
+    data.update({'train': split['train'], 'test': split['test'],
+                 'scaled-train': split['scaled_train'], 'scaled-test': split['scaled_test']})
+
+    for output in outputs or ['train', 'test', 'scaled-train']:
+        data[output].to_csv(os.path.join(data_to, OUTPUT_FILES[output]), index=False)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# serve.py
+# date: 2026-10-19
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled
+
+@click.command()
+@click.option('--pipeline-from', type=str, help="Path to the model artifact directory (or a pickled pipeline object)")
+@click.option('--host', type=str, help="Address to listen on", default='127.0.0.1')
+@click.option('--port', type=int, help="Port to listen on", default=8000)
+@click.option('--max-batch-size', type=int, help="Number of rows that closes a micro-batch", default=64)
+@click.option('--max-wait-ms', type=float, help="Longest time a request waits for a micro-batch to fill", default=5.0)
+@click.option('--cache-size', type=int, help="Optional: number of rows to cache predictions for (model artifacts only)", default=0)
+@click.option('--monitor-drift', is_flag=True, help="Compare the served rows to the training data profile of the model artifact, reported at /metrics")
+@click.option('--psi-threshold', type=float, help="Population stability index above which a feature is reported as drifted", default=0.2)
+@click.option('--verbose', is_flag=True, help="Log every request")
+
+@profiled
+def main(pipeline_from, host, port, max_batch_size, max_wait_ms, cache_size, monitor_drift, psi_threshold,
+         verbose):
+    '''Serves the breast cancer classifier over HTTP on the local machine.
+    POST feature rows as JSON to /predict; latency and batch size
+    histograms (and drift, with --monitor-drift) are available at /metrics.'''
+    from sklearn import set_config
+    from src.model_artifact import load_pipeline
+    from src.inference_server import make_server
+    from src.drift_monitor import DriftMonitor, DRIFT_REFERENCE_FILE
+
+    set_config(transform_output="pandas")
+    drift_monitor = DriftMonitor.load(os.path.join(pipeline_from, DRIFT_REFERENCE_FILE)) if monitor_drift else None
+
+    # load the pipeline once, at startup
+    server = make_server(load_pipeline(pipeline_from), host, port,
+                         max_batch_size=max_batch_size, max_wait=max_wait_ms / 1000, cache_size=cache_size,
+                         verbose=verbose, drift_monitor=drift_monitor, psi_threshold=psi_threshold)
+    click.echo(f"Serving on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+
+if __name__ == '__main__':
+    main()
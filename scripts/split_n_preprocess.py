@@ -4,14 +4,10 @@
 
 import click
 import os
-import numpy as np
-import pandas as pd
+import sys
 import pickle
-from sklearn.model_selection import train_test_split
-from sklearn import set_config
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.compose import make_column_transformer, make_column_selector
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled, record_rows
 
 
 @click.command()
@@ -19,11 +15,22 @@ from sklearn.compose import make_column_transformer, make_column_selector
 @click.option('--data-to', type=str, help="Path to directory where processed data will be written to")
 @click.option('--preprocessor-to', type=str, help="Path to directory where the preprocessor object will be written to")
 @click.option('--seed', type=int, help="Random seed", default=123)
+@click.option('--precision', type=click.Choice(['float64', 'float32']), help="Floating point precision of the scaled features", default='float64')
 
-def main(raw_data, data_to, preprocessor_to, seed):
+@profiled
+def main(raw_data, data_to, preprocessor_to, seed, precision):
     '''This script splits the raw data into train and test sets, 
     and then preprocesses the data to be used in exploratory data analysis.
     It also saves the preprocessor to be used in the model training script.'''
+    import numpy as np
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn import set_config
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.compose import make_column_transformer, make_column_selector
+    from sklearn.pipeline import make_pipeline
+    from src.numeric_precision import make_precision_caster
+
     np.random.seed(seed)
     set_config(transform_output="pandas")
 
@@ -63,6 +70,7 @@ def main(raw_data, data_to, preprocessor_to, seed):
     ]
 
     cancer = pd.read_csv(raw_data, names=colnames, header=None).drop(columns=['id'])
+    record_rows(cancer.shape[0])
     # re-label Class 'M' as 'Malignant', and Class 'B' as 'Benign'
     cancer['class'] = cancer['class'].replace({
         'M' : 'Malignant',
@@ -82,6 +90,8 @@ def main(raw_data, data_to, preprocessor_to, seed):
         remainder='passthrough',
         verbose_feature_names_out=False
     )
+    if precision != 'float64':
+        cancer_preprocessor = make_pipeline(make_precision_caster(precision), cancer_preprocessor)
     pickle.dump(cancer_preprocessor, open(os.path.join(preprocessor_to, "cancer_preprocessor.pickle"), "wb"))
 
     cancer_preprocessor.fit(cancer_train)
@@ -0,0 +1,79 @@
+# threshold_analysis.py
+# date: 2026-10-19
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import profiled, record_rows
+
+@click.command()
+@click.option('--training-data', type=str, help="Optional: path to training data; required with --save-threshold")
+@click.option('--scaled-test-data', type=str, help="Path to test data")
+@click.option('--columns-to-drop', type=str, help="Optional: columns to drop")
+@click.option('--pipeline-from', type=str, help="Path to the model artifact directory (or a pickled pipeline object)")
+@click.option('--results-to', type=str, help="Path to directory where the threshold table will be written to")
+@click.option('--precision', type=click.Choice(['float64', 'float32']), help="Floating point precision of the test data", default='float64')
+@click.option('--save-threshold', is_flag=True, help="Save the threshold with the best cross-validated F2 score on the training data into the model artifact")
+@click.option('--cv', type=int, help="Number of cross-validation folds the threshold is chosen with", default=5)
+@click.option('--seed', type=int, help="Random seed", default=123)
+
+@profiled
+def main(training_data, scaled_test_data, columns_to_drop, pipeline_from, results_to, precision, save_threshold,
+         cv, seed):
+    '''Sweeps the probability threshold for predicting a malignant tumour
+    and saves precision, recall, F2 score and confusion counts for every
+    candidate threshold on the test data. The threshold saved with
+    --save-threshold is chosen from out-of-fold predictions on the
+    training data, so the test data is only used to report scores.'''
+    import numpy as np
+    import pandas as pd
+    from sklearn import set_config
+    from sklearn.base import clone
+    from sklearn.model_selection import StratifiedKFold, cross_val_predict
+    from src.numeric_precision import cast_to_precision
+    from src.model_artifact import load_pipeline, update_model_metadata
+    from src.evaluation_metrics import threshold_sweep
+
+    set_config(transform_output="pandas")
+
+    if save_threshold and not os.path.isdir(pipeline_from):
+        raise click.BadParameter("--save-threshold requires a model artifact directory.",
+                                 param_hint='--pipeline-from')
+    if save_threshold and not training_data:
+        raise click.BadParameter("--save-threshold requires the training data to choose the threshold on.",
+                                 param_hint='--training-data')
+
+    # read in data & cancer_fit (pipeline object)
+    cancer_test = cast_to_precision(pd.read_csv(scaled_test_data), precision)
+    cancer_train = cast_to_precision(pd.read_csv(training_data), precision) if save_threshold else None
+    if columns_to_drop:
+        to_drop = pd.read_csv(columns_to_drop).feats_to_drop.tolist()
+        cancer_test = cancer_test.drop(columns=to_drop)
+        if cancer_train is not None:
+            cancer_train = cancer_train.drop(columns=to_drop)
+    cancer_fit = load_pipeline(pipeline_from)
+    record_rows(cancer_test.shape[0] + (cancer_train.shape[0] if cancer_train is not None else 0))
+
+    # one predict_proba pass; every threshold is scored from the sorted probabilities
+    malignant = list(cancer_fit.classes_).index('Malignant')
+    malignant_proba = np.asarray(cancer_fit.predict_proba(cancer_test.drop(columns=["class"])))[:, malignant]
+    threshold_scores = threshold_sweep(cancer_test["class"], malignant_proba, pos_label='Malignant', beta=2)
+    threshold_scores.to_csv(os.path.join(results_to, "threshold_scores.csv"), index=False)
+
+    if save_threshold:
+        # choosing the threshold on the test data would bias the scores evaluated on it,
+        # so it is chosen from out-of-fold probabilities of the pipeline refit on the training folds
+        folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed)
+        out_of_fold_proba = cross_val_predict(clone(cancer_fit), cancer_train.drop(columns=["class"]),
+                                              cancer_train["class"], cv=folds, method='predict_proba')
+        training_scores = threshold_sweep(cancer_train["class"], out_of_fold_proba[:, malignant],
+                                          pos_label='Malignant', beta=2)
+        # ties go to the lowest threshold, i.e. the highest recall
+        best = training_scores.loc[training_scores["F2 score"][::-1].idxmax()]
+        update_model_metadata(pipeline_from, {
+            'decision_threshold': {'pos_label': 'Malignant', 'threshold': float(best["threshold"])}
+        })
+
+if __name__ == '__main__':
+    main()
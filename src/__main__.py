@@ -0,0 +1,8 @@
+# __main__.py
+# date: 2026-10-19
+
+# `python -m src COMMAND ...` from the repository root
+from src.cli import cli
+
+if __name__ == '__main__':
+    cli(prog_name='python -m src')
@@ -0,0 +1,207 @@
+# batch_predict.py
+# date: 2026-10-19
+
+import collections
+import os
+import numpy as np
+import pandas as pd
+from sklearn import set_config
+from src.model_artifact import load_pipeline, labels_from_probabilities
+from src.numpy_predictor import NumpyKNNPredictor
+from src.prediction_cache import PredictionCache
+
+WDBC_FEATURES = ['radius', 'texture', 'perimeter', 'area', 'smoothness', 'compactness',
+                 'concavity', 'concave_points', 'symmetry', 'fractal_dimension']
+RAW_COLUMNS = ['id', 'diagnosis'] + [stat + '_' + feature
+                                     for stat in ['mean', 'se', 'max']
+                                     for feature in WDBC_FEATURES]
+NON_FEATURE_COLUMNS = ['id', 'class', 'diagnosis']
+ENGINES = ['sklearn', 'numpy']
+
+# the pipeline each worker process loads once, in `init_worker`
+_worker_pipeline = None
+
+
+def read_chunks(path, chunk_size=10000, raw=False):
+    """
+    Read a CSV or Parquet file lazily, one chunk of rows at a time.
+
+    Parameters
+    ----------
+    path : str
+        Path to a `.csv` file (or any other delimited text file) or a `.parquet` file.
+
+    chunk_size : int, optional, default=10000
+        The maximum number of rows per chunk.
+
+    raw : bool, optional, default=False
+        Whether the file is a raw `wdbc.data` file without a header row. The
+        columns of raw files are named like the cleaned data ('id', 'diagnosis',
+        'mean_radius', ...).
+
+    Yields
+    ------
+    pandas.DataFrame
+        The next chunk of rows.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+
+    ValueError
+        If 'chunk_size' is not a positive integer.
+
+    ImportError
+        If a Parquet file is read without pyarrow installed.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError('The input file does not exist.')
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Reading Parquet files requires pyarrow.")
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif raw:
+        yield from pd.read_csv(path, header=None, names=RAW_COLUMNS, chunksize=chunk_size)
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def predict_chunk(pipeline, chunk):
+    """
+    Predict the class and class probabilities of every row of a chunk.
+
+    If the pipeline is a model artifact with a saved decision threshold, the
+    threshold is applied to the predicted probabilities.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline
+        A fitted pipeline, e.g. as returned by `load_pipeline`.
+
+    chunk : pandas.DataFrame
+        The rows to score. The 'id', 'class' and 'diagnosis' columns are not
+        passed to the model.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The 'id' column (if present), the 'predicted' class and one
+        'probability_<class>' column per class, in the order of the input rows.
+    """
+    features = chunk.drop(columns=[col for col in NON_FEATURE_COLUMNS if col in chunk.columns])
+    probabilities = np.asarray(pipeline.predict_proba(features))
+    metadata = getattr(pipeline, 'artifact_metadata_', {})
+    classes = list(pipeline.classes_)
+
+    predictions = pd.DataFrame(index=chunk.index)
+    if 'id' in chunk.columns:
+        predictions['id'] = chunk['id']
+    predictions['predicted'] = labels_from_probabilities(probabilities, classes,
+                                                         metadata.get('decision_threshold'))
+    for i, label in enumerate(classes):
+        predictions['probability_' + str(label)] = probabilities[:, i]
+    return predictions
+
+
+def ordered_map(function, items, executor, max_pending):
+    """
+    Apply a function to items on an executor, yielding results in input order.
+
+    Unlike `Executor.map`, which submits every item up front, at most
+    'max_pending' items are submitted but not yet yielded, so items that are
+    read lazily (e.g. chunks of a large file) are only held in memory a few at a time.
+
+    Parameters
+    ----------
+    function : callable
+        The function to apply; it must be picklable for a process pool.
+
+    items : iterable
+        The items to apply the function to.
+
+    executor : concurrent.futures.Executor
+        The executor to run the function on.
+
+    max_pending : int
+        The maximum number of submitted items whose results have not been yielded.
+
+    Yields
+    ------
+    object
+        The result of 'function' for each item, in the order of 'items'.
+    """
+    if max_pending < 1:
+        raise ValueError("max_pending must be a positive integer.")
+    pending = collections.deque()
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) == max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def load_engine(pipeline_from, engine='sklearn', tile_bytes=2 ** 24):
+    """
+    Load a model for batch scoring.
+
+    Parameters
+    ----------
+    pipeline_from : str
+        Path to the model artifact directory (or a pickled pipeline object for
+        the 'sklearn' engine).
+
+    engine : {'sklearn', 'numpy'}, optional, default='sklearn'
+        'sklearn' loads a scikit-learn pipeline with `load_pipeline`; 'numpy' loads a
+        `NumpyKNNPredictor` using the tiled matrix product k-nn kernel.
+
+    tile_bytes : int, optional, default=2**24
+        The memory budget of one distance tile of the 'numpy' engine.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline or NumpyKNNPredictor
+        The model, with `predict_proba` and `classes_`.
+
+    Raises
+    ------
+    ValueError
+        If the engine is unknown, or the 'numpy' engine is given a pickle file.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}.")
+    if engine == 'sklearn':
+        return load_pipeline(pipeline_from)
+    if not os.path.isdir(pipeline_from):
+        raise ValueError("The numpy engine requires a model artifact directory.")
+    return NumpyKNNPredictor.from_artifact(pipeline_from, block_bytes=tile_bytes, algorithm='gemm')
+
+
+def init_worker(pipeline_from, engine='sklearn', tile_bytes=2 ** 24, cache_size=0):
+    """
+    Load the model in a worker process, once, before it scores any chunks.
+
+    Pass this as the 'initializer' of a `ProcessPoolExecutor` whose tasks call
+    `predict_in_worker`. The first three arguments are those of `load_engine`;
+    with a positive 'cache_size', the model is wrapped in a `PredictionCache` of
+    that many rows, so rows the worker has already scored skip the neighbour search.
+    """
+    global _worker_pipeline
+    set_config(transform_output="pandas")
+    _worker_pipeline = load_engine(pipeline_from, engine, tile_bytes)
+    if cache_size:
+        _worker_pipeline = PredictionCache(_worker_pipeline, max_size=cache_size)
+
+
+def predict_in_worker(chunk):
+    """
+    Score a chunk with the pipeline loaded by `init_worker`; see `predict_chunk`.
+    """
+    return predict_chunk(_worker_pipeline, chunk)
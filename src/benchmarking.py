@@ -0,0 +1,215 @@
+# benchmarking.py
+# date: 2026-10-19
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+RESULT_FIELDS = ['benchmark', 'n_rows', 'seconds', 'peak_mb']
+
+
+def measure(function, repeats=1):
+    """
+    Measure the wall time and peak memory of a call.
+
+    The function is called once under `tracemalloc` to measure its peak memory
+    (this call also warms up caches and lazy imports), then 'repeats' more times
+    without tracing to measure its wall time.
+
+    Parameters
+    ----------
+    function : callable
+        The function to call, without arguments.
+
+    repeats : int, optional, default=1
+        The number of timed calls.
+
+    Returns
+    -------
+    dict
+        The fastest wall time of the timed calls ('seconds') and the peak memory
+        allocated during the traced call, in MiB ('peak_mb').
+
+    Raises
+    ------
+    ValueError
+        If 'repeats' is not a positive integer.
+    """
+    if repeats < 1:
+        raise ValueError("repeats must be a positive integer.")
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {'seconds': min(times), 'peak_mb': peak}
+
+
+def resample_rows(data, n_rows, noise=0.01, id_column='id', random_state=None):
+    """
+    Resample the rows of a data set to any number of rows.
+
+    Rows are drawn with replacement and their numeric values multiplied by
+    1 + 'noise' * N(0, 1), then clipped to the range of their column, so the
+    resampled rows keep the distribution and the value ranges of the data but
+    are not duplicates of each other. An id column is renumbered.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The data to resample.
+
+    n_rows : int
+        The number of rows to draw.
+
+    noise : float, optional, default=0.01
+        The relative standard deviation of the noise added to numeric values.
+
+    id_column : str, optional, default='id'
+        The name of the id column, if the data has one.
+
+    random_state : int, optional, default=None
+        The seed of the random number generator.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The 'n_rows' resampled rows.
+
+    Raises
+    ------
+    TypeError
+        If 'data' is not a pandas data frame.
+
+    ValueError
+        If 'n_rows' is not a positive integer or 'data' has no rows.
+    """
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("data must be a pandas data frame.")
+    if n_rows < 1:
+        raise ValueError("n_rows must be a positive integer.")
+    if data.shape[0] == 0:
+        raise ValueError("data must have at least one row.")
+
+    rng = np.random.default_rng(random_state)
+    sample = data.iloc[rng.integers(0, data.shape[0], size=n_rows)].reset_index(drop=True)
+    numeric = [column for column in sample.columns
+               if column != id_column and pd.api.types.is_float_dtype(sample[column])]
+    values = sample[numeric].to_numpy() * (1 + noise * rng.standard_normal((n_rows, len(numeric))))
+    sample[numeric] = np.clip(values, data[numeric].min().to_numpy(), data[numeric].max().to_numpy())
+    if id_column in sample.columns:
+        sample[id_column] = np.arange(1, n_rows + 1)
+    return sample
+
+
+def environment():
+    """
+    Describe the machine and library versions the benchmarks ran with.
+
+    Returns
+    -------
+    dict
+        The Python version, platform, number of CPUs and NumPy, pandas and
+        scikit-learn versions.
+    """
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scikit-learn': sklearn.__version__
+    }
+
+
+def write_results(results, path):
+    """
+    Write benchmark results and the environment to a JSON file.
+
+    Parameters
+    ----------
+    results : list of dict
+        The results, each with 'benchmark', 'n_rows', 'seconds' and 'peak_mb'.
+
+    path : str
+        The JSON file to write, e.g. a baseline.
+    """
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+
+
+def read_results(path):
+    """
+    Read benchmark results written by `write_results`.
+
+    Parameters
+    ----------
+    path : str
+        The JSON file.
+
+    Returns
+    -------
+    list of dict
+        The results.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError("The results file does not exist.")
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    Compare benchmark results to a baseline.
+
+    Parameters
+    ----------
+    results, baseline : list of dict
+        The new and the baseline results, as returned by `read_results`.
+
+    tolerance : float, optional, default=0.25
+        The relative increase in time or peak memory over the baseline that is
+        flagged as a regression.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per new result, with the baseline's 'baseline_seconds' and
+        'baseline_peak_mb', the 'time_ratio' and 'memory_ratio' (new over
+        baseline), and 'regression', True when either ratio exceeds 1 +
+        'tolerance'. Results without a baseline have missing ratios and are
+        not regressions.
+
+    Raises
+    ------
+    ValueError
+        If 'tolerance' is negative.
+    """
+    if tolerance < 0:
+        raise ValueError("tolerance must not be negative.")
+    keys = ['benchmark', 'n_rows']
+    baseline_frame = pd.DataFrame(baseline, columns=RESULT_FIELDS).rename(
+        columns={'seconds': 'baseline_seconds', 'peak_mb': 'baseline_peak_mb'})
+    comparison = pd.DataFrame(results, columns=RESULT_FIELDS).merge(baseline_frame, on=keys, how='left')
+    comparison['time_ratio'] = comparison['seconds'] / comparison['baseline_seconds']
+    comparison['memory_ratio'] = comparison['peak_mb'] / comparison['baseline_peak_mb']
+    comparison['regression'] = ((comparison['time_ratio'] > 1 + tolerance) |
+                                (comparison['memory_ratio'] > 1 + tolerance))
+    return comparison
@@ -8,32 +8,42 @@ import re
 import os
 
 
-def extract_column_name(text_lines):
+def extract_column_name(text_lines, statistics=['mean', 'se', 'max']):
     """
     Extract and clean column names from a .names file.
 
     This function processes the content of a .names file by extracting column names 
-    between the sections "7. Attribute information" and "8. Missing attribute values: none".
-    It cleans the column names by removing line numbers, special characters, and replacing 
-    spaces with underscores. Additionally, the function adds statistics-based column names 
-    (such as 'mean', 'se', 'max') for each attribute.
+    between the sections "7. Attribute information" and "8. Missing attribute values".
+    Attributes are listed either as "1) ID number" or "1. Sample code number   id number";
+    their names are cleaned by removing line numbers, descriptions (after a parenthesis,
+    colon, dash or column gap) and replacing spaces with underscores. The measured
+    nucleus features listed as "a) radius", "b) texture", etc. get one column per
+    statistic (such as 'mean', 'se', 'max'), in their place among the attributes.
 
     Parameters
     ----------
     text_lines : list of str
         A list of lines from the .names file containing the attribute information.
 
+    statistics : list of str, optional, default=['mean', 'se', 'max']
+        The statistics computed for each nucleus feature; None keeps one column per feature.
+
     Returns
     -------
     list of str
         A list of cleaned and formatted column names, including statistics-based columns 
         like 'mean', 'se', and 'max' for each feature.
 
+    Raises
+    ------
+    ValueError
+        If the lines do not have the attribute information section.
+
     Notes
     -----
     The function assumes the .names file has specific sections, where the attribute information
-    starts at "7. Attribute information" and ends before "8. Missing attribute values: none".
-    The statistics added to each feature include:
+    starts at "7. Attribute information" and ends before "8. Missing attribute values".
+    The statistics of the WDBC and WPBC data include:
     - 'mean': The average value of the feature.
     - 'se': The standard error of the feature.
     - 'max': The maximum value, represented by the mean of the three largest values.
@@ -41,31 +51,40 @@ def extract_column_name(text_lines):
     """
     
     # Get lines between attribute info and missing values section
-    start = text_lines.index('7. Attribute information')
-    end = text_lines.index('8. Missing attribute values: none')
-    text_lines = text_lines[start:end]
+    starts = [i for i, line in enumerate(text_lines) if line.lower().startswith('7. attribute information')]
+    ends = [i for i, line in enumerate(text_lines) if line.lower().startswith('8. missing attribute values')]
+    if not starts or not any(end > starts[0] for end in ends):
+        raise ValueError("The names file must have an attribute information section.")
+    text_lines = text_lines[starts[0] + 1:min(end for end in ends if end > starts[0])]
+
+    # Remove line numbers and descriptions
+    attribute = re.compile(r'^[0-9]+[.)]\s+')
+    feature = re.compile(r'^[a-z]\)\s*')
+    description = re.compile(r'\(|:|\s-\s|\s{2,}')
+    def clean_name(item):
+        return re.sub(r"\s+", "_", description.split(item, maxsplit=1)[0].strip()).lower()
 
-    # Remove line numbers and special characters
-    pattern = re.compile(r'^[1-9a-z]\)\s*')
-    text_lines = [item for item in text_lines if pattern.match(item)]
-    text_lines = [pattern.sub('', item) for item in text_lines]
-    pattern = re.compile(r'\(.*?\)')
-    text_lines = [re.sub(r"\s+", "_", pattern.sub('', item).strip()) for item in text_lines]
-
-
-    statistics = ['mean','se','max'] 
     #se is standard error, and max is the worst or largest (mean of three largest values)
-
     # please refer to original file for explanation of feactures
-    colnames = text_lines[0:2]
-    for stat in statistics:
-        for feature in text_lines[2:]:
-            colnames.append(stat+'_'+feature)
-    colnames = [col.lower() for col in colnames]
+    def expand(features):
+        if not statistics:
+            return features
+        return [stat + '_' + name for stat in statistics for name in features]
+
+    colnames = []
+    features = []
+    for item in text_lines:
+        if attribute.match(item):
+            colnames += expand(features)
+            features = []
+            colnames.append(clean_name(attribute.sub('', item)))
+        elif feature.match(item):
+            features.append(clean_name(feature.sub('', item)))
+    colnames += expand(features)
         
     return colnames
     
-def read_data(raw_data, col_name):
+def read_data(raw_data, col_name, na_values=None):
     """
     Read data from a CSV file and assign custom column names.
 
@@ -81,7 +100,10 @@ def read_data(raw_data, col_name):
 
     col_name : list of str
         A list containing the column names to be assigned to the dataframe. This list must contain 
-        exactly 32 strings, corresponding to the number of columns in the data.
+        one string per column of the data (32 for the WDBC data).
+
+    na_values : list of str, optional, default=None
+        Additional strings marking missing values, e.g. ['?'].
 
     Returns
     -------
@@ -97,7 +119,7 @@ def read_data(raw_data, col_name):
         If 'col_name' is not a list.
     
     ValueError
-        If 'col_name' does not contain exactly 32 items.
+        If the number of items in 'col_name' is not the number of columns in the data.
 
     Warns
     -----
@@ -107,8 +129,8 @@ def read_data(raw_data, col_name):
     Notes
     -----
     - The function checks that the raw data file exists before attempting to read it.
-    - It also ensures that the 'col_name' parameter is a list of strings containing exactly 32 items, 
-      matching the number of columns in the CSV file.
+    - It also ensures that the 'col_name' parameter is a list of strings with one item per column
+      of the CSV file.
     - If any item in the 'col_name' list is not a string, a warning is issued.
 
     """
@@ -125,7 +147,7 @@ def read_data(raw_data, col_name):
     if not all(isinstance(item, str) for item in col_name):
         warnings.warn("col_name contains non-string values")
     
-    imported_data = pd.read_csv(raw_data, header=None)
+    imported_data = pd.read_csv(raw_data, header=None, na_values=na_values)
 
     # Ensure the items in col_name list is same as the number of columns, if not raise error
     if len(col_name) != imported_data.shape[1]:
@@ -135,13 +157,13 @@ def read_data(raw_data, col_name):
 
     return imported_data
 
-def clean_data(imported_data, drop_columns=['id'], relabel={'M' : 'Malignant','B' : 'Benign'}):
+def clean_data(imported_data, drop_columns=['id'], relabel={'M' : 'Malignant','B' : 'Benign'}, target='diagnosis'):
     """
     Clean the imported data by dropping specified columns and relabeling values.
 
     This function cleans the imported data by performing two operations:
     1. Dropping the columns specified in the `drop_columns` parameter.
-    2. Replacing values in the 'diagnosis' column according to the mappings provided in the `relabel` dictionary.
+    2. Replacing values in the class column ('target') according to the mappings provided in the `relabel` dictionary.
 
     Parameters
     ----------
@@ -154,10 +176,13 @@ def clean_data(imported_data, drop_columns=['id'], relabel={'M' : 'Malignant','B
     relabel : dict, optional, default={'M' : 'Malignant', 'B' : 'Benign'}
         A dictionary for relabeling values in the 'diagnosis' column. Keys are original values, and values are the new labels.
 
+    target : str, optional, default='diagnosis'
+        The class column that is relabeled, e.g. 'outcome' for the WPBC data.
+
     Returns
     -------
     pandas.DataFrame
-        A cleaned dataframe with the specified columns dropped and the 'diagnosis' column relabeled.
+        A cleaned dataframe with the specified columns dropped and the class column relabeled.
 
     Raises
     ------
@@ -166,8 +191,8 @@ def clean_data(imported_data, drop_columns=['id'], relabel={'M' : 'Malignant','B
 
     Notes
     -----
-    - The function assumes the 'diagnosis' column exists in the dataframe and contains values that need to be relabeled.
-    - The columns specified in `drop_columns` will be removed from the dataframe, and the 'diagnosis' column will be updated according to the `relabel` dictionary.
+    - The function assumes the 'target' column exists in the dataframe and contains values that need to be relabeled.
+    - The columns specified in `drop_columns` will be removed from the dataframe, and the 'target' column will be updated according to the `relabel` dictionary.
 
     """
     # Ensure the imported_data is a dataframe
@@ -183,7 +208,7 @@ def clean_data(imported_data, drop_columns=['id'], relabel={'M' : 'Malignant','B
         raise TypeError("relabel must be a dictionary")
     
     cleaned_data = imported_data.drop(columns=drop_columns)
-    cleaned_data['diagnosis'] = cleaned_data['diagnosis'].replace(relabel)
+    cleaned_data[target] = cleaned_data[target].replace(relabel)
     return cleaned_data
 
 def write_data(dataframe, data_to, name_of_file):
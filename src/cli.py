@@ -0,0 +1,82 @@
+# cli.py
+# date: 2026-10-19
+
+# Only click and the standard library are imported here. The script behind a
+# subcommand is loaded when that subcommand is invoked, and the scripts import
+# pandas, scikit-learn, altair, etc. inside `main`, so listing the commands or
+# asking for a subcommand's `--help` does not import the scientific stack.
+import importlib.util
+import os
+import click
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+
+# subcommand: (script in scripts/, short help)
+COMMANDS = {
+    'download': ('download_data.py', "Download and extract the data."),
+    'clean-validate': ('clean_validate.py', "Clean the raw data and validate it."),
+    'prepare': ('prepare_data.py', "Clean, validate, split and scale the raw data in one process."),
+    'split': ('split_n_preprocess.py', "Split the raw data into train and test sets and scale them."),
+    'eda': ('eda.py', "Plot the feature densities by class."),
+    'fit': ('fit_breast_cancer_classifier.py', "Tune and fit the k-nn classifier."),
+    'tuning-curve': ('plot_tuning_curve.py', "Plot the cross-validated score against k."),
+    'evaluate': ('evaluate_breast_cancer_predictor.py', "Evaluate the classifier on the test set."),
+    'threshold': ('threshold_analysis.py', "Sweep the malignant probability threshold."),
+    'condense': ('condense_breast_cancer_classifier.py', "Condense the k-nn reference set."),
+    'predict': ('predict.py', "Score a file of tumour measurements."),
+    'serve': ('serve.py', "Serve predictions over HTTP."),
+    'synthesize': ('generate_synthetic_data.py', "Generate synthetic raw data for load testing."),
+    'pipeline': ('run_pipeline.py', "Run the analysis stages that are out of date.")
+}
+
+
+def load_command(script):
+    """
+    Load the `main` click command of a script.
+
+    Parameters
+    ----------
+    script : str
+        The path to the script.
+
+    Returns
+    -------
+    click.Command
+        The script's `main` command.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the script does not exist.
+    """
+    if not os.path.exists(script):
+        raise FileNotFoundError(f"The script '{script}' does not exist.")
+    spec = importlib.util.spec_from_file_location(
+        '_script_' + os.path.splitext(os.path.basename(script))[0], script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.main
+
+
+class LazyGroup(click.Group):
+    """A click group that loads the command of a script only when it is invoked."""
+
+    def list_commands(self, ctx):
+        return list(COMMANDS)
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in COMMANDS:
+            return None
+        return load_command(os.path.join(SCRIPTS_DIR, COMMANDS[cmd_name][0]))
+
+    def format_commands(self, ctx, formatter):
+        # the short help is listed from COMMANDS, without loading any script
+        with formatter.section("Commands"):
+            formatter.write_dl([(name, short_help) for name, (_, short_help) in COMMANDS.items()])
+
+
+@click.group(cls=LazyGroup)
+def cli():
+    '''Breast cancer predictor: run a stage of the analysis, score data or serve the model.
+
+    Run `python -m src COMMAND --help` for the options of a command.'''
@@ -0,0 +1,197 @@
+# condense_data.py
+# date: 2026-10-19
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.neighbors import NearestNeighbors
+
+
+def edited_nearest_neighbours(X, y, n_neighbors=3):
+    """
+    Select the training observations that agree with their nearest neighbours.
+
+    Wilson's editing rule removes every observation whose label differs from the
+    majority label of its `n_neighbors` nearest neighbours (the observation itself
+    is excluded). This removes noisy and borderline observations.
+
+    Parameters
+    ----------
+    X : numpy.ndarray
+        A 2D array of (scaled) feature values, one row per observation.
+
+    y : numpy.ndarray
+        A 1D array of class labels, one per row of `X`.
+
+    n_neighbors : int, optional, default=3
+        The number of neighbours used to decide whether an observation is kept.
+
+    Returns
+    -------
+    numpy.ndarray
+        The positional indices of the observations that are kept.
+    """
+    n_neighbors = min(n_neighbors, X.shape[0] - 1)
+    neighbours = NearestNeighbors(n_neighbors=n_neighbors + 1).fit(X)
+    # the first neighbour of each observation is the observation itself
+    neighbour_index = neighbours.kneighbors(X, return_distance=False)[:, 1:]
+
+    classes, y_codes = np.unique(y, return_inverse=True)
+    votes = np.zeros((X.shape[0], len(classes)), dtype=np.int64)
+    np.add.at(votes, (np.arange(X.shape[0])[:, None], y_codes[neighbour_index]), 1)
+
+    return np.flatnonzero(votes.argmax(axis=1) == y_codes)
+
+
+def condensed_nearest_neighbours(X, y, random_state=None):
+    """
+    Select a consistent subset of the training observations.
+
+    Hart's condensing rule starts from one random observation per class and
+    repeatedly adds every observation that the current subset misclassifies
+    with a 1-nearest neighbour rule, until a full pass adds nothing. The
+    resulting subset classifies the whole training set correctly with 1-NN.
+
+    Parameters
+    ----------
+    X : numpy.ndarray
+        A 2D array of (scaled) feature values, one row per observation.
+
+    y : numpy.ndarray
+        A 1D array of class labels, one per row of `X`.
+
+    random_state : int, optional, default=None
+        Seed controlling the initial subset and the order observations are visited in.
+
+    Returns
+    -------
+    numpy.ndarray
+        The sorted positional indices of the observations that are kept.
+    """
+    rng = np.random.default_rng(random_state)
+    keep = np.zeros(X.shape[0], dtype=bool)
+    for label in np.unique(y):
+        keep[rng.choice(np.flatnonzero(y == label))] = True
+
+    changed = True
+    while changed:
+        changed = False
+        for i in rng.permutation(X.shape[0]):
+            if keep[i]:
+                continue
+            store = np.flatnonzero(keep)
+            distances = ((X[store] - X[i]) ** 2).sum(axis=1)
+            if y[store[distances.argmin()]] != y[i]:
+                keep[i] = True
+                changed = True
+
+    return np.flatnonzero(keep)
+
+
+def kmeans_prototypes(X, y, n_prototypes=20, random_state=None):
+    """
+    Replace each class by the centroids of a k-means clustering of that class.
+
+    Parameters
+    ----------
+    X : numpy.ndarray
+        A 2D array of (scaled) feature values, one row per observation.
+
+    y : numpy.ndarray
+        A 1D array of class labels, one per row of `X`.
+
+    n_prototypes : int, optional, default=20
+        The number of prototypes kept per class. Classes with fewer observations
+        keep all of their observations.
+
+    random_state : int, optional, default=None
+        Seed passed to k-means.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The prototype feature values and their class labels.
+    """
+    prototypes = []
+    labels = []
+    for label in np.unique(y):
+        X_class = X[y == label]
+        if X_class.shape[0] <= n_prototypes:
+            centres = X_class
+        else:
+            centres = KMeans(n_clusters=n_prototypes, n_init=10,
+                             random_state=random_state).fit(X_class).cluster_centers_
+        prototypes.append(centres.astype(X.dtype, copy=False))
+        labels.append(np.repeat(label, centres.shape[0]))
+
+    return np.vstack(prototypes), np.concatenate(labels)
+
+
+def condense_data(X, y, method='cnn', n_neighbors=3, n_prototypes=20, random_state=None):
+    """
+    Shrink a k-NN reference set with a prototype selection method.
+
+    Parameters
+    ----------
+    X : pandas.DataFrame
+        The (scaled) training features that a k-NN classifier would store.
+
+    y : pandas.Series
+        The class labels of the training observations.
+
+    method : {'cnn', 'enn', 'enn+cnn', 'kmeans'}, optional, default='cnn'
+        The condensation method:
+        - 'cnn': Hart's condensed nearest neighbours.
+        - 'enn': Wilson's edited nearest neighbours.
+        - 'enn+cnn': editing followed by condensing, which usually gives a smaller
+          and less noisy subset than condensing alone.
+        - 'kmeans': class-wise k-means centroids.
+
+    n_neighbors : int, optional, default=3
+        The number of neighbours used by the editing step ('enn' and 'enn+cnn').
+
+    n_prototypes : int, optional, default=20
+        The number of prototypes per class ('kmeans').
+
+    random_state : int, optional, default=None
+        Seed for the randomised methods.
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, pandas.Series)
+        The condensed features and labels, with the same columns and name as the input.
+
+    Raises
+    ------
+    TypeError
+        If 'X' is not a pandas DataFrame or 'y' is not a pandas Series.
+
+    ValueError
+        If 'X' and 'y' have different lengths, or 'method' is not a supported method.
+    """
+    # Ensure X is a dataframe and y is a series, if not raise error
+    if not isinstance(X, pd.DataFrame):
+        raise TypeError("X must be a pandas data frame.")
+    if not isinstance(y, pd.Series):
+        raise TypeError("y must be a pandas series.")
+
+    if X.shape[0] != y.shape[0]:
+        raise ValueError("X and y must have the same number of rows.")
+
+    if method not in ('cnn', 'enn', 'enn+cnn', 'kmeans'):
+        raise ValueError("method must be one of 'cnn', 'enn', 'enn+cnn' or 'kmeans'.")
+
+    X_values = X.to_numpy()
+    y_values = y.to_numpy()
+
+    if method == 'kmeans':
+        X_kept, y_kept = kmeans_prototypes(X_values, y_values, n_prototypes, random_state)
+        return pd.DataFrame(X_kept, columns=X.columns), pd.Series(y_kept, name=y.name)
+
+    index = np.arange(X.shape[0])
+    if method in ('enn', 'enn+cnn'):
+        index = index[edited_nearest_neighbours(X_values[index], y_values[index], n_neighbors)]
+    if method in ('cnn', 'enn+cnn'):
+        index = index[condensed_nearest_neighbours(X_values[index], y_values[index], random_state)]
+
+    return X.iloc[index], y.iloc[index]
@@ -0,0 +1,117 @@
+# datasets.py
+# date: 2026-10-19
+
+# Like src/profiling.py, this module only uses the standard library, so scripts can
+# list the datasets in their click options without importing pandas.
+
+
+class DatasetSpec:
+    """
+    How to read, clean and model one data set of the UCI breast cancer archive.
+
+    Parameters
+    ----------
+    name : str
+        The name of the data set, e.g. 'wdbc'.
+
+    data_file, name_file : str
+        The file names of the raw data and of its .names file, in the directory
+        the archive is extracted to.
+
+    data_config_file : str
+        The path to the data configuration of the cleaned data (see
+        `build_schema_from_DataFrame`).
+
+    target : str
+        The class column, as named by `extract_column_name`.
+
+    relabel : dict
+        Maps the raw class values to the labels written out.
+
+    positive_label : str
+        The label scored as positive (e.g. by the F2 score).
+
+    drop_columns : list of str, optional, default=None
+        The columns dropped when cleaning; ['id_number'] by default.
+
+    statistics : list of str, optional, default=None
+        The statistics each measured nucleus feature is summarised with, see
+        `extract_column_name`.
+
+    na_values : list of str, optional, default=None
+        The strings marking missing values in the raw data.
+
+    unique_rows : bool, optional, default=True
+        Whether the cleaned data must not have duplicate rows.
+
+    drop_missing : bool, optional, default=False
+        Whether to drop rows with missing values after validating the data; the
+        k-nn classifier cannot use them.
+
+    columns_to_drop_file : str, optional, default=None
+        The path to the features left out of the model, if any.
+    """
+
+    def __init__(self, name, data_file, name_file, data_config_file, target, relabel, positive_label,
+                 drop_columns=None, statistics=None, na_values=None, unique_rows=True, drop_missing=False,
+                 columns_to_drop_file=None):
+        self.name = name
+        self.data_file = data_file
+        self.name_file = name_file
+        self.data_config_file = data_config_file
+        self.target = target
+        self.relabel = dict(relabel)
+        self.positive_label = positive_label
+        self.drop_columns = list(drop_columns or ['id_number'])
+        self.statistics = list(statistics) if statistics is not None else None
+        self.na_values = list(na_values) if na_values is not None else None
+        self.unique_rows = unique_rows
+        self.drop_missing = drop_missing
+        self.columns_to_drop_file = columns_to_drop_file
+
+
+# the data sets of the archive downloaded by scripts/download_data.py
+DATASETS = {spec.name: spec for spec in [
+    # Wisconsin Diagnostic Breast Cancer: the data set of the analysis and report
+    DatasetSpec('wdbc', 'wdbc.data', 'wdbc.names', 'data/processed/data_config.csv',
+                target='diagnosis', relabel={'M': 'Malignant', 'B': 'Benign'}, positive_label='Malignant',
+                statistics=['mean', 'se', 'max'],
+                columns_to_drop_file='data/processed/columns_to_drop.csv'),
+    # Wisconsin Prognostic Breast Cancer: the same nucleus features, predicting recurrence.
+    # The follow-up time is dropped: it is the time to recurrence or the disease-free time,
+    # depending on the outcome.
+    DatasetSpec('wpbc', 'wpbc.data', 'wpbc.names', 'data/processed/wpbc_data_config.csv',
+                target='outcome', relabel={'R': 'Recur', 'N': 'Nonrecur'}, positive_label='Recur',
+                drop_columns=['id_number', 'time'], statistics=['mean', 'se', 'max'], na_values=['?'],
+                drop_missing=True),
+    # Wisconsin Breast Cancer (original): cytology scores from 1 to 10, so different
+    # samples can have identical rows
+    DatasetSpec('breast-cancer-wisconsin', 'breast-cancer-wisconsin.data', 'breast-cancer-wisconsin.names',
+                'data/processed/breast-cancer-wisconsin_data_config.csv',
+                target='class', relabel={2: 'Benign', 4: 'Malignant'}, positive_label='Malignant',
+                drop_columns=['sample_code_number'], na_values=['?'], unique_rows=False, drop_missing=True)
+]}
+
+
+def get_dataset(name):
+    """
+    Look up a data set of the archive by name.
+
+    Parameters
+    ----------
+    name : str
+        One of the keys of `DATASETS`.
+
+    Returns
+    -------
+    DatasetSpec
+        The specification of the data set.
+
+    Raises
+    ------
+    ValueError
+        If there is no data set with this name.
+    """
+    if name not in DATASETS:
+        raise ValueError(f"Unknown dataset '{name}'; expected one of: {', '.join(DATASETS)}.")
+    return DATASETS[name]
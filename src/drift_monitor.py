@@ -0,0 +1,317 @@
+# drift_monitor.py
+# date: 2026-10-19
+
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+# the file the training profile is saved to in a model artifact directory
+DRIFT_REFERENCE_FILE = "drift_reference.json"
+
+# proportions are floored at this value when computing the PSI, so empty bins
+# do not make it infinite
+PSI_FLOOR = 1e-4
+
+
+def merge_moments(count, mean, m2, batch_count, batch_mean, batch_m2):
+    """
+    Merge the count, mean and sum of squared deviations of two sets of observations.
+
+    This is the pairwise form of Welford's algorithm (Chan et al.): merging a
+    batch's moments costs O(1) per feature and is numerically stable, unlike
+    updating running sums of squares.
+
+    Parameters
+    ----------
+    count, mean, m2 : numpy.ndarray
+        The running moments, one entry per feature.
+
+    batch_count, batch_mean, batch_m2 : numpy.ndarray
+        The moments of the batch, one entry per feature.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The merged count, mean and sum of squared deviations.
+    """
+    total = count + batch_count
+    safe_total = np.where(total > 0, total, 1)
+    delta = batch_mean - mean
+    merged_mean = np.where(total > 0, mean + delta * batch_count / safe_total, 0.0)
+    merged_m2 = m2 + batch_m2 + delta ** 2 * count * batch_count / safe_total
+    return total, merged_mean, merged_m2
+
+
+def population_stability_index(expected, actual):
+    """
+    Compute the population stability index (PSI) of binned counts.
+
+    Parameters
+    ----------
+    expected, actual : numpy.ndarray
+        The counts per bin of the reference and the current data, with the bins
+        in the last axis.
+
+    Returns
+    -------
+    numpy.ndarray or float
+        sum((p - q) * log(p / q)) over the bins, where p and q are the current
+        and reference proportions floored at `PSI_FLOOR`; NaN without current data.
+        Values below 0.1 are usually read as no shift, above 0.25 as a major shift.
+    """
+    expected = np.asarray(expected, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        q = np.maximum(expected / expected.sum(axis=-1, keepdims=True), PSI_FLOOR)
+        p = np.maximum(actual / actual.sum(axis=-1, keepdims=True), PSI_FLOOR)
+    return np.sum((p - q) * np.log(p / q), axis=-1)
+
+
+class DriftMonitor:
+    """
+    Running statistics of the features of scored data, compared to the training data.
+
+    The monitor keeps, per feature, the count, mean and sum of squared
+    deviations, the counts in histogram bins cut at the training data's
+    quantiles, the values outside the data configuration's range and the
+    missing values. `update` merges a batch in O(rows) time, and the state has
+    O(features) size, so batches are never kept or re-read. Create one with
+    `from_training_data` or `load`.
+
+    Parameters
+    ----------
+    features : list of str
+        The monitored feature columns.
+
+    edges : numpy.ndarray
+        The inner bin edges of each feature, of shape (features, bins - 1).
+        The outer bins are unbounded.
+
+    lower, upper : numpy.ndarray
+        The allowed range of each feature (NaN for no bound).
+
+    reference : dict, optional, default=None
+        The 'count', 'mean', 'm2' and 'bin_counts' of the training data, as
+        kept by the monitor; an empty reference by default.
+    """
+
+    def __init__(self, features, edges, lower, upper, reference=None):
+        self.features = list(features)
+        self.edges = np.asarray(edges, dtype=np.float64).reshape(len(self.features), -1)
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        self._lock = threading.Lock()
+        self.reset()
+        self.reference = ({name: np.asarray(value, dtype=np.float64) for name, value in reference.items()}
+                          if reference is not None else self._state())
+
+    def _state(self):
+        n_features, n_bins = len(self.features), self.edges.shape[1] + 1
+        return {'count': np.zeros(n_features), 'mean': np.zeros(n_features), 'm2': np.zeros(n_features),
+                'bin_counts': np.zeros((n_features, n_bins))}
+
+    def reset(self):
+        """Forget the scored data, e.g. to start a new monitoring window."""
+        self.current = self._state()
+        self.current.update({'below': np.zeros(len(self.features)), 'above': np.zeros(len(self.features)),
+                             'missing': np.zeros(len(self.features)),
+                             'min': np.full(len(self.features), np.inf),
+                             'max': np.full(len(self.features), -np.inf)})
+
+    @classmethod
+    def from_training_data(cls, data, data_config, n_bins=10):
+        """
+        Profile the training data.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame
+            The training data. Its numeric columns that are in the data
+            configuration are monitored.
+
+        data_config : pandas.DataFrame
+            The data configuration, with the 'min' and 'max' of each column.
+
+        n_bins : int, optional, default=10
+            The number of histogram bins per feature, cut at the training data's
+            quantiles so each holds about the same share of it.
+
+        Returns
+        -------
+        DriftMonitor
+            The monitor, with the training data as reference and no scored data.
+
+        Raises
+        ------
+        TypeError
+            If 'data' or 'data_config' is not a pandas data frame.
+
+        ValueError
+            If 'n_bins' is less than 2, or no numeric column is in the data configuration.
+        """
+        if not isinstance(data, pd.DataFrame) or not isinstance(data_config, pd.DataFrame):
+            raise TypeError("data and data_config must be pandas data frames.")
+        if n_bins < 2:
+            raise ValueError("n_bins must be at least 2.")
+        config = data_config.assign(column=data_config['column'].str.strip()).set_index('column')
+        features = [name for name in data.select_dtypes('number').columns if name in config.index]
+        if not features:
+            raise ValueError("The data has no numeric column in the data configuration.")
+
+        values = data[features].to_numpy(dtype=np.float64)
+        edges = np.nanquantile(values, np.linspace(0, 1, n_bins + 1)[1:-1], axis=0).T
+        monitor = cls(features, edges, config.loc[features, 'min'].astype(float).to_numpy(),
+                      config.loc[features, 'max'].astype(float).to_numpy())
+        monitor.update(data)
+        monitor.reference = {name: monitor.current[name].copy() for name in ['count', 'mean', 'm2', 'bin_counts']}
+        monitor.reset()
+        return monitor
+
+    def update(self, batch):
+        """
+        Merge a batch of scored rows into the running statistics.
+
+        Parameters
+        ----------
+        batch : pandas.DataFrame
+            The rows; missing values are counted, but left out of the moments
+            and histograms.
+
+        Raises
+        ------
+        ValueError
+            If the batch does not have every monitored feature.
+        """
+        missing = [name for name in self.features if name not in batch.columns]
+        if missing:
+            raise ValueError(f"The batch is missing features: {', '.join(missing)}.")
+        values = batch[self.features].to_numpy(dtype=np.float64)
+        observed = ~np.isnan(values)
+        batch_count = observed.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            batch_mean = np.where(batch_count > 0, np.nansum(values, axis=0) / batch_count, 0.0)
+        batch_m2 = np.nansum((values - batch_mean) ** 2, axis=0)
+        bin_counts = np.zeros_like(self.current['bin_counts'])
+        for j in range(len(self.features)):
+            column = values[observed[:, j], j]
+            bins = np.searchsorted(self.edges[j], column, side='right')
+            bin_counts[j] = np.bincount(bins, minlength=bin_counts.shape[1])
+
+        with self._lock:
+            state = self.current
+            state['count'], state['mean'], state['m2'] = merge_moments(
+                state['count'], state['mean'], state['m2'], batch_count, batch_mean, batch_m2)
+            state['bin_counts'] += bin_counts
+            # comparisons with a NaN bound are False, so unbounded sides count nothing
+            state['below'] += (values < self.lower).sum(axis=0)
+            state['above'] += (values > self.upper).sum(axis=0)
+            state['missing'] += (~observed).sum(axis=0)
+            if values.shape[0]:
+                state['min'] = np.fmin(state['min'], np.nanmin(np.where(observed, values, np.inf), axis=0))
+                state['max'] = np.fmax(state['max'], np.nanmax(np.where(observed, values, -np.inf), axis=0))
+
+    def report(self, psi_threshold=0.2):
+        """
+        Compare the scored data with the training data, feature by feature.
+
+        Parameters
+        ----------
+        psi_threshold : float, optional, default=0.2
+            The population stability index above which a feature has drifted.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Indexed by feature: the 'count', 'mean', 'std', 'min' and 'max' of
+            the scored data, the 'reference_mean' and 'reference_std', the
+            'mean_shift' in reference standard deviations, the 'below_range',
+            'above_range' and 'missing' counts, the 'psi', and whether the
+            feature left its range ('out_of_range'), passed the PSI threshold
+            ('psi_drift') or either ('drift').
+        """
+        def std(state):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(state['count'] > 1, np.sqrt(state['m2'] / (state['count'] - 1)), np.nan)
+
+        with self._lock:
+            current = {name: value.copy() for name, value in self.current.items()}
+        seen = current['count'] > 0
+        psi = np.where(seen, population_stability_index(self.reference['bin_counts'], current['bin_counts']), np.nan)
+        report = pd.DataFrame({
+            'count': current['count'].astype(np.int64),
+            'mean': np.where(seen, current['mean'], np.nan),
+            'std': std(current),
+            'min': np.where(seen, current['min'], np.nan),
+            'max': np.where(seen, current['max'], np.nan),
+            'reference_mean': self.reference['mean'],
+            'reference_std': std(self.reference),
+            'below_range': current['below'].astype(np.int64),
+            'above_range': current['above'].astype(np.int64),
+            'missing': current['missing'].astype(np.int64),
+            'psi': psi
+        }, index=pd.Index(self.features, name='feature'))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            report.insert(7, 'mean_shift', (report['mean'] - report['reference_mean']) / report['reference_std'])
+        report['out_of_range'] = (report['below_range'] + report['above_range']) > 0
+        report['psi_drift'] = report['psi'] > psi_threshold
+        report['drift'] = report['out_of_range'] | report['psi_drift']
+        return report
+
+    def drifted_features(self, psi_threshold=0.2):
+        """Return the features flagged by `report`, in feature order."""
+        report = self.report(psi_threshold)
+        return report.index[report['drift']].tolist()
+
+    def save(self, path):
+        """
+        Save the monitor, with its reference and running statistics, as JSON.
+
+        Parameters
+        ----------
+        path : str
+            The JSON file; its directory is created if needed.
+        """
+        with self._lock:
+            current = {name: value.tolist() for name, value in self.current.items()}
+        state = {
+            'features': self.features,
+            'edges': self.edges.tolist(),
+            'lower': self.lower.tolist(),
+            'upper': self.upper.tolist(),
+            'reference': {name: value.tolist() for name, value in self.reference.items()},
+            'current': current
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            # NaN bounds and infinite minima/maxima are written as JSON's non-standard NaN/Infinity
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a monitor saved with `save`.
+
+        Parameters
+        ----------
+        path : str
+            The JSON file, e.g. the `DRIFT_REFERENCE_FILE` of a model artifact.
+
+        Returns
+        -------
+        DriftMonitor
+            The monitor, with the running statistics it was saved with.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError("The drift monitor file does not exist.")
+        with open(path) as f:
+            state = json.load(f)
+        monitor = cls(state['features'], state['edges'], state['lower'], state['upper'], state['reference'])
+        monitor.current = {name: np.asarray(value, dtype=np.float64) for name, value in state['current'].items()}
+        return monitor
@@ -0,0 +1,398 @@
+# evaluation_metrics.py
+# date: 2026-10-19
+
+import numpy as np
+import pandas as pd
+
+
+def encode_labels(values, labels):
+    """
+    Encode class labels as integer codes.
+
+    Parameters
+    ----------
+    values : array-like
+        The class labels to encode.
+
+    labels : list of str
+        The known class labels; a label's code is its position in this list.
+
+    Returns
+    -------
+    numpy.ndarray
+        A 1D int64 array of codes.
+
+    Raises
+    ------
+    ValueError
+        If 'values' contains a label that is not in 'labels'.
+    """
+    codes = pd.Index(labels).get_indexer(np.asarray(values)).astype(np.int64)
+    if (codes < 0).any():
+        raise ValueError("values contains labels that are not in labels.")
+    return codes
+
+
+def confusion_counts(y_true, y_pred, labels):
+    """
+    Count the observations in every (actual, predicted) class pair.
+
+    Parameters
+    ----------
+    y_true : array-like
+        The actual class labels.
+
+    y_pred : array-like
+        The predicted class labels.
+
+    labels : list of str
+        The class labels, in the order used for the rows and columns of the result.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (n_labels, n_labels) int64 array; rows are actual and columns predicted classes.
+
+    Raises
+    ------
+    ValueError
+        If 'y_true' and 'y_pred' have different lengths, or contain unknown labels.
+    """
+    if len(y_true) != len(y_pred):
+        raise ValueError("y_true and y_pred must have the same length.")
+    n_labels = len(labels)
+    cells = encode_labels(y_true, labels) * n_labels + encode_labels(y_pred, labels)
+    return np.bincount(cells, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+
+
+def _safe_divide(numerator, denominator):
+    # 0 / 0 is reported as 0, like scikit-learn's zero_division default
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator != 0)
+
+
+def fbeta_from_counts(tp, fp, fn, beta=2):
+    """
+    Compute the F-beta score from true positive, false positive and false negative counts.
+
+    The counts may be scalars or arrays (e.g. one entry per bootstrap replicate or
+    per threshold), in which case one score is returned per entry.
+
+    Parameters
+    ----------
+    tp, fp, fn : int or numpy.ndarray
+        The true positive, false positive and false negative counts.
+
+    beta : float, optional, default=2
+        The weight of recall relative to precision.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        The F-beta score(s).
+    """
+    beta2 = beta ** 2
+    return _safe_divide((1 + beta2) * np.asarray(tp), (1 + beta2) * np.asarray(tp) + beta2 * np.asarray(fn) + fp)
+
+
+def scores_from_counts(counts, labels, pos_label='Malignant', beta=2):
+    """
+    Compute accuracy and the F-beta score of the positive class from confusion counts.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        A (n_labels, n_labels) array of confusion counts, as returned by `confusion_counts`.
+
+    labels : list of str
+        The class labels, in the order of the rows and columns of 'counts'.
+
+    pos_label : str, optional, default='Malignant'
+        The positive class.
+
+    beta : float, optional, default=2
+        The weight of recall relative to precision.
+
+    Returns
+    -------
+    dict
+        The 'accuracy' and 'fbeta' scores.
+
+    Raises
+    ------
+    ValueError
+        If 'pos_label' is not in 'labels'.
+    """
+    if pos_label not in labels:
+        raise ValueError("pos_label must be one of the labels.")
+    pos = list(labels).index(pos_label)
+    tp = counts[pos, pos]
+    return {
+        'accuracy': float(_safe_divide(np.trace(counts), counts.sum())),
+        'fbeta': float(fbeta_from_counts(tp, counts[:, pos].sum() - tp, counts[pos, :].sum() - tp, beta))
+    }
+
+
+def per_class_scores(counts, labels, beta=2):
+    """
+    Compute precision, recall, F-beta and support for every class from confusion counts.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        A (n_labels, n_labels) array of confusion counts, as returned by `confusion_counts`.
+
+    labels : list of str
+        The class labels, in the order of the rows and columns of 'counts'.
+
+    beta : float, optional, default=2
+        The weight of recall relative to precision.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per class with 'precision', 'recall', 'F{beta} score' and 'support' columns.
+    """
+    tp = np.diag(counts)
+    predicted = counts.sum(axis=0)
+    support = counts.sum(axis=1)
+    return pd.DataFrame({
+        'precision': _safe_divide(tp, predicted),
+        'recall': _safe_divide(tp, support),
+        f'F{beta:g} score': fbeta_from_counts(tp, predicted - tp, support - tp, beta),
+        'support': support
+    }, index=pd.Index(labels, name='class'))
+
+
+def confusion_matrix_frame(counts, labels):
+    """
+    Format confusion counts as a dataframe with actual classes as rows and predictions as columns.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        A (n_labels, n_labels) array of confusion counts, as returned by `confusion_counts`.
+
+    labels : list of str
+        The class labels, in the order of the rows and columns of 'counts'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The confusion matrix, laid out like `pandas.crosstab(actual, predicted)`.
+    """
+    return pd.DataFrame(counts,
+                        index=pd.Index(labels, name='class'),
+                        columns=pd.Index(labels, name='predicted'))
+
+
+def accumulate_confusion_counts(chunks, predict, labels, target='class'):
+    """
+    Accumulate confusion counts over a stream of data chunks.
+
+    Only one chunk and its predictions are held in memory at a time, so the memory
+    used does not grow with the number of rows evaluated.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.DataFrame
+        The evaluation data, e.g. the iterator returned by `pandas.read_csv(..., chunksize=n)`.
+
+    predict : callable
+        A function mapping a chunk's feature columns to predicted class labels,
+        e.g. a fitted pipeline's `predict` method.
+
+    labels : list of str
+        The class labels, in the order used for the rows and columns of the result.
+
+    target : str, optional, default='class'
+        The name of the column holding the actual class labels.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (n_labels, n_labels) int64 array of confusion counts over all chunks.
+    """
+    counts = np.zeros((len(labels), len(labels)), dtype=np.int64)
+    for chunk in chunks:
+        if chunk.shape[0] == 0:
+            continue
+        counts += confusion_counts(chunk[target], predict(chunk.drop(columns=[target])), labels)
+    return counts
+
+
+def bootstrap_confusion_counts(counts, n_replicates=10000, random_state=None):
+    """
+    Draw bootstrap replicates of a confusion matrix.
+
+    Resampling the N evaluated rows with replacement and recounting them is the same
+    as drawing the cell counts from a multinomial distribution with N trials and the
+    observed cell frequencies. All replicates are therefore drawn at once as a single
+    (n_replicates, n_cells) matrix of multinomial counts, without revisiting the rows
+    or the model.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        A (n_labels, n_labels) array of confusion counts, as returned by `confusion_counts`.
+
+    n_replicates : int, optional, default=10000
+        The number of bootstrap replicates.
+
+    random_state : int, optional, default=None
+        Seed for the random number generator.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (n_replicates, n_labels, n_labels) int64 array of replicate confusion counts.
+
+    Raises
+    ------
+    ValueError
+        If 'n_replicates' is not positive or 'counts' is empty.
+    """
+    if n_replicates < 1:
+        raise ValueError("n_replicates must be a positive integer.")
+    n_rows = int(counts.sum())
+    if n_rows == 0:
+        raise ValueError("counts must contain at least one observation.")
+
+    rng = np.random.default_rng(random_state)
+    replicates = rng.multinomial(n_rows, counts.ravel() / n_rows, size=n_replicates)
+    return replicates.reshape(n_replicates, *counts.shape)
+
+
+def bootstrap_scores(counts, labels, pos_label='Malignant', beta=2, n_replicates=10000,
+                     confidence_level=0.95, random_state=None):
+    """
+    Compute percentile bootstrap confidence intervals for accuracy and the F-beta score.
+
+    The scores of every replicate are computed with vectorized arithmetic on the
+    replicate confusion counts from `bootstrap_confusion_counts`.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        A (n_labels, n_labels) array of confusion counts, as returned by `confusion_counts`.
+
+    labels : list of str
+        The class labels, in the order of the rows and columns of 'counts'.
+
+    pos_label : str, optional, default='Malignant'
+        The positive class.
+
+    beta : float, optional, default=2
+        The weight of recall relative to precision.
+
+    n_replicates : int, optional, default=10000
+        The number of bootstrap replicates.
+
+    confidence_level : float, optional, default=0.95
+        The coverage of the confidence intervals.
+
+    random_state : int, optional, default=None
+        Seed for the random number generator.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per metric ('accuracy' and 'fbeta') with the point 'estimate' and the
+        'lower' and 'upper' bounds of the confidence interval.
+
+    Raises
+    ------
+    ValueError
+        If 'confidence_level' is not between 0 and 1, or 'pos_label' is not in 'labels'.
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1.")
+    if pos_label not in labels:
+        raise ValueError("pos_label must be one of the labels.")
+
+    replicates = bootstrap_confusion_counts(counts, n_replicates, random_state)
+    pos = list(labels).index(pos_label)
+    tp = replicates[:, pos, pos]
+    replicate_scores = {
+        'accuracy': _safe_divide(np.trace(replicates, axis1=1, axis2=2), replicates.sum(axis=(1, 2))),
+        'fbeta': fbeta_from_counts(tp, replicates[:, :, pos].sum(axis=1) - tp,
+                                   replicates[:, pos, :].sum(axis=1) - tp, beta)
+    }
+
+    point_estimates = scores_from_counts(counts, labels, pos_label, beta)
+    alpha = (1 - confidence_level) / 2
+    return pd.DataFrame([
+        {'metric': metric,
+         'estimate': point_estimates[metric],
+         'lower': np.quantile(values, alpha),
+         'upper': np.quantile(values, 1 - alpha)}
+        for metric, values in replicate_scores.items()
+    ]).set_index('metric')
+
+
+def threshold_sweep(y_true, scores, pos_label='Malignant', beta=2):
+    """
+    Compute confusion counts and scores for every candidate decision threshold.
+
+    A row is predicted positive when its score (e.g. the predicted probability of the
+    positive class) is greater than or equal to the threshold. Every distinct score is
+    a candidate threshold; the counts for all of them are obtained from one sort of
+    the scores and a cumulative sum of the positive labels.
+
+    Parameters
+    ----------
+    y_true : array-like
+        The actual class labels.
+
+    scores : array-like
+        The score of the positive class for each row.
+
+    pos_label : str, optional, default='Malignant'
+        The positive class.
+
+    beta : float, optional, default=2
+        The weight of recall relative to precision.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per candidate threshold, in decreasing threshold order, with the
+        'threshold', 'tp', 'fp', 'fn', 'tn', 'precision', 'recall' and
+        'F{beta} score' columns.
+
+    Raises
+    ------
+    ValueError
+        If 'y_true' and 'scores' have different lengths or are empty.
+    """
+    y_true = np.asarray(y_true)
+    scores = np.asarray(scores, dtype=np.float64)
+    if y_true.shape[0] != scores.shape[0]:
+        raise ValueError("y_true and scores must have the same length.")
+    if y_true.shape[0] == 0:
+        raise ValueError("y_true must contain at least one observation.")
+
+    order = np.argsort(-scores, kind='stable')
+    sorted_scores = scores[order]
+    is_positive = (y_true[order] == pos_label).astype(np.int64)
+
+    # the last row of each run of tied scores closes that threshold
+    last_of_run = np.r_[np.flatnonzero(np.diff(sorted_scores)), sorted_scores.shape[0] - 1]
+    tp = np.cumsum(is_positive)[last_of_run]
+    fp = last_of_run + 1 - tp
+    n_positive = is_positive.sum()
+    fn = n_positive - tp
+    tn = (y_true.shape[0] - n_positive) - fp
+
+    return pd.DataFrame({
+        'threshold': sorted_scores[last_of_run],
+        'tp': tp,
+        'fp': fp,
+        'fn': fn,
+        'tn': tn,
+        'precision': _safe_divide(tp, tp + fp),
+        'recall': _safe_divide(tp, n_positive),
+        f'F{beta:g} score': fbeta_from_counts(tp, fp, fn, beta)
+    })
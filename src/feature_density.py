@@ -0,0 +1,130 @@
+# feature_density.py
+# date: 2026-10-19
+
+import numpy as np
+import pandas as pd
+
+
+def kde_bandwidth(values):
+    """
+    Estimate the bandwidth of a Gaussian kernel density estimate.
+
+    Uses the same rule of thumb as Vega-Lite's `transform_density`:
+    1.06 * min(standard deviation, interquartile range / 1.34) * n^(-1/5),
+    falling back to the standard deviation (or the first quartile, or 1) when
+    the spread is zero.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        A 2D array; one bandwidth is estimated per column.
+
+    Returns
+    -------
+    numpy.ndarray
+        The bandwidth of each column.
+    """
+    n = values.shape[0]
+    deviation = values.std(axis=0, ddof=1) if n > 1 else np.zeros(values.shape[1])
+    q1, q3 = np.quantile(values, [0.25, 0.75], axis=0)
+    spread = np.minimum(deviation, (q3 - q1) / 1.34)
+    for fallback in [deviation, np.abs(q1), np.ones_like(q1)]:
+        spread = np.where(spread == 0, fallback, spread)
+    return 1.06 * spread * n ** -0.2
+
+
+def kde_on_grid(values, grid, bandwidth, chunk_size=1000):
+    """
+    Evaluate Gaussian kernel density estimates of several columns on grids.
+
+    Observations are processed in chunks of rows, so memory use depends on
+    'chunk_size' and the grid size, not on the number of observations.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The (n_observations, n_columns) data.
+
+    grid : numpy.ndarray
+        The (n_points, n_columns) points at which each column's density is evaluated.
+
+    bandwidth : numpy.ndarray
+        The bandwidth of each column.
+
+    chunk_size : int, optional, default=1000
+        The number of observations processed at a time.
+
+    Returns
+    -------
+    numpy.ndarray
+        The (n_points, n_columns) density estimates.
+    """
+    density = np.zeros(grid.shape)
+    for start in range(0, values.shape[0], chunk_size):
+        z = (grid[:, np.newaxis, :] - values[np.newaxis, start:start + chunk_size, :]) / bandwidth
+        density += np.exp(-0.5 * z ** 2).sum(axis=1)
+    return density / (values.shape[0] * bandwidth * np.sqrt(2 * np.pi))
+
+
+def feature_densities(dataframe, target='class', n_points=200, chunk_size=1000):
+    """
+    Compute per-class kernel density estimates of every feature on a fixed grid.
+
+    Every (class, feature) density is evaluated at the same 'n_points' evenly
+    spaced values, spanning the range of all feature values, like Vega-Lite's
+    `transform_density` on the melted data frame. The result holds only the grid
+    points, so a chart of it does not grow with the number of observations.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        The data, with numeric feature columns and a class column.
+
+    target : str, optional, default='class'
+        The name of the class column.
+
+    n_points : int, optional, default=200
+        The number of grid points per class and feature.
+
+    chunk_size : int, optional, default=1000
+        See `kde_on_grid`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A long data frame with 'class', 'predictor', 'value' and 'density' columns
+        and n_classes * n_features * n_points rows.
+
+    Raises
+    ------
+    TypeError
+        If 'dataframe' is not a pandas data frame.
+
+    ValueError
+        If 'target' is not a column, a feature column is not numeric or
+        'n_points' is less than 2.
+    """
+    if not isinstance(dataframe, pd.DataFrame):
+        raise TypeError("dataframe must be a pandas data frame.")
+    if target not in dataframe.columns:
+        raise ValueError(f"The class column '{target}' is not in the data frame.")
+    features = dataframe.drop(columns=[target])
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in features.dtypes):
+        raise ValueError("All feature columns must be numeric.")
+    if n_points < 2:
+        raise ValueError("n_points must be at least 2.")
+
+    all_values = features.to_numpy(dtype=np.float64)
+    grid = np.repeat(np.linspace(all_values.min(), all_values.max(), n_points)[:, np.newaxis],
+                     features.shape[1], axis=1)
+    densities = []
+    for label, group in features.groupby(dataframe[target], sort=True):
+        values = group.to_numpy(dtype=np.float64)
+        density = kde_on_grid(values, grid, kde_bandwidth(values), chunk_size)
+        densities.append(pd.DataFrame({
+            target: label,
+            'predictor': np.tile(features.columns.to_numpy(dtype=object), n_points),
+            'value': grid.ravel(),
+            'density': density.ravel()
+        }))
+    return pd.concat(densities, ignore_index=True)
@@ -0,0 +1,177 @@
+# figure_rendering.py
+# date: 2026-10-19
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import altair as alt
+from altair.utils.mimebundle import spec_to_mimebundle
+
+# the renderer's version is part of the hash, so upgrading it re-renders every figure
+try:
+    import vl_convert
+    RENDERER_VERSION = vl_convert.__version__
+except ImportError:
+    RENDERER_VERSION = None
+
+HASH_SUFFIX = '.hash.json'
+
+
+def chart_spec(chart):
+    """
+    Return the Vega-Lite specification of a chart, with its data inline.
+
+    Parameters
+    ----------
+    chart : altair.TopLevelMixin
+        The chart.
+
+    Returns
+    -------
+    dict
+        The specification, as `chart.save` would render it.
+    """
+    # `chart.save` lifts the row limit too
+    with alt.data_transformers.disable_max_rows():
+        return chart.to_dict()
+
+
+def spec_hash(spec, scale_factor=2.0):
+    """
+    Hash a chart specification and the settings it is rendered with.
+
+    Parameters
+    ----------
+    spec : dict
+        The Vega-Lite specification, as returned by `chart_spec`.
+
+    scale_factor : float, optional, default=2.0
+        The scale factor of the PNG.
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 digest of the specification (including its inline
+        data), the scale factor and the Altair and vl-convert versions.
+    """
+    content = json.dumps({
+        'spec': spec,
+        'scale_factor': scale_factor,
+        'altair': alt.__version__,
+        'vl_convert': RENDERER_VERSION
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def is_up_to_date(path, digest):
+    """
+    Check whether a PNG was rendered from a specification and not changed since.
+
+    Parameters
+    ----------
+    path : str
+        The PNG file.
+
+    digest : str
+        The hash of the specification, as returned by `spec_hash`.
+
+    Returns
+    -------
+    bool
+        True if the PNG and its '.hash.json' file exist, the recorded specification
+        hash is 'digest' and the recorded PNG hash matches the file.
+    """
+    if not os.path.exists(path) or not os.path.exists(path + HASH_SUFFIX):
+        return False
+    with open(path + HASH_SUFFIX) as f:
+        recorded = json.load(f)
+    return recorded.get('spec') == digest and recorded.get('png') == _file_hash(path)
+
+
+def render_png(spec, path, scale_factor=2.0):
+    """
+    Render a Vega-Lite specification to a PNG file with vl-convert.
+
+    The bytes written are the same as those of `chart.save(path, scale_factor=...)`.
+
+    Parameters
+    ----------
+    spec : dict
+        The Vega-Lite specification, as returned by `chart_spec`.
+
+    path : str
+        The PNG file to write.
+
+    scale_factor : float, optional, default=2.0
+        The scale factor of the PNG.
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 digest of the PNG.
+    """
+    bundle = spec_to_mimebundle(spec, format='png', mode='vega-lite', scale_factor=scale_factor)
+    # the PNG bundle comes with its metadata
+    png = (bundle[0] if isinstance(bundle, tuple) else bundle)['image/png']
+    with open(path, 'wb') as f:
+        f.write(png)
+    return hashlib.sha256(png).hexdigest()
+
+
+def render_figures(figures, scale_factor=2.0, n_jobs=1):
+    """
+    Render charts to PNG files, skipping those whose PNG is up to date.
+
+    Each PNG gets a '.hash.json' file next to it recording the hash of the
+    specification it was rendered from (see `spec_hash`) and of the PNG itself. A
+    chart is only rendered if its PNG is missing, changed, or was rendered from a
+    different specification. Charts that need rendering are rendered concurrently
+    in a pool of 'n_jobs' (spawned) processes.
+
+    Parameters
+    ----------
+    figures : dict
+        Maps each PNG file to write to its chart.
+
+    scale_factor : float, optional, default=2.0
+        The scale factor of the PNGs.
+
+    n_jobs : int, optional, default=1
+        The number of rendering processes; 1 renders in this process.
+
+    Returns
+    -------
+    dict
+        Maps each PNG file to True if it was rendered, or False if it was up to date.
+
+    Raises
+    ------
+    ValueError
+        If 'n_jobs' is not a positive integer.
+    """
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be a positive integer.")
+    specs = {path: chart_spec(chart) for path, chart in figures.items()}
+    digests = {path: spec_hash(spec, scale_factor) for path, spec in specs.items()}
+    stale = [path for path in specs if not is_up_to_date(path, digests[path])]
+
+    if n_jobs == 1 or len(stale) < 2:
+        png_digests = [render_png(specs[path], path, scale_factor) for path in stale]
+    else:
+        # vl-convert runs its own threads, so forking after a render can deadlock
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(stale)), mp_context=context) as executor:
+            png_digests = list(executor.map(render_png, [specs[path] for path in stale], stale,
+                                            [scale_factor] * len(stale)))
+
+    for path, png_digest in zip(stale, png_digests):
+        with open(path + HASH_SUFFIX, 'w') as f:
+            json.dump({'spec': digests[path], 'png': png_digest}, f, indent=2)
+    return {path: path in stale for path in figures}
@@ -0,0 +1,359 @@
+# inference_server.py
+# date: 2026-10-19
+
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+from sklearn import config_context, get_config
+from src.batch_predict import predict_chunk
+from src.prediction_cache import PredictionCache
+
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+class Histogram:
+    """
+    A thread-safe histogram with fixed bucket upper bounds.
+
+    Parameters
+    ----------
+    bounds : list of float
+        The increasing upper bounds of the buckets. Values above the last
+        bound are counted in an extra, unbounded bucket.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self._counts = np.zeros(len(self.bounds) + 1, dtype=np.int64)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Count one observation."""
+        bucket = np.searchsorted(self.bounds, value, side='left')
+        with self._lock:
+            self._counts[bucket] += 1
+            self._sum += value
+
+    def snapshot(self):
+        """
+        Return the observation count, sum and cumulative bucket counts.
+
+        Returns
+        -------
+        dict
+            The 'count' and 'sum' of the observations, and 'buckets', a list of
+            {'le': bound, 'count': observations <= bound} entries ending with the
+            unbounded bucket (whose bound is reported as the string '+Inf').
+        """
+        with self._lock:
+            counts = self._counts.cumsum()
+            total = self._sum
+        bounds = self.bounds + ['+Inf']
+        return {
+            'count': int(counts[-1]),
+            'sum': total,
+            'buckets': [{'le': bound, 'count': int(count)} for bound, count in zip(bounds, counts)]
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent prediction requests into micro-batches.
+
+    Requests are queued, and a background thread scores them together in one
+    call once either 'max_batch_size' rows are waiting or 'max_wait' seconds
+    have passed since the first request of the batch arrived. Each request is
+    answered with its own slice of the batch predictions.
+
+    Parameters
+    ----------
+    predict : callable
+        A function mapping a dataframe of rows to a dataframe of predictions with
+        one row per input row, e.g. `predict_chunk` bound to a pipeline.
+
+    max_batch_size : int, optional, default=64
+        The number of rows that closes a batch. A single request with more rows
+        is scored as its own batch.
+
+    max_wait : float, optional, default=0.005
+        The longest time, in seconds, a request waits for others to join its batch.
+    """
+
+    def __init__(self, predict, max_batch_size=64, max_wait=0.005):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+        if max_wait < 0:
+            raise ValueError("max_wait must not be negative.")
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batch_sizes = Histogram([2 ** i for i in range(int(math.log2(max_batch_size)) + 1)])
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, rows):
+        """
+        Queue rows for prediction.
+
+        Parameters
+        ----------
+        rows : pandas.DataFrame
+            The rows to score.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            A future resolving to the predictions for 'rows'.
+        """
+        future = Future()
+        self._queue.put((rows, future))
+        return future
+
+    def close(self):
+        """Score the requests already queued and stop the batching thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        closing = False
+        while not closing:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            n_rows = first[0].shape[0]
+            deadline = time.monotonic() + self.max_wait
+            while n_rows < self.max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+                n_rows += item[0].shape[0]
+            self._score(batch, n_rows)
+
+    def _score(self, batch, n_rows):
+        self.batch_sizes.observe(n_rows)
+        try:
+            predictions = self.predict(pd.concat([rows for rows, _ in batch], ignore_index=True))
+        except Exception as error:
+            if len(batch) == 1:
+                batch[0][1].set_exception(error)
+                return
+            # score each request on its own, so one request's failure does not reach its batch-mates
+            for rows, future in batch:
+                try:
+                    future.set_result(self.predict(rows))
+                except Exception as error:
+                    future.set_exception(error)
+            return
+        start = 0
+        for rows, future in batch:
+            stop = start + rows.shape[0]
+            future.set_result(predictions.iloc[start:stop])
+            start = stop
+
+
+def _is_finite_number(value):
+    # JSON numbers only: bool is a subclass of int, and null, strings and NaN/Infinity are not scorable
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:
+        # an integer too large for a float
+        return False
+
+
+def parse_rows(payload, feature_names):
+    """
+    Convert a JSON request body into a dataframe of feature rows.
+
+    Parameters
+    ----------
+    payload : dict or list of dict
+        A single row or a list of rows, each mapping feature names to values.
+        Extra fields are ignored.
+
+    feature_names : list of str
+        The feature columns required by the model.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The rows, with the feature columns as float64 in 'feature_names' order.
+
+    Raises
+    ------
+    ValueError
+        If the payload is not a row or a non-empty list of rows, a feature is
+        missing or a value is not a finite JSON number (null, strings and
+        booleans are rejected).
+    """
+    rows = [payload] if isinstance(payload, dict) else payload
+    if not isinstance(rows, list) or len(rows) == 0 or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("The request body must be a JSON object or a non-empty list of JSON objects.")
+    missing = sorted({feature for row in rows for feature in feature_names if feature not in row})
+    if missing:
+        raise ValueError(f"Missing features: {', '.join(missing)}.")
+    for row in rows:
+        for feature in feature_names:
+            value = row[feature]
+            if not _is_finite_number(value):
+                raise ValueError(f"Feature values must be finite numbers; got {json.dumps(value)} for {feature}.")
+    return pd.DataFrame(rows, columns=feature_names).astype(np.float64)
+
+
+def model_feature_names(pipeline):
+    """Return the feature columns required by a pipeline loaded with `load_pipeline`."""
+    metadata = getattr(pipeline, 'artifact_metadata_', None)
+    if metadata is not None:
+        return list(metadata['feature_names'])
+    return list(pipeline.feature_names_in_)
+
+
+class _PredictionHandler(BaseHTTPRequestHandler):
+    # the server attributes (batcher, latency, feature_names) are set by make_server
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/metrics':
+            metrics = {
+                'request_latency_ms': self.server.latency.snapshot(),
+                'batch_size': self.server.batcher.batch_sizes.snapshot()
+            }
+            if self.server.cache is not None:
+                metrics['cache'] = self.server.cache.stats()
+            if self.server.drift_monitor is not None:
+                report = self.server.drift_monitor.report(self.server.psi_threshold)
+                metrics['drift'] = {
+                    'rows': int(report['count'].max()),
+                    'drifted_features': report.index[report['drift']].tolist(),
+                    'psi': report['psi'].dropna().round(4).to_dict()
+                }
+            self._send_json(200, metrics)
+        else:
+            self._send_json(404, {'error': 'Not found.'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': 'Not found.'})
+            return
+        start = time.perf_counter()
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            rows = parse_rows(payload, self.server.feature_names)
+        except ValueError as error:
+            self._send_json(400, {'error': str(error)})
+            return
+        try:
+            predictions = self.server.batcher.submit(rows).result().to_dict(orient='records')
+        except Exception as error:
+            self._send_json(500, {'error': str(error)})
+            return
+        # observed before responding, so a client's next /metrics request includes it
+        self.server.latency.observe((time.perf_counter() - start) * 1000)
+        self._send_json(200, predictions[0] if isinstance(payload, dict) else predictions)
+
+    def _send_json(self, status, body):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _PredictionServer(ThreadingHTTPServer):
+    # the default backlog of 5 resets connections under concurrent load
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def make_server(pipeline, host='127.0.0.1', port=8000, max_batch_size=64, max_wait=0.005, cache_size=0,
+                verbose=False, drift_monitor=None, psi_threshold=0.2):
+    """
+    Create a local HTTP server answering prediction requests with micro-batching.
+
+    The server answers `POST /predict` with the predictions (see `predict_chunk`)
+    for a JSON row or list of rows, `GET /metrics` with histograms of request
+    latency (in milliseconds) and batch size (and the prediction cache counters
+    and drifted features, if enabled), and `GET /health`. Call
+    `serve_forever()` to start it, and `shutdown()` then `batcher.close()` to stop it.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline
+        A fitted pipeline, as returned by `load_pipeline`.
+
+    host : str, optional, default='127.0.0.1'
+        The address to listen on.
+
+    port : int, optional, default=8000
+        The port to listen on; 0 picks a free port.
+
+    max_batch_size : int, optional, default=64
+        See `MicroBatcher`.
+
+    max_wait : float, optional, default=0.005
+        See `MicroBatcher`.
+
+    cache_size : int, optional, default=0
+        If positive, predictions are cached for this many rows with a
+        `PredictionCache`; the pipeline must then be a model artifact.
+
+    verbose : bool, optional, default=False
+        Whether to log every request to stderr.
+
+    drift_monitor : DriftMonitor, optional, default=None
+        If given, every micro-batch is merged into its running statistics, and
+        /metrics reports the rows seen, the PSI of each feature and the
+        features that drifted.
+
+    psi_threshold : float, optional, default=0.2
+        See `DriftMonitor.report`.
+
+    Returns
+    -------
+    http.server.ThreadingHTTPServer
+        The server, with 'batcher', 'latency', 'cache' and 'drift_monitor' attributes.
+    """
+    # scikit-learn's configuration is per thread; score with the caller's
+    # (e.g. transform_output="pandas") in the batching thread too
+    config = get_config()
+    cache = PredictionCache(pipeline, max_size=cache_size) if cache_size else None
+    model = pipeline if cache is None else cache
+
+    def predict(rows):
+        with config_context(**config):
+            predictions = predict_chunk(model, rows)
+        # only scored rows are monitored: a failed batch is scored again request by request
+        if drift_monitor is not None:
+            drift_monitor.update(rows)
+        return predictions
+
+    server = _PredictionServer((host, port), _PredictionHandler)
+    server.feature_names = model_feature_names(pipeline)
+    server.batcher = MicroBatcher(predict, max_batch_size, max_wait)
+    server.latency = Histogram(LATENCY_BUCKETS_MS)
+    server.cache = cache
+    server.drift_monitor = drift_monitor
+    server.psi_threshold = psi_threshold
+    server.verbose = verbose
+    return server
@@ -0,0 +1,149 @@
+# knn_kernel.py
+# date: 2026-10-19
+
+# Like src/numpy_predictor.py, this module only depends on NumPy.
+import numpy as np
+
+# at least this many query rows share a reference tile, so each tile read is reused
+MIN_TILE_ROWS = 256
+
+
+def squared_norms(X):
+    """
+    Compute the squared Euclidean norm of every row, in float64.
+
+    Parameters
+    ----------
+    X : numpy.ndarray
+        A 2D array.
+
+    Returns
+    -------
+    numpy.ndarray
+        The squared norm of each row.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    return np.einsum('ij,ij->i', X, X)
+
+
+def tile_shape(n_queries, n_reference, n_neighbors, tile_bytes=2 ** 24):
+    """
+    Choose the number of query rows and reference rows per distance tile.
+
+    The float64 distance tile and the int64 index array `numpy.argpartition`
+    returns for it (16 bytes per query/reference pair) are kept within about
+    'tile_bytes'. The whole reference set goes in one tile
+    when that still leaves room for `MIN_TILE_ROWS` query rows.
+
+    Parameters
+    ----------
+    n_queries, n_reference : int
+        The number of query and reference rows.
+
+    n_neighbors : int
+        The number of neighbours kept per query row.
+
+    tile_bytes : int, optional, default=2**24
+        The memory budget of one tile.
+
+    Returns
+    -------
+    tuple of int
+        The number of query rows and reference rows per tile.
+    """
+    elements = max(tile_bytes // 16, 1)
+    tile_cols = min(n_reference, max(1, elements // MIN_TILE_ROWS - n_neighbors))
+    tile_rows = min(n_queries, max(1, elements // (tile_cols + n_neighbors)))
+    return tile_rows, tile_cols
+
+
+def gemm_kneighbors(X, reference, n_neighbors, reference_norms=None, tile_bytes=2 ** 24):
+    """
+    Find the k nearest reference rows of every query row by tiled matrix products.
+
+    Squared Euclidean distances are computed as ||x||^2 + ||r||^2 - 2 x.r, so the
+    bulk of the work is one BLAS matrix product per tile and scales with the
+    BLAS threads. Query and reference rows are processed in tiles (see
+    `tile_shape`), so peak memory depends on 'tile_bytes' and not on the number of
+    rows. A running top-k per query row is merged with each reference tile using
+    `numpy.argpartition`.
+
+    Parameters
+    ----------
+    X : numpy.ndarray
+        The (n_queries, n_features) query rows.
+
+    reference : numpy.ndarray
+        The (n_reference, n_features) reference rows, e.g. a memory-mapped array.
+
+    n_neighbors : int
+        The number of neighbours to find.
+
+    reference_norms : numpy.ndarray, optional, default=None
+        The squared norms of the reference rows, as returned by `squared_norms`.
+        Computed if not given; pass them when calling repeatedly with the same reference.
+
+    tile_bytes : int, optional, default=2**24
+        The memory budget of one tile. Peak working memory is about 1.5 times
+        this, on top of the inputs and outputs.
+
+    Returns
+    -------
+    distances : numpy.ndarray
+        The (n_queries, n_neighbors) distances to the nearest reference rows, in increasing order.
+
+    indices : numpy.ndarray
+        The (n_queries, n_neighbors) row indices of the nearest reference rows.
+
+    Raises
+    ------
+    ValueError
+        If 'n_neighbors' is not between 1 and the number of reference rows, or the
+        query and reference rows have a different number of features.
+    """
+    n_queries, n_reference = X.shape[0], reference.shape[0]
+    if not 1 <= n_neighbors <= n_reference:
+        raise ValueError("n_neighbors must be between 1 and the number of reference rows.")
+    if X.shape[1] != reference.shape[1]:
+        raise ValueError("X and reference must have the same number of features.")
+    if reference_norms is None:
+        reference_norms = squared_norms(reference)
+
+    tile_rows, tile_cols = tile_shape(n_queries, n_reference, n_neighbors, tile_bytes)
+    distances = np.empty((n_queries, n_neighbors))
+    indices = np.empty((n_queries, n_neighbors), dtype=np.int64)
+    for row_start in range(0, n_queries, tile_rows):
+        # float32 data is upcast one tile at a time, as scikit-learn does
+        queries = np.asarray(X[row_start:row_start + tile_rows], dtype=np.float64)
+        query_norms = squared_norms(queries)[:, np.newaxis]
+        best_distances = np.empty((queries.shape[0], 0))
+        best_indices = np.empty((queries.shape[0], 0), dtype=np.int64)
+
+        for col_start in range(0, n_reference, tile_cols):
+            tile = np.asarray(reference[col_start:col_start + tile_cols], dtype=np.float64)
+            # ||x||^2 is the same for every reference row, so it is only added to the
+            # neighbours that are kept; the -2 is folded into the (small) reference tile
+            squared = queries @ (-2 * tile).T
+            squared += reference_norms[col_start:col_start + tile_cols]
+
+            # the tile's own top-k is merged into the running top-k
+            tile_indices = np.broadcast_to(np.arange(col_start, col_start + tile.shape[0]), squared.shape)
+            if squared.shape[1] > n_neighbors:
+                keep = np.argpartition(squared, n_neighbors - 1, axis=1)[:, :n_neighbors]
+                squared = np.take_along_axis(squared, keep, axis=1)
+                tile_indices = keep + col_start
+            candidates = np.hstack([best_distances, squared])
+            candidate_indices = np.hstack([best_indices, tile_indices])
+            if candidates.shape[1] > n_neighbors:
+                keep = np.argpartition(candidates, n_neighbors - 1, axis=1)[:, :n_neighbors]
+                candidates = np.take_along_axis(candidates, keep, axis=1)
+                candidate_indices = np.take_along_axis(candidate_indices, keep, axis=1)
+            best_distances, best_indices = candidates, candidate_indices
+
+        best_distances += query_norms
+        # rounding can make the distance of (near) duplicates slightly negative
+        np.maximum(best_distances, 0, out=best_distances)
+        order = np.lexsort((best_indices, best_distances), axis=-1)
+        distances[row_start:row_start + tile_rows] = np.sqrt(np.take_along_axis(best_distances, order, axis=1))
+        indices[row_start:row_start + tile_rows] = np.take_along_axis(best_indices, order, axis=1)
+    return distances, indices
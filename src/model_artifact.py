@@ -0,0 +1,348 @@
+# model_artifact.py
+# date: 2026-10-19
+
+import hashlib
+import json
+import os
+import pickle
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import FunctionTransformer, StandardScaler
+from src.numeric_precision import PRECISIONS, cast_to_precision
+# re-exported: scoring code imports it from here
+from src.numpy_predictor import labels_from_probabilities
+
+ARTIFACT_FORMAT_VERSION = 1
+METADATA_FILE = 'metadata.json'
+ARRAY_FILES = {
+    'scaler_mean': 'scaler_mean.npy',
+    'scaler_scale': 'scaler_scale.npy',
+    'reference_X': 'reference_X.npy',
+    'reference_y': 'reference_y.npy'
+}
+
+
+def _flatten_steps(estimator):
+    # yield the leaf transformers of (possibly nested) pipelines in order
+    if isinstance(estimator, Pipeline):
+        for _, step in estimator.steps:
+            yield from _flatten_steps(step)
+    else:
+        yield estimator
+
+
+def _unpack_pipeline(pipeline):
+    # pull the scaler, k-nn classifier and precision out of a fitted pipeline
+    knn = pipeline[-1]
+    if not isinstance(knn, KNeighborsClassifier):
+        raise ValueError("The last step of the pipeline must be a fitted KNeighborsClassifier.")
+
+    scaler = None
+    precision = 'float64'
+    for step in _flatten_steps(pipeline[:-1]):
+        if isinstance(step, FunctionTransformer) and step.func is cast_to_precision:
+            precision = (step.kw_args or {}).get('precision', 'float64')
+        elif isinstance(step, ColumnTransformer):
+            for _, transformer, _ in step.transformers_:
+                if isinstance(transformer, StandardScaler):
+                    scaler = transformer
+        elif isinstance(step, StandardScaler):
+            scaler = step
+        elif not (isinstance(step, FunctionTransformer) and step.func is select_features):
+            raise ValueError(f"Unsupported preprocessing step: {type(step).__name__}.")
+    if scaler is None:
+        raise ValueError("The pipeline does not contain a fitted StandardScaler.")
+
+    scaler_features = list(getattr(scaler, 'feature_names_in_', range(scaler.n_features_in_)))
+    feature_names = list(getattr(knn, 'feature_names_in_', scaler_features))
+    if not set(feature_names) <= set(scaler_features):
+        raise ValueError("Every feature used by the classifier must be scaled by the StandardScaler.")
+    order = [scaler_features.index(feature) for feature in feature_names]
+
+    return knn, scaler, order, [str(feature) for feature in feature_names], precision
+
+
+def _artifact_version(header, arrays):
+    # the version identifies the exact model, so caches can be keyed on it
+    header = {key: value for key, value in header.items() if key != 'version'}
+    digest = hashlib.sha256(json.dumps(header, sort_keys=True).encode())
+    for name in sorted(arrays):
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def select_features(dataframe, columns=None, precision='float64'):
+    """
+    Select the model's feature columns (in training order) and cast them to the model's precision.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame or numpy.ndarray
+        The data to be scored. Extra columns (e.g. 'class') are ignored. Arrays are
+        assumed to already hold the feature columns in training order.
+
+    columns : list of str, optional, default=None
+        The feature columns used by the model.
+
+    precision : {'float32', 'float64'}, optional, default='float64'
+        The floating point precision of the model.
+
+    Returns
+    -------
+    pandas.DataFrame or numpy.ndarray
+        The selected features with the requested precision.
+    """
+    if isinstance(dataframe, np.ndarray):
+        return dataframe.astype(PRECISIONS[precision], copy=False)
+    if columns is not None:
+        dataframe = dataframe[columns]
+    return cast_to_precision(dataframe, precision)
+
+
+def save_model_artifact(pipeline, directory, metadata=None):
+    """
+    Save a fitted scaler + k-nn pipeline as a memory-mappable model artifact.
+
+    Only what is needed to predict is stored: the scaler parameters, the k-nn reference
+    matrix and labels as uncompressed `.npy` blocks, and a small JSON metadata header
+    describing the features, classes and hyperparameters. If a fitted `GridSearchCV`
+    object is given, only its best estimator is stored and its best parameters and
+    score are added to the metadata.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline or sklearn.model_selection.GridSearchCV
+        A fitted pipeline whose preprocessing contains a `StandardScaler` (optionally
+        inside a `ColumnTransformer`) and whose last step is a `KNeighborsClassifier`.
+
+    directory : str
+        The directory the artifact will be written to. It is created if it does not exist.
+
+    metadata : dict, optional, default=None
+        Extra JSON serialisable fields to store in the metadata header.
+
+    Returns
+    -------
+    dict
+        The metadata header that was written.
+
+    Raises
+    ------
+    ValueError
+        If the pipeline is not made of supported steps.
+
+    NotADirectoryError
+        If 'directory' is an existing file path.
+    """
+    if os.path.exists(directory) and not os.path.isdir(directory):
+        raise NotADirectoryError('The directory path provided is not a directory, it is an existing file path. Please provide a path to a new, or existing directory.')
+
+    header = {}
+    if hasattr(pipeline, 'best_estimator_'):
+        header['best_params'] = {key: value.item() if isinstance(value, np.generic) else value
+                                 for key, value in pipeline.best_params_.items()}
+        header['best_score'] = float(pipeline.best_score_)
+        pipeline = pipeline.best_estimator_
+
+    knn, scaler, order, feature_names, precision = _unpack_pipeline(pipeline)
+    dtype = PRECISIONS[precision]
+    arrays = {
+        'scaler_mean': np.asarray(scaler.mean_, dtype=np.float64)[order],
+        'scaler_scale': np.asarray(scaler.scale_, dtype=np.float64)[order],
+        'reference_X': np.ascontiguousarray(knn._fit_X, dtype=dtype),
+        'reference_y': np.ascontiguousarray(knn._y, dtype=np.int64)
+    }
+
+    header.update({
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'feature_names': feature_names,
+        'classes': [str(label) for label in knn.classes_],
+        'n_neighbors': int(knn.n_neighbors),
+        'weights': knn.weights,
+        'metric': knn.effective_metric_,
+        'metric_params': knn.effective_metric_params_,
+        'precision': precision,
+        'n_samples_seen': int(np.max(scaler.n_samples_seen_)),
+        'arrays': {name: {'file': ARRAY_FILES[name], 'dtype': str(array.dtype), 'shape': list(array.shape)}
+                   for name, array in arrays.items()}
+    })
+    header.update(metadata or {})
+
+    header['version'] = _artifact_version(header, arrays)
+
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, ARRAY_FILES[name]), array, allow_pickle=False)
+    with open(os.path.join(directory, METADATA_FILE), 'w') as f:
+        json.dump(header, f, indent=2)
+
+    return header
+
+
+def read_model_metadata(directory):
+    """
+    Read the metadata header of a model artifact.
+
+    Parameters
+    ----------
+    directory : str
+        The model artifact directory.
+
+    Returns
+    -------
+    dict
+        The metadata header.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the directory does not contain a model artifact.
+    """
+    path = os.path.join(directory, METADATA_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError('The model artifact does not exist.')
+    with open(path) as f:
+        return json.load(f)
+
+
+def update_model_metadata(directory, metadata):
+    """
+    Add or replace fields in the metadata header of a model artifact.
+
+    The artifact's version is recomputed, since fields such as a decision threshold
+    change the model's predictions.
+
+    Parameters
+    ----------
+    directory : str
+        The model artifact directory.
+
+    metadata : dict
+        JSON serialisable fields to add to the metadata header.
+
+    Returns
+    -------
+    dict
+        The updated metadata header.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the directory does not contain a model artifact.
+
+    ValueError
+        If 'metadata' tries to replace the fields describing the stored arrays.
+    """
+    protected = {'format_version', 'arrays', 'feature_names', 'classes', 'version'}
+    if protected & set(metadata):
+        raise ValueError(f"These metadata fields cannot be updated: {sorted(protected & set(metadata))}.")
+
+    header = read_model_metadata(directory)
+    header.update(metadata)
+    arrays = {name: np.load(os.path.join(directory, spec['file']), mmap_mode='r', allow_pickle=False)
+              for name, spec in header['arrays'].items()}
+    header['version'] = _artifact_version(header, arrays)
+
+    with open(os.path.join(directory, METADATA_FILE), 'w') as f:
+        json.dump(header, f, indent=2)
+    return header
+
+
+def load_model_artifact(directory, mmap_mode='r'):
+    """
+    Load a model artifact as a fitted scikit-learn pipeline.
+
+    The `.npy` blocks are opened with `mmap_mode`, so several scoring processes on
+    the same machine share one page-cached copy of the reference matrix instead of
+    each holding a private copy.
+
+    Parameters
+    ----------
+    directory : str
+        The model artifact directory written by `save_model_artifact`.
+
+    mmap_mode : {None, 'r', 'c'}, optional, default='r'
+        The memory-map mode passed to `numpy.load`. None reads the arrays into memory.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline
+        A fitted pipeline with `predict` and `predict_proba`. Its metadata header is
+        available as the `artifact_metadata_` attribute.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the directory does not contain a model artifact.
+
+    ValueError
+        If the artifact was written with an unsupported format version.
+    """
+    metadata = read_model_metadata(directory)
+    if metadata['format_version'] != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model artifact format version: {metadata['format_version']}.")
+    arrays = {name: np.load(os.path.join(directory, spec['file']), mmap_mode=mmap_mode, allow_pickle=False)
+              for name, spec in metadata['arrays'].items()}
+
+    feature_names = metadata['feature_names']
+    scaler = StandardScaler()
+    scaler.mean_ = np.asarray(arrays['scaler_mean'])
+    scaler.scale_ = np.asarray(arrays['scaler_scale'])
+    scaler.var_ = scaler.scale_ ** 2
+    scaler.n_features_in_ = len(feature_names)
+    scaler.feature_names_in_ = np.asarray(feature_names, dtype=object)
+    scaler.n_samples_seen_ = metadata['n_samples_seen']
+    # keep the scaled matrix as a plain array, the reference matrix has no column names
+    scaler.set_output(transform='default')
+
+    knn = KNeighborsClassifier(
+        n_neighbors=metadata['n_neighbors'],
+        weights=metadata['weights'],
+        algorithm='brute',
+        metric=metadata['metric'],
+        metric_params=metadata['metric_params'] or None
+    )
+    classes = np.asarray(metadata['classes'], dtype=object)
+    knn.fit(arrays['reference_X'], classes[arrays['reference_y']])
+
+    pipeline = make_pipeline(
+        FunctionTransformer(select_features,
+                            kw_args={'columns': feature_names, 'precision': metadata['precision']}),
+        scaler,
+        knn
+    )
+    pipeline.artifact_metadata_ = metadata
+    return pipeline
+
+
+def load_pipeline(path, mmap_mode='r'):
+    """
+    Load a fitted model from a model artifact directory or a pickle file.
+
+    Parameters
+    ----------
+    path : str
+        A model artifact directory, or a pickled pipeline / `GridSearchCV` object.
+
+    mmap_mode : {None, 'r', 'c'}, optional, default='r'
+        The memory-map mode used for model artifacts.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline
+        The fitted pipeline (the best estimator for pickled `GridSearchCV` objects).
+
+    Raises
+    ------
+    FileNotFoundError
+        If 'path' does not exist.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError('The model path provided does not exist.')
+    if os.path.isdir(path):
+        return load_model_artifact(path, mmap_mode=mmap_mode)
+    with open(path, 'rb') as f:
+        model = pickle.load(f)
+    return getattr(model, 'best_estimator_', model)
@@ -0,0 +1,274 @@
+# numpy_predictor.py
+# date: 2026-10-19
+
+# Only NumPy and the standard library are imported here, so a scoring process
+# that uses this module does not pay for importing pandas or scikit-learn.
+import json
+import os
+import numpy as np
+from src.knn_kernel import gemm_kneighbors, squared_norms
+
+METADATA_FILE = 'metadata.json'
+SUPPORTED_METRICS = ['euclidean', 'minkowski', 'l2']
+ALGORITHMS = ['exact', 'gemm']
+
+
+def labels_from_probabilities(probabilities, classes, decision_threshold=None):
+    """
+    Turn predicted class probabilities into class labels.
+
+    Without a decision threshold the most probable class is predicted (ties go to the
+    first class, like `KNeighborsClassifier.predict`). With a threshold, e.g. the one
+    saved by the threshold analysis stage, the positive class is predicted whenever
+    its probability is at least the threshold.
+
+    Parameters
+    ----------
+    probabilities : numpy.ndarray
+        A (n_rows, n_classes) array of predicted probabilities.
+
+    classes : list of str
+        The class labels, in the order of the columns of 'probabilities'.
+
+    decision_threshold : dict, optional, default=None
+        A dictionary with the 'pos_label' and 'threshold' keys, as stored in the
+        'decision_threshold' field of a model artifact's metadata.
+
+    Returns
+    -------
+    numpy.ndarray
+        The predicted class label of each row.
+
+    Raises
+    ------
+    ValueError
+        If a threshold is given for a model that does not have exactly two classes.
+    """
+    classes = np.asarray(classes, dtype=object)
+    probabilities = np.asarray(probabilities)
+    if decision_threshold is None:
+        return classes[probabilities.argmax(axis=1)]
+
+    if classes.shape[0] != 2:
+        raise ValueError("A decision threshold can only be applied to a binary classifier.")
+    pos = list(classes).index(decision_threshold['pos_label'])
+    return np.where(probabilities[:, pos] >= decision_threshold['threshold'], classes[pos], classes[1 - pos])
+
+
+class NumpyKNNPredictor:
+    """
+    Predict with a model artifact using NumPy only.
+
+    Reproduces the predictions of the scikit-learn pipeline stored by
+    `src.model_artifact.save_model_artifact`: the features are selected and cast
+    to the model's precision, standardised with the stored scaler parameters, and
+    classified by a (uniform or distance weighted) vote of the k nearest
+    reference rows in Euclidean distance.
+
+    Parameters
+    ----------
+    metadata : dict
+        The artifact's metadata header.
+
+    arrays : dict of numpy.ndarray
+        The artifact's 'scaler_mean', 'scaler_scale', 'reference_X' and 'reference_y' arrays.
+
+    block_bytes : int, optional, default=2**26
+        The memory budget of the distance computation: query rows are processed
+        in blocks whose intermediate arrays stay within about this many bytes.
+
+    algorithm : {'exact', 'gemm'}, optional, default='exact'
+        How distances are computed: 'exact' sums squared differences, 'gemm' uses
+        tiled matrix products (see `src.knn_kernel.gemm_kneighbors`), which is much
+        faster for large batches.
+    """
+
+    def __init__(self, metadata, arrays, block_bytes=2 ** 26, algorithm='exact'):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {ALGORITHMS}.")
+        metric_params = metadata.get('metric_params') or {}
+        if metadata['metric'] not in SUPPORTED_METRICS or metric_params.get('p', 2) != 2:
+            raise ValueError(f"Unsupported metric for the NumPy predictor: {metadata['metric']}.")
+        if metadata['weights'] not in ['uniform', 'distance']:
+            raise ValueError(f"Unsupported weights for the NumPy predictor: {metadata['weights']}.")
+        self.artifact_metadata_ = metadata
+        self.feature_names_in_ = list(metadata['feature_names'])
+        self.classes_ = np.asarray(metadata['classes'], dtype=object)
+        self.n_neighbors = metadata['n_neighbors']
+        self.weights = metadata['weights']
+        self.dtype = np.dtype(metadata['precision'])
+        self.mean_ = arrays['scaler_mean']
+        self.scale_ = arrays['scaler_scale']
+        self.reference_X = arrays['reference_X']
+        self.reference_y = arrays['reference_y']
+        self.block_bytes = block_bytes
+        self.algorithm = algorithm
+        # the reference norms are computed once, not once per batch
+        self.reference_norms_ = squared_norms(self.reference_X) if algorithm == 'gemm' else None
+
+    @classmethod
+    def from_artifact(cls, directory, mmap_mode='r', block_bytes=2 ** 26, algorithm='exact'):
+        """
+        Load a model artifact directory written by `save_model_artifact`.
+
+        Parameters
+        ----------
+        directory : str
+            The model artifact directory.
+
+        mmap_mode : {None, 'r', 'c'}, optional, default='r'
+            The memory-map mode passed to `numpy.load`. None reads the arrays into memory.
+
+        block_bytes : int, optional, default=2**26
+            See `NumpyKNNPredictor`.
+
+        algorithm : {'exact', 'gemm'}, optional, default='exact'
+            See `NumpyKNNPredictor`.
+
+        Returns
+        -------
+        NumpyKNNPredictor
+            The predictor.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the directory does not contain a model artifact.
+        """
+        path = os.path.join(directory, METADATA_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError('The model artifact does not exist.')
+        with open(path) as f:
+            metadata = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, spec['file']), mmap_mode=mmap_mode, allow_pickle=False)
+                  for name, spec in metadata['arrays'].items()}
+        return cls(metadata, arrays, block_bytes, algorithm)
+
+    def transform(self, X):
+        """
+        Select, cast and standardise the features.
+
+        Parameters
+        ----------
+        X : array-like or pandas.DataFrame
+            The rows to score. Data frames (anything with a 'columns' attribute) are
+            indexed by the model's feature names; arrays must already hold the
+            feature columns in training order.
+
+        Returns
+        -------
+        numpy.ndarray
+            The standardised features.
+        """
+        if hasattr(X, 'columns'):
+            X = X[self.feature_names_in_].to_numpy()
+        X = np.array(X, dtype=self.dtype, ndmin=2)
+        if X.shape[1] != len(self.feature_names_in_):
+            raise ValueError(f"X must have {len(self.feature_names_in_)} feature columns.")
+        # in place, like StandardScaler.transform, so the result keeps the model's precision
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+    def kneighbors(self, X):
+        """
+        Find the nearest reference rows of already standardised rows.
+
+        With the 'exact' algorithm, distances are sums of squared differences,
+        computed one block of query rows at a time so the intermediate arrays stay
+        within 'block_bytes'. With 'gemm', they come from `gemm_kneighbors` with
+        'block_bytes' as the tile budget.
+
+        Parameters
+        ----------
+        X : numpy.ndarray
+            Standardised rows, as returned by `transform`.
+
+        Returns
+        -------
+        distances : numpy.ndarray
+            The (n_rows, n_neighbors) distances to the nearest reference rows, in increasing order.
+
+        indices : numpy.ndarray
+            The (n_rows, n_neighbors) row indices of the nearest reference rows.
+        """
+        if self.algorithm == 'gemm':
+            return gemm_kneighbors(X, self.reference_X, self.n_neighbors,
+                                   reference_norms=self.reference_norms_, tile_bytes=self.block_bytes)
+
+        n_reference, n_features = self.reference_X.shape
+        block_rows = max(1, self.block_bytes // (n_reference * n_features * 8))
+        distances = np.empty((X.shape[0], self.n_neighbors))
+        indices = np.empty((X.shape[0], self.n_neighbors), dtype=np.int64)
+        for start in range(0, X.shape[0], block_rows):
+            block = X[start:start + block_rows]
+            squared = ((block[:, np.newaxis, :] - self.reference_X[np.newaxis, :, :]) ** 2).sum(axis=2)
+            # a stable sort breaks distance ties by reference row order
+            nearest = np.argsort(squared, axis=1, kind='stable')[:, :self.n_neighbors]
+            indices[start:start + block_rows] = nearest
+            distances[start:start + block_rows] = np.sqrt(np.take_along_axis(squared, nearest, axis=1))
+        return distances, indices
+
+    def predict_proba(self, X):
+        """
+        Predict the class probabilities of every row.
+
+        Parameters
+        ----------
+        X : array-like or pandas.DataFrame
+            The rows to score; see `transform`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The (n_rows, n_classes) class probabilities, in the order of 'classes_'.
+        """
+        return self.predict_proba_transformed(self.transform(X))
+
+    def predict_proba_transformed(self, X):
+        """
+        Predict the class probabilities of already standardised rows.
+
+        Parameters
+        ----------
+        X : numpy.ndarray
+            Standardised rows, as returned by `transform`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The (n_rows, n_classes) class probabilities, in the order of 'classes_'.
+        """
+        distances, indices = self.kneighbors(X)
+        if self.weights == 'uniform':
+            weights = np.ones_like(distances)
+        else:
+            # like scikit-learn, exact matches get all the weight
+            with np.errstate(divide='ignore'):
+                weights = 1 / distances
+            exact = np.isinf(weights).any(axis=1)
+            weights[exact] = np.isinf(weights[exact]).astype(np.float64)
+
+        labels = np.asarray(self.reference_y)[indices]
+        probabilities = np.zeros((labels.shape[0], self.classes_.shape[0]))
+        for code in range(self.classes_.shape[0]):
+            probabilities[:, code] = np.where(labels == code, weights, 0).sum(axis=1)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        """
+        Predict the class of every row, like `KNeighborsClassifier.predict`.
+
+        Parameters
+        ----------
+        X : array-like or pandas.DataFrame
+            The rows to score; see `transform`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The predicted class labels; ties go to the first class. The
+            artifact's 'decision_threshold', if saved, is applied, as by `predict_chunk`.
+        """
+        return labels_from_probabilities(self.predict_proba(X), self.classes_,
+                                         self.artifact_metadata_.get('decision_threshold'))
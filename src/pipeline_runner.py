@@ -0,0 +1,469 @@
+# pipeline_runner.py
+# date: 2026-10-19
+
+# Only the standard library (and click) is imported here: the runner itself starts
+# fast, and the scientific stack is imported once per worker process by the stages.
+import ast
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from src.cli import load_command
+from src.datasets import DATASETS, get_dataset
+
+DATA_URL = "https://archive.ics.uci.edu/static/public/15/breast+cancer+wisconsin+original.zip"
+
+
+class Stage:
+    """
+    A step of the analysis: a click script run with fixed options.
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage.
+
+    script : str
+        The path to the click script, e.g. 'scripts/eda.py'.
+
+    options : dict, optional, default=None
+        Maps each option name (without the leading '--') to its value.
+
+    inputs : list of str, optional, default=None
+        The files or directories the stage reads. A stage runs after the stages
+        that write its inputs.
+
+    outputs : list of str, optional, default=None
+        The files or directories the stage writes.
+    """
+
+    def __init__(self, name, script, options=None, inputs=None, outputs=None):
+        self.name = name
+        self.script = script
+        self.options = dict(options or {})
+        self.inputs = list(inputs or [])
+        self.outputs = list(outputs or [])
+
+    def arguments(self):
+        """Return the command line arguments of the script."""
+        return [f"--{option}={value}" for option, value in self.options.items()]
+
+
+def download_stage():
+    """Return the stage downloading the archive, with the raw files of every data set."""
+    return Stage('download', 'scripts/download_data.py',
+                 {'url': DATA_URL, 'write-to': 'data/raw'},
+                 outputs=[f"data/raw/{file}" for dataset in DATASETS.values()
+                          for file in (dataset.data_file, dataset.name_file)])
+
+
+def analysis_stages():
+    """
+    Return the stages of the breast cancer analysis, as run by the Makefile.
+
+    Returns
+    -------
+    list of Stage
+        Download, preparation (clean/validate, split and preprocess), EDA, fit,
+        tuning curve, evaluation and threshold analysis.
+    """
+    return [
+        download_stage(),
+        Stage('prepare', 'scripts/prepare_data.py',
+              {'raw-data': 'data/raw/wdbc.data', 'name-file': 'data/raw/wdbc.names',
+               'data-config-file': 'data/processed/data_config.csv', 'data-to': 'data/processed',
+               'preprocessor-to': 'results/models', 'seed': 522},
+              inputs=['data/raw/wdbc.data', 'data/raw/wdbc.names', 'data/processed/data_config.csv'],
+              outputs=['results/models/cancer_preprocessor.pickle', 'data/processed/cancer_train.csv',
+                       'data/processed/cancer_test.csv', 'data/processed/scaled_cancer_train.csv']),
+        Stage('eda', 'scripts/eda.py',
+              {'processed-training-data': 'data/processed/scaled_cancer_train.csv',
+               'plot-to': 'results/figures'},
+              inputs=['data/processed/scaled_cancer_train.csv'],
+              outputs=['results/figures/feature_densities_by_class.png']),
+        Stage('fit', 'scripts/fit_breast_cancer_classifier.py',
+              {'training-data': 'data/processed/cancer_train.csv',
+               'preprocessor': 'results/models/cancer_preprocessor.pickle',
+               'columns-to-drop': 'data/processed/columns_to_drop.csv', 'pipeline-to': 'results/models',
+               'cv-results-to': 'results/tables', 'seed': 523,
+               'data-config-file': 'data/processed/data_config.csv'},
+              inputs=['data/processed/cancer_train.csv', 'results/models/cancer_preprocessor.pickle',
+                      'data/processed/columns_to_drop.csv', 'data/processed/data_config.csv'],
+              outputs=['results/models/cancer_pipeline', 'results/tables/cv_results.npz']),
+        Stage('tuning_curve', 'scripts/plot_tuning_curve.py',
+              {'cv-results': 'results/tables/cv_results.npz', 'plot-to': 'results/figures'},
+              inputs=['results/tables/cv_results.npz'],
+              outputs=['results/figures/cancer_choose_k.png']),
+        Stage('evaluate', 'scripts/evaluate_breast_cancer_predictor.py',
+              {'scaled-test-data': 'data/processed/cancer_test.csv',
+               'pipeline-from': 'results/models/cancer_pipeline', 'results-to': 'results/tables',
+               'bootstrap-replicates': 10000, 'seed': 524},
+              inputs=['data/processed/cancer_test.csv', 'results/models/cancer_pipeline'],
+              outputs=['results/tables/test_scores.csv', 'results/tables/confusion_matrix.csv',
+                       'results/tables/class_scores.csv', 'results/tables/test_scores_bootstrap.csv']),
+        Stage('threshold_analysis', 'scripts/threshold_analysis.py',
+              {'scaled-test-data': 'data/processed/cancer_test.csv',
+               'pipeline-from': 'results/models/cancer_pipeline', 'results-to': 'results/tables'},
+              inputs=['data/processed/cancer_test.csv', 'results/models/cancer_pipeline'],
+              outputs=['results/tables/threshold_scores.csv'])
+    ]
+
+
+def dataset_stages(datasets):
+    """
+    Return the stages processing each given data set of the archive into its own outputs.
+
+    Parameters
+    ----------
+    datasets : list of str
+        The names of the data sets, keys of `DATASETS`.
+
+    Returns
+    -------
+    list of Stage
+        The download stage, then for each data set its clean/validate/split
+        ('<name>:prepare'), fit ('<name>:fit') and evaluation ('<name>:evaluate')
+        stages, writing to data/processed/<name> and results/<name>. The data
+        sets do not depend on each other, so `run_pipeline` runs them concurrently.
+
+    Raises
+    ------
+    ValueError
+        If a data set is not in `DATASETS`.
+    """
+    stages = [download_stage()]
+    for name in datasets:
+        dataset = get_dataset(name)
+        raw_data, name_file = f"data/raw/{dataset.data_file}", f"data/raw/{dataset.name_file}"
+        data_dir, models_dir, tables_dir = f"data/processed/{name}", f"results/{name}/models", f"results/{name}/tables"
+        fit_options = {'training-data': f"{data_dir}/cancer_train.csv",
+                       'preprocessor': f"{models_dir}/cancer_preprocessor.pickle",
+                       'pipeline-to': models_dir, 'cv-results-to': tables_dir,
+                       'pos-label': dataset.positive_label, 'seed': 523,
+                       'data-config-file': dataset.data_config_file}
+        if dataset.columns_to_drop_file:
+            fit_options['columns-to-drop'] = dataset.columns_to_drop_file
+        stages += [
+            Stage(f"{name}:prepare", 'scripts/prepare_data.py',
+                  {'raw-data': raw_data, 'name-file': name_file, 'data-config-file': dataset.data_config_file,
+                   'dataset': name, 'data-to': data_dir, 'preprocessor-to': models_dir, 'seed': 522},
+                  inputs=[raw_data, name_file, dataset.data_config_file],
+                  outputs=[f"{models_dir}/cancer_preprocessor.pickle", f"{data_dir}/cancer_train.csv",
+                           f"{data_dir}/cancer_test.csv", f"{data_dir}/scaled_cancer_train.csv"]),
+            Stage(f"{name}:fit", 'scripts/fit_breast_cancer_classifier.py', fit_options,
+                  inputs=[f"{data_dir}/cancer_train.csv", f"{models_dir}/cancer_preprocessor.pickle",
+                          dataset.data_config_file]
+                         + ([dataset.columns_to_drop_file] if dataset.columns_to_drop_file else []),
+                  outputs=[f"{models_dir}/cancer_pipeline", f"{tables_dir}/cv_results.npz"]),
+            Stage(f"{name}:evaluate", 'scripts/evaluate_breast_cancer_predictor.py',
+                  {'scaled-test-data': f"{data_dir}/cancer_test.csv", 'pipeline-from': f"{models_dir}/cancer_pipeline",
+                   'results-to': tables_dir, 'pos-label': dataset.positive_label,
+                   'bootstrap-replicates': 10000, 'seed': 524},
+                  inputs=[f"{data_dir}/cancer_test.csv", f"{models_dir}/cancer_pipeline"],
+                  outputs=[f"{tables_dir}/test_scores.csv", f"{tables_dir}/confusion_matrix.csv",
+                           f"{tables_dir}/class_scores.csv", f"{tables_dir}/test_scores_bootstrap.csv"])
+        ]
+    return stages
+
+
+def hash_path(path):
+    """
+    Compute the SHA-256 digest of a file, or of every file in a directory.
+
+    Parameters
+    ----------
+    path : str
+        The file or directory.
+
+    Returns
+    -------
+    str
+        A hexadecimal digest. For a directory, it covers the relative path and
+        contents of every file below it.
+
+    Raises
+    ------
+    FileNotFoundError
+        If 'path' does not exist.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"'{path}' does not exist.")
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for file in sorted(files):
+                file_path = os.path.join(directory, file)
+                digest.update(os.path.relpath(file_path, path).encode())
+                digest.update(hash_path(file_path).encode())
+        return digest.hexdigest()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(2 ** 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_dependencies(script):
+    """
+    Find the source files a script depends on.
+
+    Follows the `src` imports of the script, and of those modules, recursively.
+
+    Parameters
+    ----------
+    script : str
+        The path to a script in a directory next to `src`.
+
+    Returns
+    -------
+    list of str
+        The script and the `src` modules it imports, directly or not, in sorted order.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(script)))
+    found = set()
+    to_visit = [os.path.abspath(script)]
+    while to_visit:
+        path = to_visit.pop()
+        if path in found:
+            continue
+        found.add(path)
+        with open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                modules = [node.module]
+            elif isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            else:
+                continue
+            for module in modules:
+                if module.split('.')[0] == 'src':
+                    module_path = os.path.join(root, *module.split('.')) + '.py'
+                    if os.path.exists(module_path):
+                        to_visit.append(module_path)
+    return sorted(os.path.relpath(path, root) for path in found)
+
+
+def stage_key(stage):
+    """
+    Compute the content hash that decides whether a stage has to run again.
+
+    Parameters
+    ----------
+    stage : Stage
+        The stage; its inputs must exist.
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 digest of the stage's options, the contents of its
+        inputs and the source code of its script and the `src` modules it uses.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(stage.script)))
+    key = {
+        'script': stage.script,
+        'options': stage.options,
+        'inputs': {path: hash_path(path) for path in stage.inputs},
+        'code': {path: hash_path(os.path.join(root, path)) for path in code_dependencies(stage.script)}
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def stage_dependencies(stages):
+    """
+    Find the stages each stage depends on, i.e. the ones writing its inputs.
+
+    Parameters
+    ----------
+    stages : list of Stage
+        The stages.
+
+    Returns
+    -------
+    dict
+        Maps each stage name to the set of names of the stages it depends on.
+
+    Raises
+    ------
+    ValueError
+        If two stages have the same name or write the same output, or the
+        dependencies are circular.
+    """
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Stage names must be unique.")
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers:
+                raise ValueError(f"'{output}' is written by more than one stage.")
+            producers[output] = stage.name
+    dependencies = {stage.name: {producers[path] for path in stage.inputs if path in producers}
+                    for stage in stages}
+
+    # every stage must be reachable in topological order
+    done = set()
+    while len(done) < len(stages):
+        ready = [name for name in names if name not in done and dependencies[name] <= done]
+        if not ready:
+            raise ValueError("The stages have circular dependencies.")
+        done.update(ready)
+    return dependencies
+
+
+def run_stage(script, arguments):
+    """
+    Run a click script's `main` command in this process.
+
+    Parameters
+    ----------
+    script : str
+        The path to the script.
+
+    arguments : list of str
+        The command line arguments.
+    """
+    load_command(script).main(args=arguments, standalone_mode=False)
+
+
+def _read_state(state_file):
+    if not os.path.exists(state_file):
+        return {}
+    with open(state_file) as f:
+        return json.load(f)
+
+
+def _write_state(state, state_file):
+    # written to a temporary file first, so an interrupted run cannot corrupt it
+    os.makedirs(os.path.dirname(os.path.abspath(state_file)), exist_ok=True)
+    with open(state_file + '.tmp', 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(state_file + '.tmp', state_file)
+
+
+def _is_up_to_date(stage, key, recorded):
+    if recorded is None or recorded['key'] != key:
+        return False
+    return all(os.path.exists(path) and hash_path(path) == recorded['outputs'].get(path)
+               for path in stage.outputs)
+
+
+def run_pipeline(stages, state_file, n_jobs=1, targets=None, force=False, extra_arguments=None, echo=print):
+    """
+    Run the stages that are out of date, in dependency order.
+
+    A stage is skipped when its key (see `stage_key`) is the one recorded in
+    'state_file' after its last successful run, and its outputs still have the
+    recorded contents. Stages are keyed on contents, not modification times, so
+    e.g. a rewritten but identical file does not trigger downstream stages.
+    Independent stages (e.g. EDA and fit) run concurrently in a pool of 'n_jobs'
+    worker processes; each worker imports the scientific stack once, not once per stage.
+
+    Parameters
+    ----------
+    stages : list of Stage
+        The stages, e.g. as returned by `analysis_stages`.
+
+    state_file : str
+        The JSON file recording the key and output hashes of each stage.
+
+    n_jobs : int, optional, default=1
+        The number of worker processes; 1 runs the stages in this process.
+
+    targets : list of str, optional, default=None
+        The names of the stages to bring up to date, with the stages they depend
+        on. All stages by default.
+
+    force : bool, optional, default=False
+        Whether to run the targets (but not the stages they depend on) even if
+        they are up to date.
+
+    extra_arguments : list of str, optional, default=None
+        Arguments added to the command line of every stage that runs, e.g.
+        `profile_arguments()`. They are not part of the stage keys.
+
+    echo : callable, optional, default=print
+        Called with a progress message for each stage.
+
+    Returns
+    -------
+    dict
+        Maps each selected stage name to 'ran' or 'skipped'.
+
+    Raises
+    ------
+    ValueError
+        If 'n_jobs' is not positive, a target is not a stage, or the stages are
+        not a valid DAG (see `stage_dependencies`).
+
+    FileNotFoundError
+        If an input of a stage neither exists nor is written by another stage,
+        or a stage does not write one of its outputs.
+    """
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be a positive integer.")
+    dependencies = stage_dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+
+    selected = set(targets if targets is not None else by_name)
+    forced = set(selected) if force else set()
+    unknown = selected - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}.")
+    to_visit = list(selected)
+    while to_visit:
+        for dependency in dependencies[to_visit.pop()] - selected:
+            selected.add(dependency)
+            to_visit.append(dependency)
+
+    extra_arguments = list(extra_arguments or [])
+    state = _read_state(state_file)
+    statuses = {}
+    pending = [stage for stage in stages if stage.name in selected]
+    running = {}
+
+    def finish(stage, key):
+        for path in stage.outputs:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Stage '{stage.name}' did not write '{path}'.")
+        state[stage.name] = {'key': key, 'outputs': {path: hash_path(path) for path in stage.outputs}}
+        _write_state(state, state_file)
+        statuses[stage.name] = 'ran'
+
+    # scikit-learn's and vl-convert's threads make forking unsafe, so workers are spawned
+    executor = (ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn'))
+                if n_jobs > 1 else None)
+    try:
+        while pending or running:
+            ready = [stage for stage in pending if dependencies[stage.name] <= set(statuses)]
+            for stage in ready:
+                pending.remove(stage)
+                for path in stage.inputs:
+                    if not os.path.exists(path):
+                        raise FileNotFoundError(f"The input '{path}' of stage '{stage.name}' does not exist.")
+                key = stage_key(stage)
+                if stage.name not in forced and _is_up_to_date(stage, key, state.get(stage.name)):
+                    statuses[stage.name] = 'skipped'
+                    echo(f"{stage.name}: up to date")
+                    continue
+                for path in stage.outputs:
+                    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                echo(f"{stage.name}: running")
+                if executor is None:
+                    run_stage(stage.script, stage.arguments() + extra_arguments)
+                    finish(stage, key)
+                else:
+                    running[executor.submit(run_stage, stage.script, stage.arguments() + extra_arguments)] = (stage, key)
+            if ready:
+                # skipped or finished stages may have unblocked others
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, key = running.pop(future)
+                future.result()
+                finish(stage, key)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+    return statuses
@@ -0,0 +1,376 @@
+# pipelined_ingest.py
+# date: 2026-10-19
+
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+import pandas as pd
+import requests
+from src.clean_data import write_data
+from src.datasets import DATASETS, get_dataset
+from src.prepare_data import clean_and_validate
+
+LOCAL_FILE_HEADER = b'PK\x03\x04'
+DATA_DESCRIPTOR = b'PK\x07\x08'
+
+# marks the end of a stage's output in the queue to the next stage
+_DONE = object()
+
+
+class _ByteStream:
+    """Read bytes from an iterator of byte chunks, e.g. a download in progress."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def _fill(self, size):
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return
+            self._buffer += chunk
+
+    def read(self, size):
+        """Return the next 'size' bytes, or fewer at the end of the stream."""
+        self._fill(size)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def read_exact(self, size):
+        data = self.read(size)
+        if len(data) < size:
+            raise ValueError('The ZIP file is truncated.')
+        return data
+
+    def read_some(self):
+        """Return the buffered bytes, or the next chunk if none are buffered."""
+        self._fill(1)
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+    def unread(self, data):
+        self._buffer[:0] = data
+
+
+def _member_path(directory, name):
+    # like zipfile's extractall, absolute paths and '..' components stay inside the directory
+    parts = [part for part in name.replace('\\', '/').split('/') if part not in ('', '.', '..')]
+    return os.path.join(directory, *parts) if parts else None
+
+
+def _read_stored_to_descriptor(stream, zip64):
+    # a stored member with a data descriptor has no size in its header: its data
+    # ends at the first descriptor whose CRC and size match the bytes before it
+    descriptor_size = 24 if zip64 else 16
+    data = bytearray()
+    searched = 0
+    while True:
+        chunk = stream.read_some()
+        if not chunk:
+            raise ValueError('The ZIP file is truncated.')
+        data += chunk
+        while True:
+            end = data.find(DATA_DESCRIPTOR, searched)
+            if end < 0:
+                # a signature may be split across chunks
+                searched = max(searched, len(data) - len(DATA_DESCRIPTOR) + 1)
+                break
+            if end + descriptor_size > len(data):
+                searched = end
+                break
+            crc = struct.unpack_from('<I', data, end + 4)[0]
+            size = struct.unpack_from('<Q' if zip64 else '<I', data, end + 8)[0]
+            if size == end and crc == zlib.crc32(data[:end]):
+                stream.unread(data[end:])
+                return bytes(data[:end])
+            searched = end + 1
+
+
+def extract_zip_stream(chunks, directory, chunk_size=2 ** 16):
+    """
+    Extract a zip file from its bytes as they arrive, one member at a time.
+
+    A zip file's central directory is at its end, so `zipfile` can only open a
+    file that is complete. The members are instead read here from their local
+    file headers, in the order they are stored, and each one is written as soon
+    as its bytes have arrived.
+
+    Parameters
+    ----------
+    chunks : iterable of bytes
+        The bytes of the zip file, in order, e.g. the chunks of a download.
+
+    directory : str
+        The directory the members are extracted to.
+
+    chunk_size : int, optional, default=2 ** 16
+        The largest number of bytes of a stored member read at a time.
+
+    Yields
+    ------
+    str
+        The path of each member file, once it is written and its CRC checked.
+        Directories are created, but not yielded.
+
+    Raises
+    ------
+    ValueError
+        If the bytes are not a zip file, are truncated or corrupt, or a member
+        is encrypted or uses a compression method other than stored or deflated.
+    """
+    stream = _ByteStream(chunks)
+    while True:
+        signature = stream.read(4)
+        if signature != LOCAL_FILE_HEADER:
+            # the central directory (or, for an empty zip file, its end) follows the last member
+            if signature[:2] == b'PK' or not signature:
+                return
+            raise ValueError('The file is not a ZIP file.')
+
+        (_, flags, method, _, _, crc, compressed_size, _, name_length,
+         extra_length) = struct.unpack('<HHHHHIIIHH', stream.read_exact(26))
+        name = stream.read_exact(name_length).decode('utf-8' if flags & 0x800 else 'cp437')
+        extra = stream.read_exact(extra_length)
+        zip64 = False
+        while len(extra) >= 4:
+            header_id, size = struct.unpack('<HH', extra[:4])
+            if header_id == 0x0001:
+                zip64 = True
+                if compressed_size == 0xFFFFFFFF:
+                    # the uncompressed size comes first, then the compressed size
+                    compressed_size = struct.unpack('<Q', extra[12:20])[0]
+            extra = extra[4 + size:]
+        if flags & 0x1:
+            raise ValueError(f"The ZIP member '{name}' is encrypted.")
+        if method not in (0, 8):
+            raise ValueError(f"The ZIP member '{name}' uses an unsupported compression method ({method}).")
+
+        path = _member_path(directory, name)
+        is_file = path is not None and not name.endswith('/')
+        if is_file:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        elif path is not None:
+            os.makedirs(path, exist_ok=True)
+
+        checksum = 0
+        # a directory's (empty) data is still read past
+        with open(path if is_file else os.devnull, 'wb') as f:
+            if method == 8:
+                # deflate streams mark their own end, so members with a data descriptor
+                # (whose sizes are only known after their data) are read to it
+                decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                while not decompressor.eof:
+                    data = stream.read_some()
+                    if not data:
+                        raise ValueError('The ZIP file is truncated.')
+                    try:
+                        data = decompressor.decompress(data)
+                    except zlib.error as error:
+                        raise ValueError(f"The ZIP member '{name}' is corrupt ({error}).") from error
+                    checksum = zlib.crc32(data, checksum)
+                    f.write(data)
+                stream.unread(decompressor.unused_data)
+            elif flags & 0x8:
+                data = _read_stored_to_descriptor(stream, zip64)
+                checksum = zlib.crc32(data)
+                f.write(data)
+            else:
+                remaining = compressed_size
+                while remaining:
+                    data = stream.read_exact(min(remaining, chunk_size))
+                    checksum = zlib.crc32(data, checksum)
+                    f.write(data)
+                    remaining -= len(data)
+
+        if flags & 0x8:
+            # the data descriptor's signature is optional
+            descriptor = stream.read_exact(4)
+            if descriptor == DATA_DESCRIPTOR:
+                descriptor = stream.read_exact(4)
+            crc = struct.unpack('<I', descriptor)[0]
+            stream.read_exact(16 if zip64 else 8)
+        if checksum != crc:
+            raise ValueError(f"The ZIP member '{name}' is corrupt (CRC mismatch).")
+        if is_file:
+            yield path
+
+
+def _put(items, item, stop):
+    # blocks while the queue is full, but gives up once any stage has failed
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _iterate(items, stop):
+    # yields the items of the previous stage until it is done, or any stage has failed
+    while True:
+        try:
+            item = items.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return
+            continue
+        if item is _DONE:
+            return
+        yield item
+
+
+def ingest(url, directory, clean_to=None, datasets=None, chunk_size=2 ** 16, queue_size=16):
+    """
+    Download a zip file, extract it and clean its data sets, with the three stages overlapped.
+
+    Unlike `read_zip`, which downloads the whole file before extracting it, the
+    stages run concurrently, connected by bounded queues: a download thread
+    writes the zip file to the directory and passes its chunks on, an extract
+    thread writes each member as soon as its bytes have arrived (see
+    `extract_zip_stream`), and this thread cleans and validates each data set
+    as soon as its raw data and names files are extracted. The time taken thus
+    approaches that of the slowest stage rather than the sum of all stages,
+    and at most 'queue_size' chunks are held in memory between stages.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the zip file.
+
+    directory : str
+        The directory the zip file is written and extracted to.
+
+    clean_to : str, optional, default=None
+        If given, the directory each data set is written to, cleaned and
+        validated, as '<name>_cleaned.csv'.
+
+    datasets : list of str, optional, default=None
+        The data sets to clean (see `DATASETS`); all of them by default.
+
+    chunk_size : int, optional, default=2 ** 16
+        The number of bytes downloaded at a time.
+
+    queue_size : int, optional, default=16
+        The largest number of chunks (or extracted files) waiting for the next stage.
+
+    Returns
+    -------
+    dict
+        The 'archive' path, the extracted 'members' in archive order, the
+        'cleaned' data file and number of 'rows' of each data set, and the
+        'seconds' taken by the 'download', 'extract' and 'parse' stages and in 'total'.
+
+    Raises
+    ------
+    ValueError
+        If the URL does not exist or does not point to a zip file, the zip file
+        is empty or corrupt, or a data set to clean is not in it.
+
+    FileNotFoundError
+        If the directory does not exist.
+
+    NotADirectoryError
+        If the directory path is an existing file.
+    """
+    start = time.perf_counter()
+    specs = [get_dataset(name) for name in (datasets if datasets is not None else DATASETS)] if clean_to else []
+    response = requests.get(url, stream=True)
+    filename_from_url = urlparse(url).path.split('/')[-1]
+    if response.status_code != 200:
+        raise ValueError('The URL provided does not exist.')
+    if filename_from_url[-4:] != '.zip':
+        raise ValueError('The URL provided does not point to a zip file.')
+    if not os.path.exists(directory):
+        raise FileNotFoundError('The directory provided does not exist.')
+    if not os.path.isdir(directory):
+        raise NotADirectoryError('The directory path provided is not a directory, it is an existing file path. Please provide a path to a new, or existing directory.')
+    if clean_to and not os.path.isdir(clean_to):
+        raise FileNotFoundError('The directory provided does not exist.')
+
+    path_to_zip_file = os.path.join(directory, filename_from_url)
+    chunks, members = queue.Queue(maxsize=queue_size), queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+    seconds = {}
+
+    def download():
+        began = time.perf_counter()
+        try:
+            with open(path_to_zip_file, 'wb') as f:
+                for chunk in response.iter_content(chunk_size):
+                    f.write(chunk)
+                    if not _put(chunks, chunk, stop):
+                        return
+        except BaseException as error:
+            errors.append(error)
+            stop.set()
+        finally:
+            response.close()
+            _put(chunks, _DONE, stop)
+            seconds['download'] = time.perf_counter() - began
+
+    def extract():
+        began = time.perf_counter()
+        try:
+            extracted = 0
+            for path in extract_zip_stream(_iterate(chunks, stop), directory, chunk_size):
+                extracted += 1
+                if not _put(members, path, stop):
+                    return
+            # the central directory is not needed, but the download still writes it
+            for _ in _iterate(chunks, stop):
+                pass
+            if not extracted and not stop.is_set():
+                raise ValueError('The ZIP file is empty.')
+        except BaseException as error:
+            errors.append(error)
+            stop.set()
+        finally:
+            _put(members, _DONE, stop)
+            seconds['extract'] = time.perf_counter() - began
+
+    threads = [threading.Thread(target=download, daemon=True), threading.Thread(target=extract, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    result = {'archive': path_to_zip_file, 'members': [], 'cleaned': {}, 'rows': {}}
+    seconds['parse'] = 0.0
+    extracted = {}
+    try:
+        for path in _iterate(members, stop):
+            result['members'].append(path)
+            extracted[os.path.basename(path)] = path
+            for spec in specs:
+                if spec.name in result['cleaned'] or spec.data_file not in extracted \
+                        or spec.name_file not in extracted:
+                    continue
+                began = time.perf_counter()
+                cleaned_data = clean_and_validate(extracted[spec.data_file], extracted[spec.name_file],
+                                                  pd.read_csv(spec.data_config_file), spec)
+                write_data(cleaned_data, clean_to, f"{spec.name}_cleaned.csv")
+                result['cleaned'][spec.name] = os.path.join(clean_to, f"{spec.name}_cleaned.csv")
+                result['rows'][spec.name] = cleaned_data.shape[0]
+                seconds['parse'] += time.perf_counter() - began
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+
+    missing = [spec.name for spec in specs if spec.name not in result['cleaned']]
+    if missing:
+        raise ValueError(f"The ZIP file does not have the raw data and names files of: {', '.join(missing)}.")
+    seconds['total'] = time.perf_counter() - start
+    result['seconds'] = seconds
+    return result
@@ -0,0 +1,184 @@
+# prediction_cache.py
+# date: 2026-10-19
+
+import collections
+import hashlib
+import threading
+import numpy as np
+from src.numpy_predictor import labels_from_probabilities
+
+
+def _split_model(model):
+    # return (transform, classify): the preprocessing and the k-nn probabilities
+    if hasattr(model, 'best_estimator_'):
+        model = model.best_estimator_
+    if hasattr(model, 'predict_proba_transformed'):
+        return model.transform, model.predict_proba_transformed
+    return model[:-1].transform, model[-1].predict_proba
+
+
+def _take_rows(X, rows):
+    return X.iloc[rows] if hasattr(X, 'iloc') else X[rows]
+
+
+class PredictionCache:
+    """
+    Cache the class probabilities of a model by feature row.
+
+    Rows are keyed by a hash of their scaled features, rounded to a multiple of
+    'quantum', together with the model version, so rows that differ only by
+    floating point noise (e.g. after a CSV round trip) share an entry. Only rows
+    that are not cached go through the nearest neighbour search. The least
+    recently used entries are evicted once the cache holds 'max_size' rows.
+
+    The cache has `predict_proba`, `predict`, `classes_` and `artifact_metadata_`
+    like the wrapped model, so it can be used wherever the model is, e.g. by
+    `src.batch_predict.predict_chunk` or the inference server.
+
+    Parameters
+    ----------
+    model : sklearn.pipeline.Pipeline or NumpyKNNPredictor
+        A fitted model, e.g. as returned by `load_pipeline` or `load_engine`.
+        Pipelines must end with the classifier.
+
+    max_size : int, optional, default=100000
+        The maximum number of cached rows.
+
+    quantum : float, optional, default=1e-6
+        Scaled features are rounded to a multiple of this before hashing.
+
+    model_version : str, optional, default=None
+        The version of the model; defaults to the 'version' of the model artifact.
+
+    Raises
+    ------
+    ValueError
+        If 'max_size' or 'quantum' is not positive, or the model version is unknown.
+    """
+
+    def __init__(self, model, max_size=100000, quantum=1e-6, model_version=None):
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer.")
+        if quantum <= 0:
+            raise ValueError("quantum must be positive.")
+        metadata = getattr(model, 'artifact_metadata_', {})
+        model_version = model_version or metadata.get('version')
+        if model_version is None:
+            raise ValueError("model_version must be given for models without artifact metadata.")
+
+        self.model = model
+        self.max_size = max_size
+        self.quantum = quantum
+        self.model_version = model_version
+        self.classes_ = model.classes_
+        self.artifact_metadata_ = metadata
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._transform, self._classify = _split_model(model)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def row_keys(self, X_scaled):
+        """
+        Compute the cache key of every scaled feature row.
+
+        Parameters
+        ----------
+        X_scaled : array-like
+            The scaled feature rows.
+
+        Returns
+        -------
+        list of bytes
+            One 16 byte key per row.
+        """
+        quantized = np.rint(np.asarray(X_scaled, dtype=np.float64) / self.quantum).astype(np.int64)
+        prefix = self.model_version.encode()
+        return [hashlib.blake2b(prefix + row.tobytes(), digest_size=16).digest() for row in quantized]
+
+    def predict_proba(self, X):
+        """
+        Predict the class probabilities of every row, from the cache where possible.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame or array-like
+            The rows to score, as accepted by the wrapped model.
+
+        Returns
+        -------
+        numpy.ndarray
+            The (n_rows, n_classes) class probabilities, in the order of 'classes_'.
+        """
+        X_scaled = self._transform(X)
+        keys = self.row_keys(X_scaled)
+        probabilities = np.empty((len(keys), len(self.classes_)))
+
+        with self._lock:
+            missing = collections.defaultdict(list)
+            for row, key in enumerate(keys):
+                cached = self._entries.get(key)
+                if cached is None:
+                    missing[key].append(row)
+                else:
+                    self._entries.move_to_end(key)
+                    probabilities[row] = cached
+            # a row repeated within the batch counts as a hit, it is not searched again
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            # repeated rows within the batch are searched once
+            first_rows = [rows[0] for rows in missing.values()]
+            computed = np.asarray(self._classify(_take_rows(X_scaled, first_rows)))
+            with self._lock:
+                for (key, rows), row_probabilities in zip(missing.items(), computed):
+                    probabilities[rows] = row_probabilities
+                    # a copy, so the entry does not keep the whole batch array alive
+                    self._entries[key] = row_probabilities.copy()
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return probabilities
+
+    def predict(self, X):
+        """
+        Predict the class of every row, with the model artifact's decision threshold if it has one.
+
+        Without a saved threshold the most probable class is predicted; ties go to the first class.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame or array-like
+            The rows to score, as accepted by the wrapped model.
+
+        Returns
+        -------
+        numpy.ndarray
+            The predicted class labels.
+        """
+        return labels_from_probabilities(self.predict_proba(X), self.classes_,
+                                         self.artifact_metadata_.get('decision_threshold'))
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns
+        -------
+        dict
+            The number of cached rows ('size'), 'hits', 'misses', 'evictions' and the
+            'hit_rate' (hits over lookups, 0 before the first lookup).
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
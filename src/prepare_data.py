@@ -0,0 +1,164 @@
+# prepare_data.py
+# date: 2026-10-19
+
+import os
+import pandas as pd
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from src.clean_data import extract_column_name, read_data, clean_data
+from src.datasets import DATASETS
+from src.validate_data import build_schema_from_DataFrame, validate_data
+from src.numeric_precision import make_precision_caster
+
+
+def read_column_names(name_file, statistics=['mean', 'se', 'max']):
+    """
+    Read the column names of the raw data from its .names file.
+
+    Parameters
+    ----------
+    name_file : str
+        The path to the .names file.
+
+    statistics : list of str, optional, default=['mean', 'se', 'max']
+        The statistics of each nucleus feature, as passed to `extract_column_name`.
+
+    Returns
+    -------
+    list of str
+        The column names, as returned by `extract_column_name`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the .names file does not exist.
+    """
+    if not os.path.exists(name_file):
+        raise FileNotFoundError("The name_file file does not exist.")
+    with open(name_file, 'r') as f:
+        raw_lines = [line.strip() for line in f if not line.startswith('#') and line.strip()]
+    return extract_column_name(raw_lines, statistics)
+
+
+def clean_and_validate(raw_data, name_file, data_config, dataset=None):
+    """
+    Read, clean and validate the raw data.
+
+    Parameters
+    ----------
+    raw_data : str
+        The path to the raw data file, e.g. 'wdbc.data'.
+
+    name_file : str
+        The path to its .names file.
+
+    data_config : pandas.DataFrame
+        The data configuration, as passed to `build_schema_from_DataFrame`.
+
+    dataset : DatasetSpec, optional, default=None
+        How to read and clean the data set, e.g. `DATASETS['wpbc']`; the WDBC
+        data by default.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The validated data, without the dropped columns (e.g. 'id_number') and
+        with the class labels (e.g. of 'diagnosis') spelled out.
+
+    Raises
+    ------
+    pandera.errors.SchemaError
+        If the cleaned data does not conform to the data configuration.
+    """
+    dataset = dataset or DATASETS['wdbc']
+    colnames = read_column_names(name_file, dataset.statistics)
+    cleaned_data = clean_data(read_data(raw_data, colnames, dataset.na_values),
+                              drop_columns=dataset.drop_columns, relabel=dataset.relabel, target=dataset.target)
+    schema = build_schema_from_DataFrame(data_config=data_config,
+                                         expected_columns=[name for name in colnames
+                                                           if name not in dataset.drop_columns],
+                                         unique_rows=dataset.unique_rows)
+    validated = validate_data(schema=schema, dataframe=cleaned_data)
+    if dataset.drop_missing:
+        validated = validated.dropna().reset_index(drop=True)
+    return validated
+
+
+def make_preprocessor(precision='float64'):
+    """
+    Create the (unfitted) preprocessor: standardise the numeric columns.
+
+    Parameters
+    ----------
+    precision : {'float64', 'float32'}, optional, default='float64'
+        The floating point precision of the scaled features.
+
+    Returns
+    -------
+    sklearn.compose.ColumnTransformer or sklearn.pipeline.Pipeline
+        The preprocessor, preceded by a precision caster for 'float32'.
+    """
+    preprocessor = make_column_transformer(
+        (StandardScaler(), make_column_selector(dtype_include='number')),
+        remainder='passthrough',
+        verbose_feature_names_out=False
+    )
+    if precision != 'float64':
+        preprocessor = make_pipeline(make_precision_caster(precision), preprocessor)
+    return preprocessor
+
+
+def split_and_scale(cleaned_data, preprocessor, train_size=0.70, target='class', random_state=None):
+    """
+    Split the data into stratified train and test sets and scale them.
+
+    Parameters
+    ----------
+    cleaned_data : pandas.DataFrame
+        The cleaned data, e.g. as returned by `clean_and_validate` with its
+        'diagnosis' column renamed to 'class'.
+
+    preprocessor : sklearn transformer
+        The preprocessor, e.g. as returned by `make_preprocessor`. It is fitted
+        to the train set, in place.
+
+    train_size : float, optional, default=0.70
+        The proportion of the rows in the train set.
+
+    target : str, optional, default='class'
+        The class column the split is stratified on.
+
+    random_state : int, optional, default=None
+        Passed to `train_test_split`; None uses NumPy's global random state.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        The 'train' and 'test' sets and their scaled versions,
+        'scaled_train' and 'scaled_test'.
+
+    Raises
+    ------
+    TypeError
+        If 'cleaned_data' is not a pandas data frame.
+
+    ValueError
+        If 'target' is not a column of 'cleaned_data'.
+    """
+    if not isinstance(cleaned_data, pd.DataFrame):
+        raise TypeError("cleaned_data must be a pandas data frame.")
+    if target not in cleaned_data.columns:
+        raise ValueError(f"The class column '{target}' is not in the data frame.")
+
+    train, test = train_test_split(
+        cleaned_data, train_size=train_size, stratify=cleaned_data[target], random_state=random_state
+    )
+    preprocessor.fit(train)
+    return {
+        'train': train,
+        'test': test,
+        'scaled_train': preprocessor.transform(train),
+        'scaled_test': preprocessor.transform(test)
+    }
@@ -0,0 +1,268 @@
+# profiling.py
+# date: 2026-10-19
+
+# Every script imports this module, so like src/cli.py it only imports click and
+# the standard library.
+import datetime
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+import click
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+MANIFEST = "results/run_manifest.jsonl"
+TOP_ALLOCATIONS = 10
+
+# the runs being profiled in this process, innermost last (a pipeline run
+# profiles the stages it runs in-process)
+_active_runs = []
+
+
+def record_rows(n_rows):
+    """
+    Count rows processed by the stage being profiled; a no-op when not profiling.
+
+    Parameters
+    ----------
+    n_rows : int
+        The number of rows.
+    """
+    if _active_runs:
+        _active_runs[-1]['rows'] += int(n_rows)
+
+
+def profile_arguments():
+    """
+    Return the options that profile a script into the active run's manifest.
+
+    Returns
+    -------
+    list of str
+        ['--profile', '--manifest=...'] while a run is profiled, else [].
+    """
+    if not _active_runs:
+        return []
+    return ['--profile', f"--manifest={_active_runs[-1]['manifest']}"]
+
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of this process so far, in MiB.
+
+    Returns
+    -------
+    float or None
+        The peak RSS, or None where the `resource` module is not available.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def append_to_manifest(record, manifest):
+    """
+    Append a run record to a JSON Lines manifest.
+
+    Each record is written with a single append, so processes profiling stages
+    concurrently do not overwrite each other's records.
+
+    Parameters
+    ----------
+    record : dict
+        The run record; values JSON cannot represent are written as strings.
+
+    manifest : str
+        The manifest file; it and its directory are created if needed.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(manifest)), exist_ok=True)
+    with open(manifest, 'a') as f:
+        f.write(json.dumps(record, default=str) + '\n')
+
+
+def read_manifest(manifest):
+    """
+    Read the run records of a manifest.
+
+    Parameters
+    ----------
+    manifest : str
+        The manifest file.
+
+    Returns
+    -------
+    list of dict
+        The run records, oldest first.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the manifest does not exist.
+    """
+    if not os.path.exists(manifest):
+        raise FileNotFoundError("The manifest file does not exist.")
+    with open(manifest) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _top_allocations(snapshot):
+    # imported modules' code objects are not the stage's allocations (filtering
+    # the statistics is much faster than filtering the snapshot's traces)
+    excluded = {'<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>',
+                tracemalloc.__file__, __file__}
+    statistics = [stat for stat in snapshot.statistics('lineno')
+                  if stat.traceback[0].filename not in excluded]
+    return [{'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             'size_mb': stat.size / 2 ** 20, 'count': stat.count}
+            for stat in statistics[:TOP_ALLOCATIONS]]
+
+
+def _snapshot_on_return(code, snapshots):
+    # a trace function that snapshots the traced memory when the frame running
+    # 'code' returns, i.e. while the stage's data frames are still alive
+    def local_trace(frame, event, arg):
+        if event == 'return':
+            snapshots.append(tracemalloc.take_snapshot())
+        return local_trace
+
+    def global_trace(frame, event, arg):
+        if frame.f_code is code:
+            frame.f_trace_lines = False
+            return local_trace
+        return None
+    return global_trace
+
+
+def run_profiled(function, args, kwargs, stage, manifest=MANIFEST, stats_to=None):
+    """
+    Call a function and append its run record to the manifest.
+
+    The record holds the 'stage' name, 'started' time (UTC), 'status' ('ok' or
+    the exception's name), wall time ('wall_s'), CPU time of this process
+    ('cpu_s'), peak RSS of this process so far ('peak_rss_mb'), peak memory
+    allocated while the function ran ('peak_traced_mb'), the allocation sites
+    holding the most memory when the function returns ('top_allocations'), the
+    rows counted with `record_rows` ('rows', 'rows_per_s'), the cProfile
+    statistics file ('profile_stats') and the function's keyword arguments
+    ('options'). Tracing memory allocations slows the function down.
+
+    Parameters
+    ----------
+    function : callable
+        The function to call.
+
+    args, kwargs : tuple, dict
+        Its arguments.
+
+    stage : str
+        The name recorded for the run.
+
+    manifest : str, optional, default=MANIFEST
+        The JSON Lines manifest the record is appended to.
+
+    stats_to : str, optional, default=None
+        If given, the function also runs under cProfile and its statistics are
+        dumped to this file (readable with `pstats`).
+
+    Returns
+    -------
+    object
+        The function's return value. Exceptions are recorded, then re-raised.
+    """
+    run = {'manifest': manifest, 'rows': 0, 'child_peak': 0}
+    nested = tracemalloc.is_tracing()
+    if nested:
+        # keep the enclosing run's peak, then measure this run's from zero
+        if _active_runs:
+            _active_runs[-1]['child_peak'] = max(_active_runs[-1]['child_peak'],
+                                                 tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    _active_runs.append(run)
+    snapshots = []
+    previous_trace = sys.gettrace()
+    sys.settrace(_snapshot_on_return(function.__code__, snapshots))
+    profiler = None
+    if stats_to:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    status = 'ok'
+    started = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        if profiler is None:
+            return function(*args, **kwargs)
+        return profiler.runcall(function, *args, **kwargs)
+    except BaseException as error:
+        status = type(error).__name__
+        raise
+    finally:
+        wall_s, cpu_s = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        sys.settrace(previous_trace)
+        _active_runs.pop()
+        peak = max(tracemalloc.get_traced_memory()[1], run['child_peak'])
+        if nested:
+            if _active_runs:
+                _active_runs[-1]['child_peak'] = max(_active_runs[-1]['child_peak'], peak)
+        else:
+            tracemalloc.stop()
+        if profiler is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(stats_to)), exist_ok=True)
+            profiler.dump_stats(stats_to)
+        append_to_manifest({
+            'stage': stage,
+            'started': started,
+            'status': status,
+            'pid': os.getpid(),
+            'wall_s': wall_s,
+            'cpu_s': cpu_s,
+            'peak_rss_mb': peak_rss_mb(),
+            'peak_traced_mb': peak / 2 ** 20,
+            'top_allocations': _top_allocations(snapshots[-1]) if snapshots else [],
+            'rows': run['rows'] or None,
+            'rows_per_s': run['rows'] / wall_s if run['rows'] and wall_s > 0 else None,
+            'profile_stats': stats_to,
+            'options': kwargs
+        }, manifest)
+
+
+def profiled(function):
+    """
+    Add `--profile`, `--profile-stats` and `--manifest` options to a script's `main`.
+
+    Apply it below the click options (i.e. before them), e.g.::
+
+        @click.command()
+        @click.option('--seed', type=int)
+        @profiled
+        def main(seed):
+            ...
+
+    Without `--profile` or `--profile-stats`, `main` runs as before; with either,
+    it runs through `run_profiled`, recorded under the script's file name.
+    """
+    stage = os.path.splitext(os.path.basename(function.__code__.co_filename))[0]
+
+    @functools.wraps(function)
+    def wrapper(*args, profile=False, profile_stats=None, manifest=MANIFEST, **kwargs):
+        if not (profile or profile_stats):
+            return function(*args, **kwargs)
+        return run_profiled(function, args, kwargs, stage, manifest, profile_stats)
+
+    wrapper = click.option('--manifest', type=str, default=MANIFEST,
+                           help="Path to the JSON Lines run manifest profiles are appended to")(wrapper)
+    wrapper = click.option('--profile-stats', type=str,
+                           help="Optional: path cProfile statistics of the run will be written to (implies --profile)")(wrapper)
+    wrapper = click.option('--profile', is_flag=True,
+                           help="Append the run's time, memory, top allocations and rows processed to the run manifest")(wrapper)
+    return wrapper
@@ -0,0 +1,281 @@
+# sharded_data.py
+# date: 2026-10-19
+
+import glob
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pandera as pa
+from src.batch_predict import ordered_map
+from src.clean_data import read_data, clean_data
+from src.datasets import DATASETS
+from src.validate_data import build_schema_from_DataFrame, validate_data
+
+# the failure cases kept per shard in the validation report
+MAX_REPORTED_FAILURES = 100
+
+# set in each worker process by `init_worker`
+_worker_state = None
+
+
+def find_shards(raw_data):
+    """
+    List the raw data files of a single file, a directory of shards or a glob pattern.
+
+    Parameters
+    ----------
+    raw_data : str
+        A file, a directory (every file in it that is not hidden is a shard) or a
+        glob pattern such as 'data/raw/feed/*.csv'.
+
+    Returns
+    -------
+    list of str
+        The files, in sorted order.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no file matches.
+    """
+    if os.path.isdir(raw_data):
+        shards = [os.path.join(raw_data, name) for name in os.listdir(raw_data) if not name.startswith('.')]
+    else:
+        shards = glob.glob(raw_data)
+    shards = sorted(path for path in shards if os.path.isfile(path))
+    if not shards:
+        raise FileNotFoundError(f"No raw data files match '{raw_data}'.")
+    return shards
+
+
+def init_worker(colnames, data_config, dataset):
+    """
+    Build the shard schema in a worker process, once, before it validates any shards.
+
+    Pass this as the 'initializer' of a `ProcessPoolExecutor` whose tasks call
+    `clean_and_validate_shard`. The schema has the column type, range and
+    category checks and the empty rows check of the data configuration, which
+    hold row by row; the null fraction and duplicate rows checks are left to
+    `merge_shard_summaries`, as they only hold for all shards together.
+    """
+    global _worker_state
+    shard_config = data_config.assign(max_nullable=np.nan)
+    schema = build_schema_from_DataFrame(data_config=shard_config,
+                                         expected_columns=[name for name in colnames
+                                                           if name not in dataset.drop_columns],
+                                         unique_rows=False)
+    float_columns = data_config.loc[data_config['type'].str.strip() == 'float', 'column'].str.strip().tolist()
+    _worker_state = {'colnames': colnames, 'dataset': dataset, 'schema': schema, 'float_columns': float_columns}
+
+
+def clean_and_validate_shard(task):
+    """
+    Read, clean and validate one shard with the schema built by `init_worker`.
+
+    Parameters
+    ----------
+    task : tuple
+        The shard's path and the CSV file its cleaned data is written to if it
+        passes the row checks.
+
+    Returns
+    -------
+    dict
+        The 'shard', its 'partition' (None if not written), number of 'rows',
+        'null_counts' per column, 'row_hashes' (a 64-bit hash of each cleaned
+        row, to find duplicates across shards), number of 'failures' and the
+        first `MAX_REPORTED_FAILURES` 'failure_cases'.
+    """
+    shard, partition = task
+    dataset = _worker_state['dataset']
+    if os.path.getsize(shard) == 0:
+        cleaned_data = pd.DataFrame(columns=[name for name in _worker_state['colnames']
+                                             if name not in dataset.drop_columns])
+    else:
+        cleaned_data = clean_data(read_data(shard, _worker_state['colnames'], dataset.na_values),
+                                  drop_columns=dataset.drop_columns, relabel=dataset.relabel, target=dataset.target)
+        # a float column whose values in this shard happen to be whole numbers is read as integers
+        for column in _worker_state['float_columns']:
+            if column in cleaned_data.columns and pd.api.types.is_integer_dtype(cleaned_data[column]):
+                cleaned_data[column] = cleaned_data[column].astype(float)
+    summary = {
+        'shard': shard,
+        'partition': None,
+        'rows': cleaned_data.shape[0],
+        'null_counts': cleaned_data.isna().sum().to_dict(),
+        # hashed as floats, so a row matches a row of a shard where the column has missing values
+        'row_hashes': pd.util.hash_pandas_object(
+            cleaned_data.astype(dict.fromkeys(cleaned_data.select_dtypes('number').columns, float)), index=False
+        ).to_numpy(),
+        'failures': 0,
+        'failure_cases': []
+    }
+    if cleaned_data.empty:
+        return summary
+    try:
+        validated = validate_data(schema=_worker_state['schema'], dataframe=cleaned_data)
+    except pa.errors.SchemaErrors as errors:
+        failure_cases = errors.failure_cases[['column', 'check', 'failure_case', 'index']]
+        summary['failures'] = failure_cases.shape[0]
+        summary['failure_cases'] = failure_cases.head(MAX_REPORTED_FAILURES).astype(str).to_dict('records')
+        return summary
+    if dataset.drop_missing:
+        validated = validated.dropna()
+    validated.to_csv(partition, index=False)
+    summary['partition'] = partition
+    return summary
+
+
+def merge_shard_summaries(summaries, data_config, unique_rows=True):
+    """
+    Combine the shard summaries into a validation report, checking the null
+    fractions and duplicate rows of all shards together.
+
+    Parameters
+    ----------
+    summaries : list of dict
+        The summaries returned by `clean_and_validate_shard`.
+
+    data_config : pandas.DataFrame
+        The data configuration, with the 'max_nullable' fraction of each column.
+
+    unique_rows : bool, optional, default=True
+        Whether rows must not be duplicated, within or across shards.
+
+    Returns
+    -------
+    dict
+        The report: whether the data is 'valid', its total 'rows', the
+        'null_fractions' per column, the number of 'duplicate_rows' (rows equal
+        to an earlier row of any shard; None if not checked), the 'global_failures'
+        and, per shard, its partition, rows and failure cases ('shards').
+    """
+    rows = sum(summary['rows'] for summary in summaries)
+    null_counts = pd.DataFrame([summary['null_counts'] for summary in summaries]).sum()
+    null_fractions = (null_counts / rows if rows else null_counts * 0.0).to_dict()
+
+    global_failures = []
+    for _, row in data_config.iterrows():
+        column, max_nullable = row['column'].strip(), row['max_nullable']
+        if pd.notna(max_nullable) and null_fractions.get(column, 0.0) > max_nullable:
+            global_failures.append({
+                'column': column,
+                'check': f'Too many missing values, must have at least {(1-max_nullable)*100}% non-null values.',
+                'failure_case': null_fractions[column]
+            })
+
+    duplicate_rows = None
+    if unique_rows:
+        # 64-bit hashes: a collision between different rows is vanishingly unlikely
+        row_hashes = np.concatenate([summary['row_hashes'] for summary in summaries])
+        duplicate_rows = int(row_hashes.size - np.unique(row_hashes).size)
+        if duplicate_rows:
+            global_failures.append({'column': None, 'check': "Duplicate rows found.", 'failure_case': duplicate_rows})
+
+    return {
+        'valid': not global_failures and not any(summary['failures'] for summary in summaries),
+        'rows': rows,
+        'null_fractions': null_fractions,
+        'duplicate_rows': duplicate_rows,
+        'global_failures': global_failures,
+        'shards': [{name: value for name, value in summary.items() if name != 'row_hashes'}
+                   for summary in summaries]
+    }
+
+
+def clean_and_validate_shards(shards, colnames, data_config, partitions_to, dataset=None, n_jobs=1):
+    """
+    Clean and validate shards of raw data in parallel and write them as a partitioned data set.
+
+    Each shard is read, cleaned and checked row by row in a worker process; the
+    null fraction and duplicate rows checks are then applied to all shards
+    together (see `merge_shard_summaries`), so the result is the same as for
+    the concatenated shards. The partitions are only moved to 'partitions_to'
+    if every check passes.
+
+    Parameters
+    ----------
+    shards : list of str
+        The raw data files, e.g. as returned by `find_shards`.
+
+    colnames : list of str
+        The column names of the raw data, e.g. as returned by `read_column_names`.
+
+    data_config : pandas.DataFrame
+        The data configuration, as passed to `build_schema_from_DataFrame`.
+
+    partitions_to : str
+        The directory the cleaned data is written to, one 'part-NNNNN.csv' file
+        per shard, in the order of 'shards'. It is replaced if it exists.
+
+    dataset : DatasetSpec, optional, default=None
+        How to read and clean the data; the WDBC data by default.
+
+    n_jobs : int, optional, default=1
+        The number of worker processes; 1 validates the shards in this process.
+
+    Returns
+    -------
+    dict
+        The validation report, as returned by `merge_shard_summaries`, with the
+        'partitions' directory (None if the data is not valid).
+
+    Raises
+    ------
+    ValueError
+        If there are no shards or 'n_jobs' is not a positive integer.
+    """
+    if not shards:
+        raise ValueError("shards must not be empty.")
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be a positive integer.")
+    dataset = dataset or DATASETS['wdbc']
+
+    # partitions are written next to the output directory, then moved in place
+    staging = partitions_to.rstrip(os.sep) + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    tasks = [(shard, os.path.join(staging, f"part-{i:05d}.csv")) for i, shard in enumerate(shards)]
+    initargs = (colnames, data_config, dataset)
+    try:
+        if n_jobs == 1:
+            init_worker(*initargs)
+            summaries = [clean_and_validate_shard(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=init_worker, initargs=initargs) as executor:
+                summaries = list(ordered_map(clean_and_validate_shard, tasks, executor, max_pending=2 * n_jobs))
+        report = merge_shard_summaries(summaries, data_config, dataset.unique_rows)
+        report['partitions'] = None
+        if report['valid']:
+            shutil.rmtree(partitions_to, ignore_errors=True)
+            os.replace(staging, partitions_to)
+            report['partitions'] = partitions_to
+            for shard in report['shards']:
+                if shard['partition']:
+                    shard['partition'] = os.path.join(partitions_to, os.path.basename(shard['partition']))
+            return report
+        for shard in report['shards']:
+            shard['partition'] = None
+        return report
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def write_report(report, path):
+    """
+    Write a validation report as JSON.
+
+    Parameters
+    ----------
+    report : dict
+        The report, as returned by `clean_and_validate_shards`.
+
+    path : str
+        The JSON file; its directory is created if needed.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
@@ -0,0 +1,318 @@
+# synthetic_data.py
+# date: 2026-10-19
+
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+from src.batch_predict import ordered_map
+
+OUTPUT_FORMATS = ['.csv', '.data', '.zip', '.parquet']
+# the file a zip output holds, as in the downloaded archive
+ZIP_MEMBER = 'wdbc.data'
+
+# the model each worker process receives once, in `init_worker`
+_worker_model = None
+
+
+def fit_generator(data, data_config, id_column='id_number', target='diagnosis'):
+    """
+    Fit a class-conditional Gaussian copula to the raw data.
+
+    For each class, the generator keeps the sorted values of every feature (its
+    empirical marginal distribution) and the correlation matrix of the features'
+    normal scores, so synthetic rows reproduce the marginals and the
+    class-conditional correlations of the data without copying any row.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The raw data, e.g. `wdbc.data` read with `read_data`: an id column, the
+        class column and numeric feature columns.
+
+    data_config : pandas.DataFrame
+        The data configuration, as passed to `build_schema_from_DataFrame`. Its
+        'min', 'max' and 'max_nullable' values bound the synthetic features.
+
+    id_column : str, optional, default='id_number'
+        The name of the id column.
+
+    target : str, optional, default='diagnosis'
+        The name of the class column.
+
+    Returns
+    -------
+    dict
+        The generator: the 'columns' of the data, the 'id_column', 'target' and
+        'features', the 'lower' and 'upper' bounds and 'max_nullable' of the
+        features, and per class ('classes') its 'prior', 'quantiles' and 'cholesky'.
+
+    Raises
+    ------
+    TypeError
+        If 'data' or 'data_config' is not a pandas data frame.
+
+    ValueError
+        If 'id_column' or 'target' is not a column of 'data', a feature has
+        missing values or a class has fewer than two rows.
+    """
+    if not isinstance(data, pd.DataFrame) or not isinstance(data_config, pd.DataFrame):
+        raise TypeError("data and data_config must be pandas data frames.")
+    for column in [id_column, target]:
+        if column not in data.columns:
+            raise ValueError(f"The column '{column}' is not in the data frame.")
+
+    features = [column for column in data.columns if column not in (id_column, target)]
+    if data[features].isna().any().any():
+        raise ValueError("The feature columns must not have missing values.")
+    config = data_config.assign(column=data_config['column'].str.strip()).set_index('column')
+    config = config.reindex(features)
+    generator = {
+        'columns': list(data.columns),
+        'id_column': id_column,
+        'target': target,
+        'features': features,
+        'lower': config['min'].astype(float).fillna(-np.inf).to_numpy(),
+        'upper': config['max'].astype(float).fillna(np.inf).to_numpy(),
+        'max_nullable': config['max_nullable'].astype(float).fillna(1.0).to_numpy(),
+        'classes': {}
+    }
+
+    for label, rows in data.groupby(target):
+        values = rows[features].to_numpy(dtype=np.float64)
+        n_rows = values.shape[0]
+        if n_rows < 2:
+            raise ValueError(f"The class '{label}' must have at least two rows.")
+        # normal scores of the ranks; their correlation is the copula's
+        ranks = rows[features].rank(method='average').to_numpy()
+        scores = ndtri((ranks - 0.5) / n_rows)
+        correlation = np.corrcoef(scores, rowvar=False)
+        correlation = np.nan_to_num(correlation) + 1e-9 * np.eye(len(features))
+        generator['classes'][label] = {
+            'prior': n_rows / data.shape[0],
+            'quantiles': np.sort(values, axis=0),
+            'cholesky': np.linalg.cholesky(correlation)
+        }
+    return generator
+
+
+def _sample_class(model, n_rows, rng):
+    # correlated normal scores -> uniforms -> interpolated empirical quantiles
+    quantiles = model['quantiles']
+    uniforms = ndtr(rng.standard_normal((n_rows, quantiles.shape[1])) @ model['cholesky'].T)
+    position = uniforms * (quantiles.shape[0] - 1)
+    below = np.minimum(position.astype(np.int64), quantiles.shape[0] - 2)
+    low = np.take_along_axis(quantiles, below, axis=0)
+    high = np.take_along_axis(quantiles, below + 1, axis=0)
+    return low + (position - below) * (high - low)
+
+
+def generate_rows(generator, n_rows, start_id=1, null_fraction=0.0, random_state=None):
+    """
+    Generate synthetic rows in the layout of the raw data.
+
+    Parameters
+    ----------
+    generator : dict
+        The generator, as returned by `fit_generator`.
+
+    n_rows : int
+        The number of rows to generate.
+
+    start_id : int, optional, default=1
+        The id of the first row; ids are consecutive.
+
+    null_fraction : float, optional, default=0.0
+        The fraction of missing values in every feature column (rounded down
+        to whole rows).
+
+    random_state : int or numpy.random.SeedSequence, optional, default=None
+        The seed of the random number generator.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The rows, with the columns of the data the generator was fitted to.
+        Classes are drawn with their frequency in that data, and features are
+        clipped to the configured ranges.
+
+    Raises
+    ------
+    ValueError
+        If 'n_rows' is not a positive integer, or 'null_fraction' is negative or
+        exceeds the configured 'max_nullable' of a feature.
+    """
+    if n_rows < 1:
+        raise ValueError("n_rows must be a positive integer.")
+    if null_fraction < 0 or null_fraction > generator['max_nullable'].min():
+        raise ValueError("null_fraction must be between 0 and the max_nullable of every feature.")
+
+    rng = np.random.default_rng(random_state)
+    labels = list(generator['classes'])
+    priors = [generator['classes'][label]['prior'] for label in labels]
+    classes = rng.choice(len(labels), size=n_rows, p=priors)
+
+    values = np.empty((n_rows, len(generator['features'])))
+    for i, label in enumerate(labels):
+        in_class = classes == i
+        values[in_class] = _sample_class(generator['classes'][label], int(in_class.sum()), rng)
+    values = np.clip(values, generator['lower'], generator['upper'])
+
+    n_missing = int(null_fraction * n_rows)
+    if n_missing:
+        for column in range(values.shape[1]):
+            values[rng.choice(n_rows, size=n_missing, replace=False), column] = np.nan
+
+    rows = pd.DataFrame(values, columns=generator['features'])
+    rows.insert(0, generator['id_column'], np.arange(start_id, start_id + n_rows))
+    rows.insert(1, generator['target'], np.asarray(labels, dtype=object)[classes])
+    return rows[generator['columns']]
+
+
+def to_raw_text(rows, generator):
+    """
+    Format generated rows as headerless CSV text, like `wdbc.data`.
+
+    Features are written with 6 significant digits and missing values as
+    empty fields. This is several times faster than `DataFrame.to_csv` with a
+    float format.
+
+    Parameters
+    ----------
+    rows : pandas.DataFrame
+        The rows, as returned by `generate_rows`.
+
+    generator : dict
+        The generator that generated them.
+
+    Returns
+    -------
+    bytes
+        The CSV text, one line per row.
+    """
+    formats = {generator['id_column']: '%d', generator['target']: '%s'}
+    line = ','.join(formats.get(column, '%.6g') for column in rows.columns)
+    columns = [rows[column].tolist() for column in rows.columns]
+    text = ''.join(line % values + '\n' for values in zip(*columns))
+    # 'nan' only appears as a whole feature field, never in the first (id) field
+    return text.replace(',nan', ',').encode()
+
+
+def init_worker(generator):
+    """
+    Keep the generator in a worker process, once, before it generates any chunks.
+
+    Pass this as the 'initializer' of a `ProcessPoolExecutor` whose tasks call
+    `generate_in_worker`.
+    """
+    global _worker_model
+    _worker_model = generator
+
+
+def generate_in_worker(task):
+    """
+    Generate one chunk with the generator kept by `init_worker`.
+
+    Parameters
+    ----------
+    task : tuple
+        The chunk's number of rows, first id, null fraction, seed and output
+        format (one of `OUTPUT_FORMATS`).
+
+    Returns
+    -------
+    bytes or pandas.DataFrame
+        The rows as headerless CSV text, or the data frame for Parquet output.
+    """
+    n_rows, start_id, null_fraction, seed, output_format = task
+    rows = generate_rows(_worker_model, n_rows, start_id, null_fraction, seed)
+    if output_format == '.parquet':
+        return rows
+    return to_raw_text(rows, _worker_model)
+
+
+def write_synthetic_data(generator, path, n_rows, chunk_size=100000, n_jobs=1, null_fraction=0.0,
+                         random_state=None):
+    """
+    Generate synthetic rows chunk by chunk and stream them to a file.
+
+    Chunks are generated in parallel and written in order, and only a few are
+    held in memory at a time, so any number of rows can be written. Each chunk
+    has its own seed derived from 'random_state', so the output does not
+    depend on 'n_jobs'.
+
+    Parameters
+    ----------
+    generator : dict
+        The generator, as returned by `fit_generator`.
+
+    path : str
+        The output file. '.csv' and '.data' files are written without a header,
+        like `wdbc.data`; a '.zip' file holds such a file named 'wdbc.data'; a
+        '.parquet' file has the column names and requires pyarrow.
+
+    n_rows : int
+        The number of rows to write.
+
+    chunk_size : int, optional, default=100000
+        The number of rows generated at a time.
+
+    n_jobs : int, optional, default=1
+        The number of worker processes.
+
+    null_fraction : float, optional, default=0.0
+        See `generate_rows`.
+
+    random_state : int, optional, default=None
+        The seed of the random number generator.
+
+    Raises
+    ------
+    ValueError
+        If the output format is not supported, or 'n_rows', 'chunk_size' or
+        'n_jobs' is not a positive integer.
+
+    ImportError
+        If a Parquet file is written without pyarrow installed.
+    """
+    output_format = os.path.splitext(path)[1].lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"The output file must end in one of {OUTPUT_FORMATS}.")
+    for name, value in [('n_rows', n_rows), ('chunk_size', chunk_size), ('n_jobs', n_jobs)]:
+        if value < 1:
+            raise ValueError(f"{name} must be a positive integer.")
+    if output_format == '.parquet':
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Writing Parquet files requires pyarrow.")
+
+    starts = range(0, n_rows, chunk_size)
+    seeds = np.random.SeedSequence(random_state).spawn(len(starts))
+    tasks = ((min(chunk_size, n_rows - start), start + 1, null_fraction, seed, output_format)
+             for start, seed in zip(starts, seeds))
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=init_worker, initargs=(generator,)) as executor:
+        chunks = ordered_map(generate_in_worker, tasks, executor, max_pending=2 * n_jobs)
+        if output_format == '.parquet':
+            writer = None
+            for rows in chunks:
+                table = pyarrow.Table.from_pandas(rows, preserve_index=False)
+                writer = writer or pyarrow.parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            writer.close()
+        elif output_format == '.zip':
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                member = zipfile.ZipInfo(ZIP_MEMBER, date_time=time.localtime()[:6])
+                member.compress_type = zipfile.ZIP_DEFLATED
+                with archive.open(member, 'w', force_zip64=True) as f:
+                    for text in chunks:
+                        f.write(text)
+        else:
+            with open(path, 'wb') as f:
+                for text in chunks:
+                    f.write(text)
@@ -0,0 +1,173 @@
+# tuning_cache.py
+# date: 2026-10-19
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+CACHE_KEY_FIELD = '__cache_key__'
+
+
+def hash_inputs(dataframe, params):
+    """
+    Compute a content hash of the training data and the tuning parameters.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        The training data (features and target) passed to the grid search.
+
+    params : dict
+        JSON serialisable description of everything else the grid search depends on,
+        e.g. the parameter grid, number of folds, scorer and a hash of the preprocessor.
+
+    Returns
+    -------
+    str
+        A hexadecimal SHA-256 digest.
+
+    Raises
+    ------
+    TypeError
+        If 'dataframe' is not a pandas DataFrame or 'params' is not a dictionary.
+    """
+    # Ensure the dataframe is a dataframe, if not raise an error
+    if not isinstance(dataframe, pd.DataFrame):
+        raise TypeError("dataframe must be a pandas data frame.")
+
+    # Ensure the params is a dictionary, if not raise an error
+    if not isinstance(params, dict):
+        raise TypeError("params must be a dictionary.")
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([list(map(str, dataframe.columns)),
+                              list(map(str, dataframe.dtypes))]).encode())
+    digest.update(pd.util.hash_pandas_object(dataframe, index=False).to_numpy().tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def hash_file(path):
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+
+    Returns
+    -------
+    str
+        A hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _to_plain_array(values):
+    # cv_results_ stores parameters as masked object arrays, which np.save can only pickle
+    if np.ma.isMaskedArray(values):
+        mask = np.ma.getmaskarray(values)
+        values = values.data if not mask.any() else values.astype(object).filled(None)
+    if isinstance(values, list) or np.asarray(values).dtype == object:
+        values = [json.dumps(value, sort_keys=True, default=str) if isinstance(value, dict) else value
+                  for value in values]
+        array = np.asarray(values)
+        return array.astype(str) if array.dtype == object else array
+    return np.asarray(values)
+
+
+def write_cv_results(cv_results, path, cache_key):
+    """
+    Write a grid search's `cv_results_` as a compact columnar `.npz` file.
+
+    Every entry of `cv_results_` is stored as its own uncompressed array (the
+    'params' dictionaries as JSON strings), together with the cache key of the
+    inputs that produced them.
+
+    Parameters
+    ----------
+    cv_results : dict
+        The `cv_results_` attribute of a fitted `GridSearchCV` object.
+
+    path : str
+        The path of the `.npz` file to write.
+
+    cache_key : str
+        The key returned by `hash_inputs` for the grid search's inputs.
+
+    Raises
+    ------
+    TypeError
+        If 'cv_results' is not a dictionary.
+
+    FileNotFoundError
+        If the directory of 'path' does not exist.
+    """
+    # Ensure cv_results is a dictionary, if not raise an error
+    if not isinstance(cv_results, dict):
+        raise TypeError("cv_results must be a dictionary.")
+
+    # Ensure directory path exists, if not raise an error
+    if not os.path.isdir(os.path.dirname(path) or '.'):
+        raise FileNotFoundError('The directory provided does not exist.')
+
+    columns = {name: _to_plain_array(values) for name, values in cv_results.items()}
+    columns[CACHE_KEY_FIELD] = np.asarray(cache_key)
+    with open(path, 'wb') as f:
+        np.savez(f, **columns)
+
+
+def read_cache_key(path):
+    """
+    Read the cache key stored in a cv_results file.
+
+    Parameters
+    ----------
+    path : str
+        The path of a `.npz` file written by `write_cv_results`.
+
+    Returns
+    -------
+    str or None
+        The cache key, or None if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as columns:
+        return str(columns[CACHE_KEY_FIELD])
+
+
+def read_cv_results(path):
+    """
+    Read a cv_results file as a dataframe, one row per parameter combination.
+
+    Parameters
+    ----------
+    path : str
+        The path of a `.npz` file written by `write_cv_results`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The grid search results, with the 'params' column decoded back to dictionaries.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError('The cv_results file does not exist.')
+    with np.load(path, allow_pickle=False) as columns:
+        cv_results = pd.DataFrame({name: columns[name] for name in columns.files
+                                   if name != CACHE_KEY_FIELD})
+    if 'params' in cv_results:
+        cv_results['params'] = cv_results['params'].map(json.loads)
+    return cv_results
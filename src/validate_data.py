@@ -6,13 +6,14 @@ import pandas as pd
 import pandera as pa
 
 # Function to build schema from the config file
-def build_schema_from_DataFrame(data_config, expected_columns):
+def build_schema_from_DataFrame(data_config, expected_columns, unique_rows=True):
     """
     Build a Pandera schema for data validation based on a configuration dataframe.
 
     This function generates a Pandera schema from a configuration dataframe that defines
     the expected types, ranges, and categories for each column in the data. It also includes 
-    global checks to ensure no duplicate rows and no entirely empty rows in the dataset.
+    global checks to ensure no duplicate rows (unless 'unique_rows' is False) and no entirely
+    empty rows in the dataset.
 
     Parameters
     ----------
@@ -26,6 +27,10 @@ def build_schema_from_DataFrame(data_config, expected_columns):
         A list of column names that the configuration should match. The columns in the 
         'data_config' dataframe must match these names.
 
+    unique_rows : bool, optional, default=True
+        Whether to check that there are no duplicate rows, e.g. False for data of integer scores
+        where different samples can have identical rows.
+
     Returns
     -------
     pandera.DataFrameSchema
@@ -100,9 +105,10 @@ def build_schema_from_DataFrame(data_config, expected_columns):
         schema_dict[column_name] = pa.Column(column_type,nullable=True, checks=value_range_checks)
 
         global_checks=[
-        pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."),
         pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found.")
         ]
+        if unique_rows:
+            global_checks.insert(0, pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."))
     
     return pa.DataFrameSchema(schema_dict, checks=global_checks)
    
@@ -151,5 +157,4 @@ def validate_data(schema, dataframe):
     if not isinstance(dataframe, pd.DataFrame):
         raise TypeError("dataframe must be a pandas data frame.")
     
-    schema.validate(dataframe, lazy=True)
-
+    return schema.validate(dataframe, lazy=True)
@@ -6,7 +6,13 @@ def cleanup_directories_at_end_of_session():
     # This code will run at the end of the pytest session
     yield
     # Code to delete directories goes here
-    for directory in ['tests/test_zip_data1', 'tests/test_zip_data2']:
+    for directory in ['tests/test_zip_data1', 'tests/test_zip_data2', 'tests/test_model_artifact1',
+                      'tests/test_tuning_cache1', 'tests/test_batch_predict1',
+                      'tests/test_numpy_predictor1', 'tests/test_prediction_cache1',
+                      'tests/test_prediction_cache2', 'tests/test_figure_rendering1', 'tests/test_pipeline_runner1',
+                      'tests/test_benchmarking1', 'tests/test_synthetic_data1',
+                      'tests/test_profiling1', 'tests/test_sharded_data1',
+                      'tests/test_drift_monitor1', 'tests/test_pipelined_ingest1']:
         try:
             shutil.rmtree(directory)
         except FileNotFoundError:
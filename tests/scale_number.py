@@ -0,0 +1,20 @@
+# scale_number.py
+# date: 2026-10-19
+# a toy stage for tests/test_pipeline_runner.py
+
+import click
+
+@click.command()
+@click.option('--input', type=str, help="Path to a file holding a number")
+@click.option('--output', type=str, help="Path to the file the scaled number will be written to")
+@click.option('--factor', type=float, help="The scale factor", default=2.0)
+
+def main(input, output, factor):
+    '''Multiplies the number in a file by a factor.'''
+    with open(input) as f:
+        number = float(f.read())
+    with open(output, 'w') as f:
+        f.write(str(number * factor))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+import pytest
+import os
+import threading
+import numpy as np
+import pandas as pd
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from sklearn import set_config
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_artifact import save_model_artifact, load_pipeline, update_model_metadata
+from src.batch_predict import (RAW_COLUMNS, read_chunks, predict_chunk, ordered_map, load_engine,
+                               init_worker, predict_in_worker)
+
+# Test files setup
+set_config(transform_output="pandas")
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').dropna()
+artifact_dir = 'tests/test_batch_predict1/cancer_pipeline'
+
+cancer_fit = make_pipeline(
+    make_column_transformer(
+        (StandardScaler(), make_column_selector(dtype_include='number')),
+        remainder='passthrough',
+        verbose_feature_names_out=False
+    ),
+    KNeighborsClassifier(n_neighbors=3)
+).fit(cleaned_data.drop(columns=['diagnosis']), cleaned_data['diagnosis'])
+save_model_artifact(cancer_fit, artifact_dir)
+
+# Tests
+
+# test read_chunks function throws an error
+# if the file does not exist or the chunk size is not positive
+def test_read_chunks_error_on_invalid_input():
+    with pytest.raises(FileNotFoundError, match='The input file does not exist.'):
+        next(read_chunks('tests/no_such_file.csv'))
+    with pytest.raises(ValueError, match="chunk_size must be a positive integer."):
+        next(read_chunks('tests/test_cleaned_data.csv', chunk_size=0))
+
+# test read_chunks names the columns of raw files like the cleaned data
+def test_read_chunks_raw():
+    chunks = list(read_chunks('tests/test_wdbc.data', chunk_size=4, raw=True))
+    raw = pd.read_csv('tests/test_wdbc.data', header=None)
+    assert all(chunk.shape[0] <= 4 for chunk in chunks)
+    assert sum(chunk.shape[0] for chunk in chunks) == raw.shape[0]
+    assert list(chunks[0].columns) == RAW_COLUMNS
+    assert set(RAW_COLUMNS[2:]) == set(cleaned_data.columns[1:])
+
+# test predict_chunk returns the id, prediction and class probabilities of every row
+def test_predict_chunk_matches_pipeline():
+    pipeline = load_pipeline(artifact_dir)
+    chunk = cleaned_data.assign(id=np.arange(cleaned_data.shape[0]))
+    predictions = predict_chunk(pipeline, chunk)
+    assert list(predictions.columns) == ['id', 'predicted', 'probability_Benign', 'probability_Malignant']
+    assert predictions.index.equals(chunk.index)
+    assert np.array_equal(predictions['predicted'], cancer_fit.predict(cleaned_data.drop(columns=['diagnosis'])))
+    assert np.allclose(predictions[['probability_Benign', 'probability_Malignant']].sum(axis=1), 1)
+
+# test predict_chunk applies the decision threshold saved in the model artifact
+def test_predict_chunk_applies_decision_threshold(tmp_path):
+    save_model_artifact(cancer_fit, tmp_path)
+    update_model_metadata(tmp_path, {'decision_threshold': {'pos_label': 'Malignant', 'threshold': 0.0}})
+    predictions = predict_chunk(load_pipeline(str(tmp_path)), cleaned_data)
+    assert (predictions['predicted'] == 'Malignant').all()
+
+# test load_engine function throws an error
+# on an unknown engine, or a pickle file for the numpy engine
+def test_load_engine_error_on_invalid_input():
+    with pytest.raises(ValueError, match="engine must be one of"):
+        load_engine(artifact_dir, engine='torch')
+    with pytest.raises(ValueError, match="The numpy engine requires a model artifact directory."):
+        load_engine('tests/test_cleaned_data.csv', engine='numpy')
+
+# test the numpy engine gives the same predictions as the scikit-learn engine
+def test_numpy_engine_matches_sklearn_engine():
+    chunk = next(read_chunks('tests/test_wdbc.data', raw=True))
+    sklearn_predictions = predict_chunk(load_engine(artifact_dir, 'sklearn'), chunk)
+    numpy_predictions = predict_chunk(load_engine(artifact_dir, 'numpy', tile_bytes=4096), chunk)
+    assert sklearn_predictions['predicted'].equals(numpy_predictions['predicted'])
+    assert np.allclose(sklearn_predictions.iloc[:, 2:], numpy_predictions.iloc[:, 2:])
+
+# test ordered_map yields results in input order
+# and never has more than max_pending items in flight
+def test_ordered_map_order_and_bound():
+    lock = threading.Lock()
+    read = []
+
+    def items():
+        for i in range(50):
+            with lock:
+                read.append(i)
+            yield i
+
+    results = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for result in ordered_map(lambda i: i * 2, items(), executor, max_pending=3):
+            assert len(read) - len(results) <= 3
+            results.append(result)
+    assert results == [i * 2 for i in range(50)]
+    with pytest.raises(ValueError, match="max_pending must be a positive integer."):
+        next(ordered_map(abs, [1], None, max_pending=0))
+
+# test scoring chunks on a process pool gives the same predictions, in order, as a single pass
+def test_process_pool_matches_single_pass():
+    chunks = read_chunks('tests/test_wdbc.data', chunk_size=3, raw=True)
+    with ProcessPoolExecutor(max_workers=2, initializer=init_worker, initargs=(artifact_dir,)) as executor:
+        pooled = pd.concat(ordered_map(predict_in_worker, chunks, executor, max_pending=4), ignore_index=True)
+    single = predict_chunk(load_pipeline(artifact_dir), next(read_chunks('tests/test_wdbc.data', chunk_size=1000, raw=True)))
+    assert pooled.equals(single.reset_index(drop=True))
@@ -0,0 +1,108 @@
+import pytest
+import os
+import json
+import numpy as np
+import pandas as pd
+import sys
+from click.testing import CliRunner
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.benchmarking import measure, resample_rows, write_results, read_results, compare_to_baseline
+from src.cli import load_command
+
+# Test files setup
+os.makedirs('tests/test_benchmarking1', exist_ok=True)
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv')
+numeric_columns = cleaned_data.select_dtypes('number').columns
+baseline = [
+    {'benchmark': 'clean', 'n_rows': 569, 'seconds': 1.0, 'peak_mb': 10.0},
+    {'benchmark': 'predict', 'n_rows': 569, 'seconds': 1.0, 'peak_mb': 10.0}
+]
+benchmark_options = ['--raw-data', 'tests/test_wdbc.data', '--name-file', 'tests/test_wdbc.names',
+                     '--data-config-file', 'data/processed/data_config.csv', '--size', '20',
+                     '--benchmark', 'clean', '--benchmark', 'validate', '--benchmark', 'predict']
+
+# Tests
+
+# test measure calls the function once traced plus once per repeat and reports time and memory
+def test_measure():
+    calls = []
+    measured = measure(lambda: calls.append(np.ones(2 ** 17)), repeats=2)
+    assert len(calls) == 3
+    assert measured['seconds'] >= 0
+    assert measured['peak_mb'] >= 1.0
+
+# test measure throws an error if repeats is not positive
+def test_measure_error_on_repeats():
+    with pytest.raises(ValueError, match="repeats must be a positive integer."):
+        measure(lambda: None, repeats=0)
+
+# test resample_rows draws unique rows within the value ranges of the data
+def test_resample_rows():
+    sample = resample_rows(cleaned_data, 1000, random_state=1)
+    assert sample.shape == (1000, cleaned_data.shape[1])
+    assert list(sample.columns) == list(cleaned_data.columns)
+    assert not sample.duplicated().any()
+    assert (sample[numeric_columns].min() >= cleaned_data[numeric_columns].min()).all()
+    assert (sample[numeric_columns].max() <= cleaned_data[numeric_columns].max()).all()
+    assert set(sample['diagnosis']) <= set(cleaned_data['diagnosis'])
+
+# test resample_rows is reproducible with a seed and renumbers the id column
+def test_resample_rows_seed_and_ids():
+    data = cleaned_data.assign(id=np.arange(cleaned_data.shape[0]) * 7)
+    pd.testing.assert_frame_equal(resample_rows(data, 50, random_state=3), resample_rows(data, 50, random_state=3))
+    assert list(resample_rows(data, 50, random_state=3)['id']) == list(range(1, 51))
+
+# test resample_rows throws errors on invalid arguments
+def test_resample_rows_errors():
+    with pytest.raises(TypeError, match="data must be a pandas data frame."):
+        resample_rows([1, 2], 10)
+    with pytest.raises(ValueError, match="n_rows must be a positive integer."):
+        resample_rows(cleaned_data, 0)
+    with pytest.raises(ValueError, match="data must have at least one row."):
+        resample_rows(cleaned_data.iloc[:0], 10)
+
+# test results written by write_results are read back, with the environment recorded
+def test_write_and_read_results():
+    path = 'tests/test_benchmarking1/results.json'
+    write_results(baseline, path)
+    assert read_results(path) == baseline
+    with open(path) as f:
+        assert {'python', 'cpu_count', 'numpy', 'pandas'} <= set(json.load(f)['environment'])
+
+# test read_results throws an error if the file does not exist
+def test_read_results_error_on_missing_file():
+    with pytest.raises(FileNotFoundError, match="The results file does not exist."):
+        read_results('tests/test_benchmarking1/missing.json')
+
+# test compare_to_baseline flags slowdowns and memory growth beyond the tolerance only
+def test_compare_to_baseline():
+    results = [
+        {'benchmark': 'clean', 'n_rows': 569, 'seconds': 1.2, 'peak_mb': 10.0},
+        {'benchmark': 'predict', 'n_rows': 569, 'seconds': 1.0, 'peak_mb': 13.0},
+        {'benchmark': 'predict', 'n_rows': 10000, 'seconds': 5.0, 'peak_mb': 50.0}
+    ]
+    comparison = compare_to_baseline(results, baseline, tolerance=0.25)
+    assert list(comparison['regression']) == [False, True, False]
+    assert comparison['time_ratio'].iloc[0] == pytest.approx(1.2)
+    assert comparison['memory_ratio'].iloc[1] == pytest.approx(1.3)
+    assert comparison['baseline_seconds'].isna().iloc[2]
+
+# test compare_to_baseline throws an error on a negative tolerance
+def test_compare_to_baseline_error_on_tolerance():
+    with pytest.raises(ValueError, match="tolerance must not be negative."):
+        compare_to_baseline(baseline, baseline, tolerance=-0.1)
+
+# test the benchmark script writes results, and fails when compared to a much faster baseline
+def test_pipeline_benchmarks_script():
+    main = load_command('benchmarks/pipeline_benchmarks.py')
+    path = 'tests/test_benchmarking1/baseline.json'
+    result = CliRunner().invoke(main, benchmark_options + ['--results-to', path])
+    assert result.exit_code == 0, result.output
+    results = read_results(path)
+    assert [(r['benchmark'], r['n_rows']) for r in results] == [('clean', 20), ('validate', 20), ('predict', 20)]
+
+    faster = [dict(r, seconds=r['seconds'] / 100) for r in results]
+    write_results(faster, path)
+    result = CliRunner().invoke(main, benchmark_options + ['--compare-to', path])
+    assert result.exit_code == 1
+    assert "Regressions over the baseline: clean (20 rows)" in result.output
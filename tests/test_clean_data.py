@@ -27,14 +27,53 @@ cleaned_data1 = pd.DataFrame({
         'mean_raius': [1, 2, 3]
     })
 cleaned_data2 = [1, 2, 3, 4, 5]
+
+# attribute sections in the layouts of the WPBC and original breast cancer .names files
+wpbc_lines = ['7. Attribute information', '1) ID number', '2) Outcome (R = recur, N = nonrecur)',
+              '3) Time (recurrence time if field 2 = R, disease-free time if', 'field 2\t= N)',
+              '4-33) Ten real-valued features are computed for each cell nucleus:',
+              'a) radius (mean of distances from center to points on the perimeter)',
+              'j) fractal dimension ("coastline approximation" - 1)',
+              '34) Tumor size - diameter of the excised tumor in centimeters',
+              '8. Missing attribute values:', 'Lymph node status is missing in 4 cases.']
+bcw_lines = ['7. Attribute Information: (class attribute has been moved to last column)',
+             '#  Attribute                     Domain', '-- -----------------------------------------',
+             '1. Sample code number            id number', '2. Uniformity of Cell Size       1 - 10',
+             '3. Class:                        (2 for benign, 4 for malignant)',
+             '8. Missing attribute values: 16']
 # setup empty directory for data files to be downloaded to
 if not os.path.exists('tests/test_write_data1'):
     os.makedirs('tests/test_write_data1')
 
 # Tests
 
+# Tests for extract_column_name
+
+# test extract_column_name expands the lettered features with the statistics, in their place
+def test_extract_column_name_wpbc_layout():
+    assert extract_column_name(wpbc_lines) == ['id_number', 'outcome', 'time', 'mean_radius', 'mean_fractal_dimension',
+                                               'se_radius', 'se_fractal_dimension', 'max_radius',
+                                               'max_fractal_dimension', 'tumor_size']
+
+# test extract_column_name reads attributes numbered with a dot and cuts off their domain
+def test_extract_column_name_bcw_layout():
+    assert extract_column_name(bcw_lines, statistics=None) == ['sample_code_number', 'uniformity_of_cell_size',
+                                                               'class']
+
+# test extract_column_name function throws an error
+# if the attribute information section is missing
+def test_extract_column_name_error_on_missing_section():
+    with pytest.raises(ValueError, match="The names file must have an attribute information section."):
+        extract_column_name(wpbc_lines[1:])
+
 # Tests for read_data
 
+# test read_data reads the given strings as missing values
+def test_read_data_na_values():
+    bcw = read_data('tests/test_bcw.data', ["col" + str(i) for i in range(11)], na_values=['?'])
+    assert bcw['col6'].isna().sum() == 1
+    assert bcw['col6'].dtype == float
+
 # test read_data function throws an error 
 # if the raw data file does not exist
 def test_read_data_error_on_missing_file():
@@ -81,6 +120,12 @@ def test_clean_data_error_on_wrong_relabel_format():
     with pytest.raises(TypeError, match="relabel must be a dictionary"):
         clean_data(imported_data1, drop_columns1, relabel2)
 
+# test clean_data relabels the given class column
+def test_clean_data_target():
+    cleaned = clean_data(pd.DataFrame({'id': [1, 2], 'class': [2, 4]}), ['id'], {2: 'Benign', 4: 'Malignant'},
+                         target='class')
+    assert cleaned['class'].tolist() == ['Benign', 'Malignant']
+
 # Tests for write_data
 
 # test write_data function throws an error
@@ -0,0 +1,65 @@
+import pytest
+import os
+import json
+import subprocess
+import sys
+from click.testing import CliRunner
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.cli import cli, COMMANDS, load_command
+
+# Test files setup
+# importing the CLI and loading every subcommand must stay well below the
+# time it takes to import pandas or scikit-learn (about 1 second)
+IMPORT_TIME_BUDGET = 0.5
+HEAVY_MODULES = ['numpy', 'pandas', 'sklearn', 'scipy', 'altair', 'pandera', 'requests']
+import_check = f"""
+import json, sys, time
+start = time.perf_counter()
+from src.cli import cli, COMMANDS
+for name in COMMANDS:
+    cli.get_command(None, name)
+print(json.dumps({{'seconds': time.perf_counter() - start,
+                  'heavy': [module for module in {HEAVY_MODULES!r} if module in sys.modules]}}))
+"""
+
+# Tests
+
+# test every subcommand is listed in the help and has its script
+def test_cli_lists_commands():
+    result = CliRunner().invoke(cli, ['--help'])
+    assert result.exit_code == 0
+    for name in COMMANDS:
+        assert name in result.output
+        assert os.path.exists(os.path.join('scripts', COMMANDS[name][0]))
+
+# test a subcommand's help shows the options of its script
+def test_cli_command_help():
+    result = CliRunner().invoke(cli, ['eda', '--help'])
+    assert result.exit_code == 0
+    assert '--processed-training-data' in result.output
+
+# test an unknown subcommand is an error
+def test_cli_unknown_command():
+    result = CliRunner().invoke(cli, ['nope'])
+    assert result.exit_code != 0
+    assert "No such command 'nope'" in result.output
+
+# test load_command throws an error if the script does not exist
+def test_load_command_error_on_missing_script():
+    with pytest.raises(FileNotFoundError, match="The script 'scripts/missing.py' does not exist."):
+        load_command('scripts/missing.py')
+
+# test loading the CLI and all its subcommands imports no heavy dependency and stays within the time budget
+def test_cli_import_time_budget():
+    result = subprocess.run([sys.executable, '-c', import_check], capture_output=True, text=True, check=True,
+                            cwd=os.path.join(os.path.dirname(__file__), '..'))
+    measured = json.loads(result.stdout)
+    assert measured['heavy'] == []
+    assert measured['seconds'] < IMPORT_TIME_BUDGET
+
+# test `python -m src` runs a subcommand
+def test_cli_module_entry_point():
+    result = subprocess.run([sys.executable, '-m', 'src', 'fit', '--help'], capture_output=True, text=True,
+                            cwd=os.path.join(os.path.dirname(__file__), '..'))
+    assert result.returncode == 0
+    assert result.stdout.startswith('Usage: python -m src fit')
@@ -0,0 +1,64 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.condense_data import condense_data
+
+# Test files setup
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').dropna()
+features = cleaned_data.drop(columns=['diagnosis'])
+X = (features - features.mean()) / features.std()
+y = cleaned_data['diagnosis']
+
+X_invalid = X.to_numpy()
+y_invalid = y.tolist()
+
+# Tests
+
+# test condense_data function throws an error
+# if X is not a dataframe
+def test_condense_data_error_on_wrong_X_format():
+    with pytest.raises(TypeError, match="X must be a pandas data frame."):
+        condense_data(X_invalid, y)
+
+# test condense_data function throws an error
+# if y is not a series
+def test_condense_data_error_on_wrong_y_format():
+    with pytest.raises(TypeError, match="y must be a pandas series."):
+        condense_data(X, y_invalid)
+
+# test condense_data function throws an error
+# if X and y have different lengths
+def test_condense_data_error_on_length_mismatch():
+    with pytest.raises(ValueError, match="X and y must have the same number of rows."):
+        condense_data(X, y.iloc[1:])
+
+# test condense_data function throws an error
+# if the method is not supported
+def test_condense_data_error_on_unknown_method():
+    with pytest.raises(ValueError, match="method must be one of"):
+        condense_data(X, y, method='random')
+
+# test every method returns a smaller reference set
+# with the input columns and every class still present
+@pytest.mark.parametrize("method", ['cnn', 'enn', 'enn+cnn', 'kmeans'])
+def test_condense_data_shrinks_reference_set(method):
+    X_condensed, y_condensed = condense_data(X, y, method=method, n_prototypes=5, random_state=1)
+    assert X_condensed.shape[0] == y_condensed.shape[0]
+    assert X_condensed.shape[0] < X.shape[0]
+    assert list(X_condensed.columns) == list(X.columns)
+    assert set(y_condensed) == set(y)
+
+# test the condensed subset classifies every training observation correctly with 1-nn
+def test_condense_data_cnn_is_consistent():
+    X_condensed, y_condensed = condense_data(X, y, method='cnn', random_state=1)
+    distances = ((X.to_numpy()[:, None, :] - X_condensed.to_numpy()[None, :, :]) ** 2).sum(axis=2)
+    predicted = y_condensed.to_numpy()[distances.argmin(axis=1)]
+    assert np.array_equal(predicted, y.to_numpy())
+
+# test the kmeans method keeps n_prototypes rows per class
+def test_condense_data_kmeans_prototypes_per_class():
+    X_condensed, y_condensed = condense_data(X, y, method='kmeans', n_prototypes=5, random_state=1)
+    assert (y_condensed.value_counts() == 5).all()
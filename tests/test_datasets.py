@@ -0,0 +1,31 @@
+import pytest
+import os
+import sys
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.datasets import DATASETS, get_dataset
+from src.prepare_data import read_column_names
+
+# Tests
+
+# test get_dataset returns the spec of a data set of the archive
+def test_get_dataset():
+    assert get_dataset('wpbc') is DATASETS['wpbc']
+    assert get_dataset('wdbc').positive_label == 'Malignant'
+
+# test get_dataset throws an error on an unknown data set
+def test_get_dataset_error_on_unknown_name():
+    with pytest.raises(ValueError, match="Unknown dataset 'wisconsin'"):
+        get_dataset('wisconsin')
+
+# test the data configuration of every data set has the columns left after cleaning,
+# and its class labels are the relabeled classes
+@pytest.mark.parametrize("name", list(DATASETS))
+def test_dataset_specs_match_names_files(name):
+    dataset = DATASETS[name]
+    colnames = read_column_names(os.path.join('data/raw', dataset.name_file), dataset.statistics)
+    data_config = pd.read_csv(dataset.data_config_file)
+    assert set(data_config['column']) == set(colnames) - set(dataset.drop_columns)
+    target = data_config.set_index('column').loc[dataset.target]
+    assert set(target['category'].split(',')) == set(dataset.relabel.values())
+    assert dataset.positive_label in dataset.relabel.values()
@@ -0,0 +1,117 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.drift_monitor import DriftMonitor, merge_moments, population_stability_index
+
+# Test files setup
+work_dir = 'tests/test_drift_monitor1'
+os.makedirs(work_dir, exist_ok=True)
+data_config = pd.read_csv('tests/test_data_config.csv')
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv')
+training_data = cleaned_data.iloc[:60]
+scored_data = cleaned_data.iloc[60:].reset_index(drop=True)
+
+# Tests
+
+# test merging the moments of batches gives the mean and variance of all the data
+def test_merge_moments():
+    values = np.random.default_rng(0).normal(1e6, 1, size=1000)
+    count, mean, m2 = np.zeros(1), np.zeros(1), np.zeros(1)
+    for batch in np.array_split(values, 7):
+        count, mean, m2 = merge_moments(count, mean, m2, np.array([batch.size]), np.array([batch.mean()]),
+                                        np.array([((batch - batch.mean()) ** 2).sum()]))
+    assert count[0] == 1000
+    assert mean[0] == pytest.approx(values.mean())
+    assert m2[0] / (count[0] - 1) == pytest.approx(values.var(ddof=1))
+
+# test the PSI is 0 for the same proportions and grows with the shift
+def test_population_stability_index():
+    assert population_stability_index([10, 20, 30], [1, 2, 3]) == pytest.approx(0)
+    assert 0 < population_stability_index([10, 10], [9, 11]) < population_stability_index([10, 10], [2, 18])
+    # an empty bin does not make it infinite
+    assert np.isfinite(population_stability_index([10, 10], [0, 20]))
+
+# test the training profile holds the moments of the numeric features in the data configuration
+def test_from_training_data():
+    monitor = DriftMonitor.from_training_data(training_data, data_config, n_bins=5)
+    assert monitor.features == training_data.drop(columns=['diagnosis']).columns.tolist()
+    assert monitor.edges.shape == (30, 4)
+    features = training_data[monitor.features]
+    np.testing.assert_allclose(monitor.reference['count'], features.count())
+    np.testing.assert_allclose(monitor.reference['mean'], features.mean())
+    np.testing.assert_allclose(monitor.reference['m2'] / (monitor.reference['count'] - 1), features.var())
+    # quantile bins hold about the same share of the training data
+    assert (monitor.reference['bin_counts'] >= 10).all()
+    assert (monitor.current['count'] == 0).all()
+
+# test updating batch by batch gives the statistics of all the scored data, and no drift for similar data
+def test_update_and_report():
+    monitor = DriftMonitor.from_training_data(training_data, data_config, n_bins=5)
+    for start in range(0, scored_data.shape[0], 11):
+        monitor.update(scored_data.iloc[start:start + 11])
+    report = monitor.report()
+    features = scored_data[monitor.features]
+    np.testing.assert_allclose(report['count'], features.count())
+    np.testing.assert_allclose(report['mean'], features.mean())
+    np.testing.assert_allclose(report['std'], features.std())
+    np.testing.assert_allclose(report['min'], features.min())
+    np.testing.assert_allclose(report['reference_mean'], training_data[monitor.features].mean())
+    assert (report['psi'] < 0.5).all()
+    assert not report['out_of_range'].any()
+
+# test shifted features pass the PSI threshold and values outside the configured range are flagged
+def test_report_flags_drift():
+    monitor = DriftMonitor.from_training_data(training_data, data_config)
+    shifted = scored_data.assign(mean_texture=scored_data['mean_texture'] + 10)
+    shifted.loc[0, 'mean_radius'] = 45.0
+    monitor.update(shifted)
+    report = monitor.report(psi_threshold=0.2)
+    assert report.loc['mean_texture', 'psi_drift']
+    assert report.loc['mean_texture', 'mean_shift'] > 1
+    assert report.loc['mean_radius', 'above_range'] == 1
+    assert report.loc['mean_radius', 'out_of_range']
+    assert monitor.drifted_features() == report.index[report['drift']].tolist()
+    assert 'mean_texture' in monitor.drifted_features()
+    monitor.reset()
+    assert (monitor.report()['count'] == 0).all()
+    assert monitor.report()['psi'].isna().all()
+
+# test missing values are counted but left out of the moments
+def test_update_with_missing_values():
+    monitor = DriftMonitor.from_training_data(training_data, data_config)
+    batch = scored_data.copy()
+    batch.loc[:4, 'mean_area'] = np.nan
+    monitor.update(batch)
+    report = monitor.report()
+    assert report.loc['mean_area', 'missing'] == 5
+    assert report.loc['mean_area', 'count'] == scored_data.shape[0] - 5
+    assert report.loc['mean_area', 'mean'] == pytest.approx(batch['mean_area'].mean())
+
+# test save and load keep the reference and the running statistics
+def test_save_and_load():
+    monitor = DriftMonitor.from_training_data(training_data, data_config)
+    monitor.update(scored_data.iloc[:10])
+    path = os.path.join(work_dir, 'state', 'drift.json')
+    monitor.save(path)
+    loaded = DriftMonitor.load(path)
+    pd.testing.assert_frame_equal(loaded.report(), monitor.report())
+    loaded.update(scored_data.iloc[10:])
+    monitor.update(scored_data.iloc[10:])
+    pd.testing.assert_frame_equal(loaded.report(), monitor.report())
+
+# test the monitor throws errors on invalid inputs
+def test_drift_monitor_errors():
+    with pytest.raises(TypeError, match="must be pandas data frames"):
+        DriftMonitor.from_training_data(training_data.to_numpy(), data_config)
+    with pytest.raises(ValueError, match="n_bins must be at least 2."):
+        DriftMonitor.from_training_data(training_data, data_config, n_bins=1)
+    with pytest.raises(ValueError, match="no numeric column"):
+        DriftMonitor.from_training_data(training_data[['diagnosis']], data_config)
+    monitor = DriftMonitor.from_training_data(training_data, data_config)
+    with pytest.raises(ValueError, match="The batch is missing features: mean_radius."):
+        monitor.update(scored_data.drop(columns=['mean_radius']))
+    with pytest.raises(FileNotFoundError):
+        DriftMonitor.load(os.path.join(work_dir, 'missing.json'))
@@ -0,0 +1,148 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+import sys
+from sklearn.metrics import accuracy_score, confusion_matrix, fbeta_score, precision_recall_fscore_support
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.evaluation_metrics import (encode_labels, confusion_counts, fbeta_from_counts,
+                                    scores_from_counts, per_class_scores, confusion_matrix_frame,
+                                    accumulate_confusion_counts, bootstrap_confusion_counts, bootstrap_scores,
+                                    threshold_sweep)
+
+# Test files setup
+labels = ['Benign', 'Malignant']
+rng = np.random.default_rng(524)
+y_true = rng.choice(labels, size=500, p=[0.6, 0.4])
+y_pred = np.where(rng.random(500) < 0.85, y_true, rng.choice(labels, size=500))
+
+# Tests
+
+# test encode_labels function throws an error
+# if the values contain unknown labels
+def test_encode_labels_error_on_unknown_label():
+    with pytest.raises(ValueError, match="values contains labels that are not in labels."):
+        encode_labels(['Benign', 'benign'], labels)
+
+# test confusion_counts function throws an error
+# if y_true and y_pred have different lengths
+def test_confusion_counts_error_on_length_mismatch():
+    with pytest.raises(ValueError, match="y_true and y_pred must have the same length."):
+        confusion_counts(y_true, y_pred[1:], labels)
+
+# test scores_from_counts function throws an error
+# if pos_label is not one of the labels
+def test_scores_from_counts_error_on_unknown_pos_label():
+    with pytest.raises(ValueError, match="pos_label must be one of the labels."):
+        scores_from_counts(confusion_counts(y_true, y_pred, labels), labels, pos_label='M')
+
+# test confusion_counts matches scikit-learn's confusion matrix
+def test_confusion_counts_matches_sklearn():
+    counts = confusion_counts(y_true, y_pred, labels)
+    assert counts.dtype == np.int64
+    assert np.array_equal(counts, confusion_matrix(y_true, y_pred, labels=labels))
+
+# test scores_from_counts matches scikit-learn's accuracy and F2 score
+def test_scores_from_counts_matches_sklearn():
+    scores = scores_from_counts(confusion_counts(y_true, y_pred, labels), labels, 'Malignant', beta=2)
+    assert scores['accuracy'] == pytest.approx(accuracy_score(y_true, y_pred))
+    assert scores['fbeta'] == pytest.approx(fbeta_score(y_true, y_pred, beta=2, pos_label='Malignant'))
+
+# test per_class_scores matches scikit-learn's per-class precision, recall and F2 score
+def test_per_class_scores_matches_sklearn():
+    scores = per_class_scores(confusion_counts(y_true, y_pred, labels), labels, beta=2)
+    precision, recall, fbeta, support = precision_recall_fscore_support(y_true, y_pred, beta=2, labels=labels)
+    assert np.allclose(scores['precision'], precision)
+    assert np.allclose(scores['recall'], recall)
+    assert np.allclose(scores['F2 score'], fbeta)
+    assert np.array_equal(scores['support'], support)
+
+# test a class that is never predicted scores 0 instead of dividing by zero
+def test_scores_with_zero_division():
+    counts = confusion_counts(['Benign', 'Malignant'], ['Benign', 'Benign'], labels)
+    assert scores_from_counts(counts, labels)['fbeta'] == 0
+    assert per_class_scores(counts, labels).loc['Malignant', 'precision'] == 0
+
+# test fbeta_from_counts works element-wise on arrays of counts
+def test_fbeta_from_counts_vectorized():
+    scores = fbeta_from_counts(np.array([10, 0]), np.array([2, 0]), np.array([1, 0]), beta=2)
+    assert scores[0] == pytest.approx(5 * 10 / (5 * 10 + 4 * 1 + 2))
+    assert scores[1] == 0
+
+# test confusion_matrix_frame has the same layout as pandas.crosstab
+def test_confusion_matrix_frame_matches_crosstab():
+    frame = confusion_matrix_frame(confusion_counts(y_true, y_pred, labels), labels)
+    crosstab = pd.crosstab(pd.Series(y_true, name='class'), pd.Series(y_pred, name='predicted'))
+    assert frame.equals(crosstab.astype(np.int64))
+
+# test accumulating counts over chunks gives the same counts as a single pass,
+# and each chunk is predicted exactly once
+def test_accumulate_confusion_counts_matches_single_pass():
+    data = pd.DataFrame({'class': y_true, 'predicted': y_pred})
+    predicted_rows = []
+
+    def predict(features):
+        predicted_rows.append(features.shape[0])
+        return features['predicted'].to_numpy()
+
+    chunks = (data.iloc[start:start + 64] for start in range(0, data.shape[0], 64))
+    counts = accumulate_confusion_counts(chunks, predict, labels)
+    assert np.array_equal(counts, confusion_counts(y_true, y_pred, labels))
+    assert sum(predicted_rows) == data.shape[0]
+
+# test bootstrap functions throw an error
+# on invalid replicate counts, confidence levels or empty counts
+def test_bootstrap_error_on_invalid_arguments():
+    counts = confusion_counts(y_true, y_pred, labels)
+    with pytest.raises(ValueError, match="n_replicates must be a positive integer."):
+        bootstrap_confusion_counts(counts, n_replicates=0)
+    with pytest.raises(ValueError, match="counts must contain at least one observation."):
+        bootstrap_confusion_counts(np.zeros((2, 2), dtype=np.int64))
+    with pytest.raises(ValueError, match="confidence_level must be between 0 and 1."):
+        bootstrap_scores(counts, labels, confidence_level=95)
+
+# test every bootstrap replicate resamples the same number of rows
+# and replicates are reproducible for a given seed
+def test_bootstrap_confusion_counts_replicates():
+    counts = confusion_counts(y_true, y_pred, labels)
+    replicates = bootstrap_confusion_counts(counts, n_replicates=2000, random_state=1)
+    assert replicates.shape == (2000, 2, 2)
+    assert (replicates.sum(axis=(1, 2)) == len(y_true)).all()
+    assert np.allclose(replicates.mean(axis=0), counts, rtol=0.05)
+    assert np.array_equal(replicates, bootstrap_confusion_counts(counts, n_replicates=2000, random_state=1))
+
+# test the bootstrap intervals contain the point estimates
+# and agree with a naive row-resampling bootstrap
+def test_bootstrap_scores_intervals():
+    counts = confusion_counts(y_true, y_pred, labels)
+    intervals = bootstrap_scores(counts, labels, 'Malignant', beta=2, n_replicates=4000, random_state=1)
+    assert list(intervals.index) == ['accuracy', 'fbeta']
+    assert (intervals['lower'] <= intervals['estimate']).all()
+    assert (intervals['estimate'] <= intervals['upper']).all()
+
+    naive_rng = np.random.default_rng(2)
+    naive = []
+    for _ in range(1000):
+        index = naive_rng.integers(0, len(y_true), len(y_true))
+        naive.append(accuracy_score(y_true[index], y_pred[index]))
+    assert intervals.loc['accuracy', 'lower'] == pytest.approx(np.quantile(naive, 0.025), abs=0.01)
+    assert intervals.loc['accuracy', 'upper'] == pytest.approx(np.quantile(naive, 0.975), abs=0.01)
+
+# test threshold_sweep function throws an error
+# if y_true and scores have different lengths or are empty
+def test_threshold_sweep_error_on_invalid_input():
+    with pytest.raises(ValueError, match="y_true and scores must have the same length."):
+        threshold_sweep(y_true, np.zeros(3))
+    with pytest.raises(ValueError, match="y_true must contain at least one observation."):
+        threshold_sweep([], [])
+
+# test the sort-and-cumsum sweep matches thresholding every candidate separately
+def test_threshold_sweep_matches_brute_force():
+    scores = np.round(rng.random(len(y_true)) * 0.6 + (y_true == 'Malignant') * 0.4, 1)
+    sweep = threshold_sweep(y_true, scores, 'Malignant', beta=2)
+    assert sweep['threshold'].tolist() == sorted(set(scores), reverse=True)
+    for _, row in sweep.iterrows():
+        predicted = np.where(scores >= row['threshold'], 'Malignant', 'Benign')
+        counts = confusion_counts(y_true, predicted, labels)
+        assert [row['tn'], row['fp'], row['fn'], row['tp']] == counts.ravel().tolist()
+        assert row['F2 score'] == pytest.approx(fbeta_score(y_true, predicted, beta=2, pos_label='Malignant'))
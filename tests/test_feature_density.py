@@ -0,0 +1,57 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+import sys
+from scipy.stats import gaussian_kde
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_density import kde_bandwidth, kde_on_grid, feature_densities
+
+# Test files setup
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').dropna()
+rng = np.random.default_rng(524)
+values = rng.normal(size=(300, 3)) * [1, 2, 0.5]
+
+# Tests
+
+# test feature_densities function throws an error
+# on a wrong input type, missing class column, non-numeric features or too few points
+def test_feature_densities_error_on_invalid_input():
+    with pytest.raises(TypeError, match="dataframe must be a pandas data frame."):
+        feature_densities([1, 2, 3])
+    with pytest.raises(ValueError, match="The class column 'class' is not in the data frame."):
+        feature_densities(cleaned_data)
+    with pytest.raises(ValueError, match="All feature columns must be numeric."):
+        feature_densities(cleaned_data.assign(text='a'), target='diagnosis')
+    with pytest.raises(ValueError, match="n_points must be at least 2."):
+        feature_densities(cleaned_data, target='diagnosis', n_points=1)
+
+# test kde_bandwidth follows the Vega-Lite rule of thumb and its fallbacks
+def test_kde_bandwidth():
+    q1, q3 = np.quantile(values, [0.25, 0.75], axis=0)
+    expected = 1.06 * np.minimum(values.std(axis=0, ddof=1), (q3 - q1) / 1.34) * 300 ** -0.2
+    assert np.allclose(kde_bandwidth(values), expected)
+    constant = np.column_stack([np.full(10, 3.0), np.zeros(10)])
+    assert np.allclose(kde_bandwidth(constant), 1.06 * np.array([3.0, 1.0]) * 10 ** -0.2)
+
+# test kde_on_grid matches scipy's Gaussian KDE, whatever the chunk size
+@pytest.mark.parametrize("chunk_size", [1000, 7])
+def test_kde_on_grid_matches_scipy(chunk_size):
+    bandwidth = kde_bandwidth(values)
+    grid = np.linspace(values.min(axis=0), values.max(axis=0), 50)
+    density = kde_on_grid(values, grid, bandwidth, chunk_size)
+    for column in range(values.shape[1]):
+        kde = gaussian_kde(values[:, column], bw_method=bandwidth[column] / values[:, column].std(ddof=1))
+        assert np.allclose(density[:, column], kde(grid[:, column]))
+
+# test feature_densities has one grid point per class, feature and step,
+# and its size does not depend on the number of observations
+def test_feature_densities_shape():
+    densities = feature_densities(cleaned_data, target='diagnosis', n_points=50)
+    n_features = cleaned_data.shape[1] - 1
+    assert list(densities.columns) == ['diagnosis', 'predictor', 'value', 'density']
+    assert densities.shape[0] == 2 * n_features * 50
+    assert set(densities['predictor']) == set(cleaned_data.columns[1:])
+    assert (densities['density'] >= 0).all()
+    repeated = pd.concat([cleaned_data] * 5, ignore_index=True)
+    assert feature_densities(repeated, target='diagnosis', n_points=50).shape == densities.shape
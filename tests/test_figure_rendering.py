@@ -0,0 +1,68 @@
+import pytest
+import os
+import json
+import altair as alt
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.figure_rendering import chart_spec, spec_hash, is_up_to_date, render_figures
+
+# Test files setup
+plot_dir = 'tests/test_figure_rendering1'
+os.makedirs(plot_dir, exist_ok=True)
+data = pd.DataFrame({'x': [1, 2, 3], 'y': [3, 1, 2]})
+line = alt.Chart(data, width=50, height=50).mark_line().encode(x='x', y='y')
+points = alt.Chart(data, width=50, height=50).mark_point().encode(x='x', y='y')
+
+# Tests
+
+# test spec_hash changes with the chart data and the scale factor, and not otherwise
+def test_spec_hash():
+    spec = chart_spec(line)
+    assert spec_hash(spec) == spec_hash(chart_spec(line))
+    assert spec_hash(spec) != spec_hash(spec, scale_factor=1.0)
+    assert spec_hash(spec) != spec_hash(chart_spec(line.properties(data=data.assign(y=[3, 1, 1]))))
+
+# test chart_spec keeps data sets larger than altair's default row limit
+def test_chart_spec_no_row_limit():
+    large = alt.Chart(pd.DataFrame({'x': range(6000)})).mark_tick().encode(x='x')
+    spec = chart_spec(large)
+    assert len(spec['datasets'][spec['data']['name']]) == 6000
+
+# test render_figures writes the same PNG as chart.save and records its hashes
+def test_render_figures_matches_save():
+    path = os.path.join(plot_dir, 'line.png')
+    assert render_figures({path: line}) == {path: True}
+    line.save(os.path.join(plot_dir, 'saved.png'), scale_factor=2.0)
+    with open(path, 'rb') as rendered, open(os.path.join(plot_dir, 'saved.png'), 'rb') as saved:
+        assert rendered.read() == saved.read()
+    with open(path + '.hash.json') as f:
+        assert json.load(f)['spec'] == spec_hash(chart_spec(line))
+
+# test render_figures skips up to date figures and re-renders changed charts or PNGs
+def test_render_figures_skips_up_to_date():
+    path = os.path.join(plot_dir, 'skip.png')
+    render_figures({path: line})
+    assert render_figures({path: line}) == {path: False}
+    assert render_figures({path: points}) == {path: True}
+    with open(path, 'ab') as f:
+        f.write(b'changed')
+    assert not is_up_to_date(path, spec_hash(chart_spec(points)))
+    assert render_figures({path: points}) == {path: True}
+    os.remove(path + '.hash.json')
+    assert render_figures({path: points}) == {path: True}
+
+# test render_figures renders several charts in a process pool like it does in this process
+def test_render_figures_in_pool():
+    serial = {os.path.join(plot_dir, f'serial_{name}.png'): chart for name, chart in [('a', line), ('b', points)]}
+    pooled = {os.path.join(plot_dir, f'pooled_{name}.png'): chart for name, chart in [('a', line), ('b', points)]}
+    render_figures(serial)
+    assert render_figures(pooled, n_jobs=2) == {path: True for path in pooled}
+    for serial_path, pooled_path in zip(serial, pooled):
+        with open(serial_path, 'rb') as a, open(pooled_path, 'rb') as b:
+            assert a.read() == b.read()
+
+# test render_figures throws an error for a non-positive number of jobs
+def test_render_figures_error_on_invalid_n_jobs():
+    with pytest.raises(ValueError, match="n_jobs must be a positive integer."):
+        render_figures({}, n_jobs=0)
@@ -0,0 +1,225 @@
+import pytest
+import os
+import json
+import threading
+import urllib.error
+import urllib.request
+import numpy as np
+import pandas as pd
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from sklearn import set_config
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_artifact import save_model_artifact, load_pipeline
+from src.inference_server import Histogram, MicroBatcher, parse_rows, make_server
+from src.drift_monitor import DriftMonitor
+
+# Test files setup
+set_config(transform_output="pandas")
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').dropna()
+features = cleaned_data.drop(columns=['diagnosis'])
+
+cancer_fit = make_pipeline(
+    make_column_transformer(
+        (StandardScaler(), make_column_selector(dtype_include='number')),
+        remainder='passthrough',
+        verbose_feature_names_out=False
+    ),
+    KNeighborsClassifier(n_neighbors=3)
+).fit(features, cleaned_data['diagnosis'])
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    return json.loads(urllib.request.urlopen(request).read())
+
+# Tests
+
+# test Histogram reports cumulative bucket counts
+def test_histogram_snapshot():
+    histogram = Histogram([1, 10])
+    for value in [0.5, 1, 5, 50]:
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 4
+    assert snapshot['sum'] == 56.5
+    assert snapshot['buckets'] == [{'le': 1, 'count': 2}, {'le': 10, 'count': 3}, {'le': '+Inf', 'count': 4}]
+
+# test MicroBatcher throws an error on invalid batching parameters
+def test_micro_batcher_error_on_invalid_parameters():
+    with pytest.raises(ValueError, match="max_batch_size must be a positive integer."):
+        MicroBatcher(len, max_batch_size=0)
+    with pytest.raises(ValueError, match="max_wait must not be negative."):
+        MicroBatcher(len, max_wait=-1)
+
+# test MicroBatcher scores concurrent requests together, never exceeding
+# max_batch_size, and answers each request with its own rows
+def test_micro_batcher_coalesces_requests():
+    batch_sizes = []
+
+    def predict(rows):
+        batch_sizes.append(rows.shape[0])
+        return rows * 2
+
+    batcher = MicroBatcher(predict, max_batch_size=4, max_wait=0.5)
+    futures = [batcher.submit(pd.DataFrame({'x': [i]})) for i in range(10)]
+    results = [future.result(timeout=5) for future in futures]
+    batcher.close()
+    assert [result['x'].tolist() for result in results] == [[i * 2] for i in range(10)]
+    assert batch_sizes == [4, 4, 2]
+    assert batcher.batch_sizes.snapshot()['count'] == 3
+
+# test a failed batch sets the error on every request in the batch
+def test_micro_batcher_propagates_errors():
+    def predict(rows):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(predict, max_batch_size=2, max_wait=0.5)
+    futures = [batcher.submit(pd.DataFrame({'x': [i]})) for i in range(2)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model failed"):
+            future.result(timeout=5)
+    batcher.close()
+
+# test parse_rows function throws an error
+# on malformed bodies, missing features or non-numeric values
+def test_parse_rows_error_on_invalid_payload():
+    with pytest.raises(ValueError, match="must be a JSON object or a non-empty list"):
+        parse_rows([], ['a'])
+    with pytest.raises(ValueError, match="Missing features: b."):
+        parse_rows([{'a': 1}, {'a': 2, 'b': 3}], ['a', 'b'])
+    for value in ['x', '12.3', None, True, float('nan'), float('inf'), 10 ** 400]:
+        with pytest.raises(ValueError, match="Feature values must be finite numbers"):
+            parse_rows({'a': value}, ['a'])
+    assert parse_rows({'a': 1, 'b': 2.5}, ['a', 'b']).dtypes.tolist() == [np.float64, np.float64]
+
+# test the server answers concurrent single-row requests with the pipeline's
+# predictions, batches them, and records latency for every request
+def test_server_predicts_concurrent_requests():
+    server = make_server(cancer_fit, port=0, max_batch_size=16, max_wait=0.05)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        rows = features.to_dict(orient='records')
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda row: post(url + '/predict', row), rows))
+        assert [response['predicted'] for response in responses] == cancer_fit.predict(features).tolist()
+        assert len(post(url + '/predict', rows[:3])) == 3
+
+        metrics = json.loads(urllib.request.urlopen(url + '/metrics').read())
+        assert metrics['request_latency_ms']['count'] == len(rows) + 1
+        assert metrics['batch_size']['count'] < len(rows) + 1
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            post(url + '/predict', {'mean_radius': 1})
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+
+# test an invalid request sent alongside a valid one is rejected on its own
+def test_server_isolates_invalid_requests():
+    server = make_server(cancer_fit, port=0, max_batch_size=16, max_wait=0.2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    def status(row):
+        try:
+            post(url + '/predict', row)
+            return 200
+        except urllib.error.HTTPError as error:
+            return error.code
+
+    try:
+        valid = features.iloc[0].to_dict()
+        invalid = dict(valid, mean_radius=None)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(status, [valid, invalid])) == [200, 400]
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+
+# test the batcher scores each request on its own when the batch fails, so only the failing request errors
+def test_micro_batcher_isolates_failing_requests():
+    def predict(rows):
+        if rows['a'].isna().any():
+            raise ValueError("Input contains NaN.")
+        return rows.assign(predicted=rows['a'] * 2)
+
+    batcher = MicroBatcher(predict, max_batch_size=2, max_wait=1)
+    valid = batcher.submit(pd.DataFrame({'a': [1.0]}))
+    invalid = batcher.submit(pd.DataFrame({'a': [np.nan]}))
+    assert valid.result(timeout=5)['predicted'].tolist() == [2.0]
+    with pytest.raises(ValueError, match="NaN"):
+        invalid.result(timeout=5)
+    batcher.close()
+
+# test rows are added to the drift monitor once, and only if they were scored, when a batch fails
+def test_server_drift_monitor_counts_scored_rows_once():
+    class FailingOnLargeRadius:
+        # scores like the pipeline, but fails on rows with a mean radius over 100
+        classes_ = cancer_fit.classes_
+        feature_names_in_ = cancer_fit.feature_names_in_
+
+        def predict_proba(self, rows):
+            if (rows['mean_radius'] > 100).any():
+                raise ValueError("Radius out of range.")
+            return cancer_fit.predict_proba(rows)
+
+    monitor = DriftMonitor.from_training_data(features, pd.read_csv('tests/test_data_config.csv'))
+    server = make_server(FailingOnLargeRadius(), port=0, max_batch_size=3, max_wait=1, drift_monitor=monitor)
+    try:
+        rows = features.iloc[:3].reset_index(drop=True)
+        futures = [server.batcher.submit(rows.iloc[[0]]), server.batcher.submit(rows.iloc[[1]].assign(mean_radius=500.0)),
+                   server.batcher.submit(rows.iloc[[2]])]
+        assert futures[0].result(timeout=5).shape[0] == 1
+        with pytest.raises(ValueError, match="Radius out of range."):
+            futures[1].result(timeout=5)
+        assert futures[2].result(timeout=5).shape[0] == 1
+        assert (monitor.report()['count'] == 2).all()
+    finally:
+        server.server_close()
+        server.batcher.close()
+
+# test the server serves repeated rows from the prediction cache and reports its counters
+def test_server_with_prediction_cache(tmp_path):
+    save_model_artifact(cancer_fit, tmp_path)
+    server = make_server(load_pipeline(str(tmp_path)), port=0, max_wait=0, cache_size=100)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        rows = features.iloc[:5].to_dict(orient='records')
+        first = post(url + '/predict', rows)
+        assert post(url + '/predict', rows) == first
+        cache = json.loads(urllib.request.urlopen(url + '/metrics').read())['cache']
+        assert cache['misses'] == 5
+        assert cache['hits'] == 5
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+
+# test the server merges served rows into the drift monitor and reports drifted features
+def test_server_with_drift_monitor():
+    monitor = DriftMonitor.from_training_data(features, pd.read_csv('tests/test_data_config.csv'))
+    server = make_server(cancer_fit, port=0, max_wait=0, drift_monitor=monitor)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        rows = features.iloc[:20].assign(mean_radius=45.0).to_dict(orient='records')
+        post(url + '/predict', rows)
+        drift = json.loads(urllib.request.urlopen(url + '/metrics').read())['drift']
+        assert drift['rows'] == 20
+        assert 'mean_radius' in drift['drifted_features']
+        assert set(drift['psi']) == set(monitor.features)
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
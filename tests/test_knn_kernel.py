@@ -0,0 +1,62 @@
+import pytest
+import os
+import numpy as np
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.knn_kernel import squared_norms, tile_shape, gemm_kneighbors
+
+# Test files setup
+rng = np.random.default_rng(524)
+reference = rng.normal(size=(300, 8))
+queries = rng.normal(size=(500, 8))
+exact_squared = ((queries[:, np.newaxis, :] - reference[np.newaxis, :, :]) ** 2).sum(axis=2)
+exact_indices = np.argsort(exact_squared, axis=1, kind='stable')[:, :5]
+exact_distances = np.sqrt(np.take_along_axis(exact_squared, exact_indices, axis=1))
+
+# Tests
+
+# test gemm_kneighbors function throws an error
+# if n_neighbors is out of range or the feature counts differ
+def test_gemm_kneighbors_error_on_invalid_input():
+    with pytest.raises(ValueError, match="n_neighbors must be between 1 and the number of reference rows."):
+        gemm_kneighbors(queries, reference, 301)
+    with pytest.raises(ValueError, match="X and reference must have the same number of features."):
+        gemm_kneighbors(queries[:, 1:], reference, 5)
+
+# test tile_shape keeps a tile within the memory budget
+# and uses the whole reference set when it fits
+def test_tile_shape_respects_budget():
+    assert tile_shape(10 ** 6, 400, 4, tile_bytes=2 ** 24) == (2 ** 20 // 404, 400)
+    rows, cols = tile_shape(10 ** 6, 10 ** 6, 4, tile_bytes=2 ** 20)
+    assert rows * (cols + 4) * 16 <= 2 ** 20
+    assert tile_shape(10, 400, 4) == (10, 400)
+    assert tile_shape(10, 400, 4, tile_bytes=1) == (1, 1)
+
+# test squared_norms returns float64 row norms
+def test_squared_norms():
+    norms = squared_norms(reference.astype(np.float32))
+    assert norms.dtype == np.float64
+    assert np.allclose(norms, (reference ** 2).sum(axis=1), rtol=1e-6)
+
+# test the tiled kernel finds the same neighbours as exact brute force,
+# whether the query and reference rows fit in one tile or are split over many
+@pytest.mark.parametrize("tile_bytes", [2 ** 24, 2 ** 16, 2 ** 10])
+def test_gemm_kneighbors_matches_brute_force(tile_bytes):
+    distances, indices = gemm_kneighbors(queries, reference, 5, tile_bytes=tile_bytes)
+    assert np.array_equal(indices, exact_indices)
+    assert np.allclose(distances, exact_distances)
+    assert (np.diff(distances, axis=1) >= 0).all()
+
+# test float32 rows are upcast and precomputed norms give the same result
+def test_gemm_kneighbors_float32_and_precomputed_norms():
+    reference32 = reference.astype(np.float32)
+    distances, indices = gemm_kneighbors(queries.astype(np.float32), reference32, 5,
+                                         reference_norms=squared_norms(reference32))
+    assert distances.dtype == np.float64
+    assert np.array_equal(indices, exact_indices)
+
+# test an exact duplicate of a reference row is at distance 0
+def test_gemm_kneighbors_duplicate_rows():
+    distances, indices = gemm_kneighbors(reference[:10] * 1000, reference * 1000, 1)
+    assert np.array_equal(indices[:, 0], np.arange(10))
+    assert (distances[:, 0] >= 0).all()
@@ -0,0 +1,135 @@
+import pytest
+import os
+import mmap
+import pickle
+import numpy as np
+import pandas as pd
+import sys
+from sklearn import set_config
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.model_selection import GridSearchCV
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.numeric_precision import make_precision_caster
+from src.model_artifact import (save_model_artifact, load_model_artifact, read_model_metadata, load_pipeline,
+                                update_model_metadata, labels_from_probabilities)
+
+# Test files setup
+set_config(transform_output="pandas")
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').dropna()
+train_data = cleaned_data.iloc[::2]
+test_data = cleaned_data.iloc[1::2]
+artifact_dir = 'tests/test_model_artifact1'
+
+
+def fit_grid(precision='float64', drop=None):
+    preprocessor = make_column_transformer(
+        (StandardScaler(), make_column_selector(dtype_include='number')),
+        remainder='passthrough',
+        verbose_feature_names_out=False
+    )
+    if precision != 'float64':
+        preprocessor = make_pipeline(make_precision_caster(precision), preprocessor)
+    grid = GridSearchCV(
+        make_pipeline(preprocessor, KNeighborsClassifier()),
+        param_grid={"kneighborsclassifier__n_neighbors": [1, 3, 5]},
+        cv=3
+    )
+    X = train_data.drop(columns=['diagnosis'] + (drop or []))
+    return grid.fit(X, train_data['diagnosis'])
+
+# Tests
+
+# test save_model_artifact function throws an error
+# if the directory path provided is an existing file
+def test_save_model_artifact_error_on_file_path():
+    with pytest.raises(NotADirectoryError, match='The directory path provided is not a directory'):
+        save_model_artifact(fit_grid(), 'tests/conftest.py')
+
+# test save_model_artifact function throws an error
+# if the pipeline does not end in a k-nn classifier
+def test_save_model_artifact_error_on_unsupported_pipeline():
+    with pytest.raises(ValueError, match="must be a fitted KNeighborsClassifier"):
+        save_model_artifact(make_pipeline(StandardScaler()), artifact_dir)
+
+# test read_model_metadata and load_pipeline functions throw an error
+# if the artifact does not exist
+def test_load_model_artifact_error_on_missing_artifact():
+    with pytest.raises(FileNotFoundError, match='The model artifact does not exist.'):
+        read_model_metadata('tests/')
+    with pytest.raises(FileNotFoundError, match='The model path provided does not exist.'):
+        load_pipeline('tests/no_such_model')
+
+# test the artifact stores only the best estimator and its search results
+def test_save_model_artifact_metadata():
+    grid = fit_grid()
+    metadata = save_model_artifact(grid, artifact_dir)
+    assert metadata == read_model_metadata(artifact_dir)
+    assert metadata['best_params'] == {"kneighborsclassifier__n_neighbors": grid.best_params_["kneighborsclassifier__n_neighbors"]}
+    assert metadata['classes'] == ['Benign', 'Malignant']
+    assert metadata['arrays']['reference_X']['shape'] == [train_data.shape[0], train_data.shape[1] - 1]
+    assert sorted(os.listdir(artifact_dir)) == ['metadata.json', 'reference_X.npy', 'reference_y.npy',
+                                                'scaler_mean.npy', 'scaler_scale.npy']
+
+# test the loaded artifact memory-maps the reference matrix
+def test_load_model_artifact_memory_maps_reference_set():
+    save_model_artifact(fit_grid(), artifact_dir)
+    pipeline = load_model_artifact(artifact_dir, mmap_mode='r')
+    reference = pipeline[-1]._fit_X
+    while not isinstance(reference, (np.memmap, mmap.mmap)) and reference is not None:
+        reference = reference.base
+    assert reference is not None
+    assert not pipeline[-1]._fit_X.flags.writeable
+
+# test the loaded artifact reproduces the fitted pipeline's predictions,
+# ignoring extra columns and keeping the model's precision
+@pytest.mark.parametrize("precision, drop", [('float64', None),
+                                             ('float32', None),
+                                             ('float64', ['se_texture', 'max_area'])])
+def test_load_model_artifact_reproduces_predictions(precision, drop):
+    grid = fit_grid(precision, drop)
+    save_model_artifact(grid, artifact_dir)
+    pipeline = load_model_artifact(artifact_dir)
+    X_test = test_data.drop(columns=['diagnosis'] + (drop or []))
+    assert np.array_equal(pipeline.predict(test_data), grid.predict(X_test))
+    assert np.allclose(pipeline.predict_proba(test_data), grid.predict_proba(X_test))
+    assert pipeline[-1]._fit_X.dtype == np.dtype(precision)
+
+# test load_pipeline returns the best estimator of a pickled grid search
+def test_load_pipeline_from_pickle():
+    grid = fit_grid()
+    os.makedirs(artifact_dir, exist_ok=True)
+    with open(os.path.join(artifact_dir, 'grid.pickle'), 'wb') as f:
+        pickle.dump(grid, f)
+    pipeline = load_pipeline(os.path.join(artifact_dir, 'grid.pickle'))
+    X_test = test_data.drop(columns=['diagnosis'])
+    assert np.array_equal(pipeline.predict(X_test), grid.predict(X_test))
+
+# test update_model_metadata function throws an error
+# if it would replace the fields describing the stored arrays
+def test_update_model_metadata_error_on_protected_field():
+    save_model_artifact(fit_grid(), artifact_dir)
+    with pytest.raises(ValueError, match="These metadata fields cannot be updated"):
+        update_model_metadata(artifact_dir, {'classes': ['a', 'b']})
+
+# test update_model_metadata adds fields and changes the artifact version
+def test_update_model_metadata_changes_version():
+    metadata = save_model_artifact(fit_grid(), artifact_dir)
+    threshold = {'pos_label': 'Malignant', 'threshold': 0.3}
+    updated = update_model_metadata(artifact_dir, {'decision_threshold': threshold})
+    assert read_model_metadata(artifact_dir) == updated
+    assert updated['decision_threshold'] == threshold
+    assert updated['version'] != metadata['version']
+
+# test labels_from_probabilities predicts the most probable class
+# and applies a decision threshold to the positive class
+def test_labels_from_probabilities():
+    classes = ['Benign', 'Malignant']
+    probabilities = np.array([[0.8, 0.2], [0.5, 0.5], [0.3, 0.7]])
+    assert labels_from_probabilities(probabilities, classes).tolist() == ['Benign', 'Benign', 'Malignant']
+    threshold = {'pos_label': 'Malignant', 'threshold': 0.2}
+    assert labels_from_probabilities(probabilities, classes, threshold).tolist() == ['Malignant'] * 3
+    with pytest.raises(ValueError, match="A decision threshold can only be applied to a binary classifier."):
+        labels_from_probabilities(np.ones((1, 3)) / 3, ['a', 'b', 'c'], threshold)
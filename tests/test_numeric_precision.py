@@ -0,0 +1,67 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+import sys
+from sklearn import set_config
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.numeric_precision import cast_to_precision, make_precision_caster
+
+# Test files setup
+set_config(transform_output="pandas")
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').dropna()
+train_data = cleaned_data.iloc[::2]
+test_data = cleaned_data.iloc[1::2]
+
+
+def fit_pipeline(precision, n_neighbors):
+    preprocessor = make_pipeline(
+        make_precision_caster(precision),
+        make_column_transformer(
+            (StandardScaler(), make_column_selector(dtype_include='number')),
+            remainder='passthrough',
+            verbose_feature_names_out=False
+        )
+    )
+    pipeline = make_pipeline(preprocessor, KNeighborsClassifier(n_neighbors=n_neighbors))
+    return pipeline.fit(train_data.drop(columns=['diagnosis']), train_data['diagnosis'])
+
+# Tests
+
+# test cast_to_precision function throws an error
+# if the dataframe is not a dataframe
+def test_cast_to_precision_error_on_wrong_dataframe_format():
+    with pytest.raises(TypeError, match="dataframe must be a pandas data frame."):
+        cast_to_precision([1.0, 2.0], 'float32')
+
+# test cast_to_precision and make_precision_caster functions throw an error
+# if the precision is not supported
+def test_cast_to_precision_error_on_unknown_precision():
+    with pytest.raises(ValueError, match="precision must be either 'float32' or 'float64'."):
+        cast_to_precision(cleaned_data, 'float16')
+    with pytest.raises(ValueError, match="precision must be either 'float32' or 'float64'."):
+        make_precision_caster('float16')
+
+# test cast_to_precision only casts numeric columns
+def test_cast_to_precision_keeps_non_numeric_columns():
+    cast_data = cast_to_precision(cleaned_data, 'float32')
+    assert cast_data['diagnosis'].equals(cleaned_data['diagnosis'])
+    assert (cast_data.drop(columns=['diagnosis']).dtypes == np.float32).all()
+
+# test the float32 pipeline stores and computes with float32 matrices
+def test_float32_pipeline_stores_float32_reference_set():
+    pipeline = fit_pipeline('float32', n_neighbors=5)
+    assert pipeline[-1]._fit_X.dtype == np.float32
+    scaled = pipeline[:-1].transform(test_data.drop(columns=['diagnosis']))
+    assert (scaled.dtypes == np.float32).all()
+
+# regression check: float32 predictions agree with the float64 path
+@pytest.mark.parametrize("n_neighbors", [1, 5, 15])
+def test_float32_predictions_agree_with_float64(n_neighbors):
+    predicted_64 = fit_pipeline('float64', n_neighbors).predict(test_data.drop(columns=['diagnosis']))
+    predicted_32 = fit_pipeline('float32', n_neighbors).predict(test_data.drop(columns=['diagnosis']))
+    assert np.array_equal(predicted_64, predicted_32)
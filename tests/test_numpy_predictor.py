@@ -0,0 +1,102 @@
+import pytest
+import os
+import subprocess
+import numpy as np
+import pandas as pd
+import sys
+from sklearn import set_config
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.numeric_precision import make_precision_caster
+from src.model_artifact import (save_model_artifact, read_model_metadata, update_model_metadata, load_pipeline,
+                                labels_from_probabilities)
+from src.batch_predict import predict_chunk
+from src.numpy_predictor import NumpyKNNPredictor
+
+# Test files setup
+set_config(transform_output="pandas")
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').dropna()
+train_data = cleaned_data.iloc[::2]
+test_data = cleaned_data.iloc[1::2].drop(columns=['diagnosis'])
+artifact_dir = 'tests/test_numpy_predictor1'
+
+
+def fit_pipeline(precision='float64', **knn_params):
+    preprocessor = make_column_transformer(
+        (StandardScaler(), make_column_selector(dtype_include='number')),
+        remainder='passthrough',
+        verbose_feature_names_out=False
+    )
+    if precision != 'float64':
+        preprocessor = make_pipeline(make_precision_caster(precision), preprocessor)
+    pipeline = make_pipeline(preprocessor, KNeighborsClassifier(**knn_params))
+    return pipeline.fit(train_data.drop(columns=['diagnosis', 'se_texture']), train_data['diagnosis'])
+
+# Tests
+
+# test from_artifact function throws an error if the artifact does not exist
+def test_from_artifact_error_on_missing_artifact():
+    with pytest.raises(FileNotFoundError, match='The model artifact does not exist.'):
+        NumpyKNNPredictor.from_artifact('tests/no_such_artifact')
+
+# test NumpyKNNPredictor throws an error on metrics it does not implement
+def test_numpy_predictor_error_on_unsupported_metric():
+    save_model_artifact(fit_pipeline(metric='manhattan'), artifact_dir)
+    with pytest.raises(ValueError, match="Unsupported metric for the NumPy predictor: manhattan."):
+        NumpyKNNPredictor.from_artifact(artifact_dir)
+
+# test NumpyKNNPredictor throws an error on an unknown distance algorithm
+def test_numpy_predictor_error_on_unknown_algorithm():
+    save_model_artifact(fit_pipeline(), artifact_dir)
+    with pytest.raises(ValueError, match="algorithm must be one of"):
+        NumpyKNNPredictor.from_artifact(artifact_dir, algorithm='kd_tree')
+
+# test the NumPy predictor reproduces the scikit-learn pipeline's predictions
+# for both precisions, weightings and distance algorithms, across several distance blocks
+@pytest.mark.parametrize("precision, weights, algorithm", [
+    ('float64', 'uniform', 'exact'),
+    ('float32', 'uniform', 'exact'),
+    ('float64', 'distance', 'exact'),
+    ('float64', 'uniform', 'gemm'),
+    ('float32', 'uniform', 'gemm'),
+    ('float64', 'distance', 'gemm')
+])
+def test_numpy_predictor_matches_sklearn(precision, weights, algorithm):
+    cancer_fit = fit_pipeline(precision, n_neighbors=4, weights=weights)
+    save_model_artifact(cancer_fit, artifact_dir)
+    predictor = NumpyKNNPredictor.from_artifact(artifact_dir, block_bytes=20000, algorithm=algorithm)
+    assert predictor.transform(test_data).dtype == np.dtype(precision)
+    assert np.array_equal(predictor.predict(test_data), cancer_fit.predict(test_data))
+    assert np.allclose(predictor.predict_proba(test_data), cancer_fit.predict_proba(test_data))
+
+# test the NumPy predictor applies the artifact's decision threshold, like predict_chunk on the pipeline
+def test_numpy_predictor_applies_decision_threshold():
+    save_model_artifact(fit_pipeline(n_neighbors=5), artifact_dir)
+    threshold = {'pos_label': 'Malignant', 'threshold': 0.2}
+    update_model_metadata(artifact_dir, {'decision_threshold': threshold})
+    predictor = NumpyKNNPredictor.from_artifact(artifact_dir)
+    expected = labels_from_probabilities(predictor.predict_proba(test_data), predictor.classes_, threshold)
+    assert np.array_equal(predictor.predict(test_data), expected)
+    assert predictor.predict(test_data).tolist() == predict_chunk(load_pipeline(artifact_dir), test_data)['predicted'].tolist()
+    # the lower threshold predicts malignant more often than the most probable class does
+    assert (expected == 'Malignant').sum() > (predictor.predict_proba(test_data).argmax(axis=1) == 1).sum()
+
+# test arrays are accepted when they hold the feature columns in training order
+def test_numpy_predictor_accepts_arrays():
+    cancer_fit = fit_pipeline(n_neighbors=3)
+    save_model_artifact(cancer_fit, artifact_dir)
+    predictor = NumpyKNNPredictor.from_artifact(artifact_dir)
+    features = test_data[read_model_metadata(artifact_dir)['feature_names']].to_numpy()
+    assert np.array_equal(predictor.predict(features), cancer_fit.predict(test_data))
+    with pytest.raises(ValueError, match="X must have 29 feature columns."):
+        predictor.predict(features[:, 1:])
+
+# test importing the NumPy predictor does not import pandas or scikit-learn
+def test_numpy_predictor_imports_numpy_only():
+    code = ("import sys; import src.numpy_predictor; "
+            "assert 'pandas' not in sys.modules and 'sklearn' not in sys.modules")
+    subprocess.run([sys.executable, '-c', code], check=True,
+                   cwd=os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,173 @@
+import pytest
+import os
+import shutil
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.pipeline_runner import (Stage, analysis_stages, dataset_stages, hash_path, code_dependencies, stage_key,
+                                 stage_dependencies, run_pipeline)
+
+# Test files setup
+work_dir = 'tests/test_pipeline_runner1'
+
+
+def toy_stages(directory, factor=3.0):
+    # a -> b and a -> c, so b and c can run concurrently
+    def scale(name, input, factor):
+        return Stage(name, 'tests/scale_number.py',
+                     {'input': os.path.join(directory, input), 'output': os.path.join(directory, name + '.txt'),
+                      'factor': factor},
+                     inputs=[os.path.join(directory, input)], outputs=[os.path.join(directory, name + '.txt')])
+    return [scale('a', 'input.txt', 2.0), scale('b', 'a.txt', factor), scale('c', 'a.txt', 1.0)]
+
+
+def fresh_directory(name):
+    directory = os.path.join(work_dir, name)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    with open(os.path.join(directory, 'input.txt'), 'w') as f:
+        f.write('5')
+    return directory
+
+
+def read_number(path):
+    with open(path) as f:
+        return float(f.read())
+
+# Tests
+
+# test code_dependencies follows the src imports of a script recursively
+def test_code_dependencies():
+    assert code_dependencies('scripts/eda.py') == ['scripts/eda.py', 'src/feature_density.py',
+                                                   'src/figure_rendering.py', 'src/profiling.py']
+    assert 'src/knn_kernel.py' in code_dependencies('scripts/predict.py')
+
+# test hash_path hashes files and directories by content and needs an existing path
+def test_hash_path():
+    directory = fresh_directory('hash')
+    before = hash_path(directory)
+    assert hash_path(directory) == before
+    with open(os.path.join(directory, 'input.txt'), 'w') as f:
+        f.write('6')
+    assert hash_path(directory) != before
+    with pytest.raises(FileNotFoundError):
+        hash_path(os.path.join(directory, 'missing.txt'))
+
+# test stage_key changes with the options and the contents of the inputs
+def test_stage_key():
+    directory = fresh_directory('key')
+    stages = toy_stages(directory)
+    key = stage_key(stages[0])
+    assert stage_key(toy_stages(directory)[0]) == key
+    stages[0].options['factor'] = 4.0
+    assert stage_key(stages[0]) != key
+    with open(os.path.join(directory, 'input.txt'), 'w') as f:
+        f.write('6')
+    assert stage_key(toy_stages(directory)[0]) != key
+
+# test stage_dependencies finds the stages writing each stage's inputs
+def test_stage_dependencies():
+    assert stage_dependencies(toy_stages('x')) == {'a': set(), 'b': {'a'}, 'c': {'a'}}
+    dependencies = stage_dependencies(analysis_stages())
+    assert dependencies['eda'] == {'prepare'}
+    assert dependencies['fit'] == {'prepare'}
+    assert dependencies['evaluate'] == {'prepare', 'fit'}
+
+# test dataset_stages chains each data set's stages after the download, independently of the other data sets
+def test_dataset_stages():
+    stages = dataset_stages(['wdbc', 'wpbc'])
+    dependencies = stage_dependencies(stages)
+    assert dependencies['wpbc:prepare'] == {'download'}
+    assert dependencies['wpbc:fit'] == {'wpbc:prepare'}
+    assert dependencies['wpbc:evaluate'] == {'wpbc:prepare', 'wpbc:fit'}
+    by_name = {stage.name: stage for stage in stages}
+    assert by_name['wpbc:prepare'].options['dataset'] == 'wpbc'
+    assert by_name['wpbc:evaluate'].options['pos-label'] == 'Recur'
+    assert 'columns-to-drop' not in by_name['wpbc:fit'].options
+    assert by_name['wdbc:fit'].outputs == ['results/wdbc/models/cancer_pipeline', 'results/wdbc/tables/cv_results.npz']
+    with pytest.raises(ValueError, match="Unknown dataset 'x'"):
+        dataset_stages(['x'])
+
+# test stage_dependencies throws an error on duplicate names or outputs and circular dependencies
+def test_stage_dependencies_error_on_invalid_dag():
+    with pytest.raises(ValueError, match="Stage names must be unique."):
+        stage_dependencies([Stage('a', 's.py'), Stage('a', 's.py')])
+    with pytest.raises(ValueError, match="'x' is written by more than one stage."):
+        stage_dependencies([Stage('a', 's.py', outputs=['x']), Stage('b', 's.py', outputs=['x'])])
+    with pytest.raises(ValueError, match="The stages have circular dependencies."):
+        stage_dependencies([Stage('a', 's.py', inputs=['y'], outputs=['x']),
+                            Stage('b', 's.py', inputs=['x'], outputs=['y'])])
+
+# test run_pipeline runs every stage once, then only the stages whose inputs or options changed
+def test_run_pipeline_skips_unchanged_stages():
+    directory = fresh_directory('skip')
+    state_file = os.path.join(directory, 'state.json')
+    assert run_pipeline(toy_stages(directory), state_file, echo=lambda message: None) == \
+        {'a': 'ran', 'b': 'ran', 'c': 'ran'}
+    assert read_number(os.path.join(directory, 'b.txt')) == 30
+    assert run_pipeline(toy_stages(directory), state_file, echo=lambda message: None) == \
+        {'a': 'skipped', 'b': 'skipped', 'c': 'skipped'}
+    assert run_pipeline(toy_stages(directory, factor=4.0), state_file, echo=lambda message: None) == \
+        {'a': 'skipped', 'b': 'ran', 'c': 'skipped'}
+    assert read_number(os.path.join(directory, 'b.txt')) == 40
+
+# test run_pipeline reruns stages whose outputs were deleted or changed
+def test_run_pipeline_reruns_changed_outputs():
+    directory = fresh_directory('outputs')
+    state_file = os.path.join(directory, 'state.json')
+    run_pipeline(toy_stages(directory), state_file, echo=lambda message: None)
+    os.remove(os.path.join(directory, 'c.txt'))
+    with open(os.path.join(directory, 'b.txt'), 'w') as f:
+        f.write('0')
+    assert run_pipeline(toy_stages(directory), state_file, echo=lambda message: None) == \
+        {'a': 'skipped', 'b': 'ran', 'c': 'ran'}
+    assert read_number(os.path.join(directory, 'b.txt')) == 30
+
+# test a forced stage that rewrites identical outputs does not rerun the stages after it
+def test_run_pipeline_force_with_identical_outputs():
+    directory = fresh_directory('force')
+    state_file = os.path.join(directory, 'state.json')
+    run_pipeline(toy_stages(directory), state_file, echo=lambda message: None)
+    assert run_pipeline(toy_stages(directory), state_file, targets=['a'], force=True,
+                        echo=lambda message: None) == {'a': 'ran'}
+    assert run_pipeline(toy_stages(directory), state_file, echo=lambda message: None) == \
+        {'a': 'skipped', 'b': 'skipped', 'c': 'skipped'}
+
+# test run_pipeline only runs the targets and the stages they depend on
+def test_run_pipeline_targets():
+    directory = fresh_directory('targets')
+    state_file = os.path.join(directory, 'state.json')
+    assert run_pipeline(toy_stages(directory), state_file, targets=['b'], echo=lambda message: None) == \
+        {'a': 'ran', 'b': 'ran'}
+    assert not os.path.exists(os.path.join(directory, 'c.txt'))
+
+# test run_pipeline adds extra arguments to the stages that run, without changing their keys
+def test_run_pipeline_extra_arguments():
+    directory = fresh_directory('extra')
+    state_file = os.path.join(directory, 'state.json')
+    run_pipeline(toy_stages(directory), state_file, extra_arguments=['--factor=10'], echo=lambda message: None)
+    assert read_number(os.path.join(directory, 'a.txt')) == 50
+    assert run_pipeline(toy_stages(directory), state_file, echo=lambda message: None) == \
+        {'a': 'skipped', 'b': 'skipped', 'c': 'skipped'}
+
+# test run_pipeline runs independent stages in worker processes with the same results
+def test_run_pipeline_in_pool():
+    directory = fresh_directory('pool')
+    state_file = os.path.join(directory, 'state.json')
+    assert run_pipeline(toy_stages(directory), state_file, n_jobs=2, echo=lambda message: None) == \
+        {'a': 'ran', 'b': 'ran', 'c': 'ran'}
+    assert read_number(os.path.join(directory, 'b.txt')) == 30
+    assert read_number(os.path.join(directory, 'c.txt')) == 10
+    assert run_pipeline(toy_stages(directory), state_file, n_jobs=2, echo=lambda message: None) == \
+        {'a': 'skipped', 'b': 'skipped', 'c': 'skipped'}
+
+# test run_pipeline throws an error on invalid arguments or missing inputs
+def test_run_pipeline_errors():
+    directory = fresh_directory('errors')
+    state_file = os.path.join(directory, 'state.json')
+    with pytest.raises(ValueError, match="n_jobs must be a positive integer."):
+        run_pipeline(toy_stages(directory), state_file, n_jobs=0)
+    with pytest.raises(ValueError, match="Unknown stages: d."):
+        run_pipeline(toy_stages(directory), state_file, targets=['d'])
+    os.remove(os.path.join(directory, 'input.txt'))
+    with pytest.raises(FileNotFoundError, match="The input .* of stage 'a' does not exist."):
+        run_pipeline(toy_stages(directory), state_file, echo=lambda message: None)
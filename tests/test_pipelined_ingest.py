@@ -0,0 +1,143 @@
+import pytest
+import os
+import io
+import shutil
+import zipfile
+import responses
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.pipelined_ingest import extract_zip_stream, ingest
+from src.prepare_data import clean_and_validate
+from src.datasets import DATASETS
+
+# Test files setup
+work_dir = 'tests/test_pipelined_ingest1'
+os.makedirs(work_dir, exist_ok=True)
+url = 'https://example.com/files/archive.zip'
+with open('tests/test_wdbc.data', 'rb') as f:
+    wdbc_data = f.read()
+with open('tests/test_wdbc.names', 'rb') as f:
+    wdbc_names = f.read()
+
+
+class UnseekableBuffer(io.RawIOBase):
+    # zipfile writes a data descriptor after each member when it cannot seek back, like streamed archives
+    def __init__(self):
+        self.content = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.content += data
+        return len(data)
+
+
+def make_zip(members, seekable=True, compression=zipfile.ZIP_DEFLATED):
+    buffer = io.BytesIO() if seekable else UnseekableBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=compression) as zip_file:
+        for name, content in members.items():
+            zip_file.writestr(name, content)
+    return bytes(buffer.getvalue() if seekable else buffer.content)
+
+
+def split(content, size):
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+def new_directory(name):
+    directory = os.path.join(work_dir, name)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    return directory
+
+
+members = {'Index': b'index', 'wdbc.data': wdbc_data, 'subdir/test3.txt': b'', 'wdbc.names': wdbc_names}
+
+# Tests
+
+# test extract_zip_stream writes every member as zipfile would, however the bytes are split
+@pytest.mark.parametrize("seekable", [True, False])
+@pytest.mark.parametrize("compression", [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED])
+@pytest.mark.parametrize("chunk_size", [1, 7, 2 ** 16])
+def test_extract_zip_stream(seekable, compression, chunk_size):
+    directory = new_directory('extract')
+    content = make_zip(members, seekable, compression)
+    paths = list(extract_zip_stream(split(content, chunk_size), directory))
+    assert paths == [os.path.join(directory, *name.split('/')) for name in members]
+    for name, expected in members.items():
+        with open(os.path.join(directory, *name.split('/')), 'rb') as f:
+            assert f.read() == expected
+
+# test extract_zip_stream keeps members inside the directory and creates directories
+def test_extract_zip_stream_paths():
+    directory = new_directory('paths')
+    content = make_zip({'../outside.txt': b'x', '/absolute.txt': b'y', 'empty_dir/': b''})
+    assert list(extract_zip_stream([content], directory)) == [os.path.join(directory, 'outside.txt'),
+                                                               os.path.join(directory, 'absolute.txt')]
+    assert os.path.isdir(os.path.join(directory, 'empty_dir'))
+
+# test extract_zip_stream throws an error on bytes that are not a complete, valid zip file
+def test_extract_zip_stream_errors():
+    directory = new_directory('errors')
+    content = make_zip(members)
+    with pytest.raises(ValueError, match="The file is not a ZIP file."):
+        list(extract_zip_stream([b'wdbc,data'], directory))
+    with pytest.raises(ValueError, match="The ZIP file is truncated."):
+        list(extract_zip_stream([content[:200]], directory))
+    corrupt = bytearray(make_zip(members, compression=zipfile.ZIP_STORED))
+    # a byte of the first member's data, after its 30 byte header and name
+    corrupt[36] ^= 0xFF
+    with pytest.raises(ValueError, match="The ZIP member .Index. is corrupt"):
+        list(extract_zip_stream([bytes(corrupt)], directory))
+
+# test ingest downloads, extracts and cleans the data sets as read_zip then clean_and_validate would
+@responses.activate
+def test_ingest():
+    responses.add(responses.GET, url, body=make_zip(members, seekable=False))
+    directory, clean_to = new_directory('ingest'), new_directory('ingest_cleaned')
+    result = ingest(url, directory, clean_to=clean_to, datasets=['wdbc'], chunk_size=100, queue_size=2)
+    assert result['archive'] == os.path.join(directory, 'archive.zip')
+    assert zipfile.ZipFile(result['archive']).namelist() == list(members)
+    assert result['members'] == [os.path.join(directory, *name.split('/')) for name in members]
+    assert result['cleaned'] == {'wdbc': os.path.join(clean_to, 'wdbc_cleaned.csv')}
+    assert result['rows'] == {'wdbc': 10}
+    assert set(result['seconds']) == {'download', 'extract', 'parse', 'total'}
+    expected = clean_and_validate(os.path.join(directory, 'wdbc.data'), os.path.join(directory, 'wdbc.names'),
+                                  pd.read_csv(DATASETS['wdbc'].data_config_file), DATASETS['wdbc'])
+    pd.testing.assert_frame_equal(pd.read_csv(result['cleaned']['wdbc']), expected.reset_index(drop=True))
+
+# test ingest only extracts without a directory to clean to
+@responses.activate
+def test_ingest_without_cleaning():
+    responses.add(responses.GET, url, body=make_zip(members))
+    result = ingest(url, new_directory('extract_only'))
+    assert len(result['members']) == 4
+    assert result['cleaned'] == {}
+
+# test ingest throws the errors read_zip does
+@responses.activate
+def test_ingest_errors():
+    responses.add(responses.GET, 'https://example.com/missing.zip', status=404)
+    responses.add(responses.GET, 'https://example.com/files/archive.csv', body=b'')
+    responses.add(responses.GET, 'https://example.com/files/empty.zip', body=make_zip({}))
+    responses.add(responses.GET, url, body=make_zip(members)[:300])
+    with pytest.raises(ValueError, match='The URL provided does not exist.'):
+        ingest('https://example.com/missing.zip', work_dir)
+    with pytest.raises(ValueError, match='The URL provided does not point to a zip file.'):
+        ingest('https://example.com/files/archive.csv', work_dir)
+    with pytest.raises(FileNotFoundError, match='The directory provided does not exist.'):
+        ingest(url, os.path.join(work_dir, 'missing'))
+    with pytest.raises(ValueError, match='The ZIP file is empty.'):
+        ingest('https://example.com/files/empty.zip', new_directory('empty'))
+    with pytest.raises(ValueError, match='The ZIP file is truncated.'):
+        ingest(url, new_directory('truncated'), chunk_size=16, queue_size=1)
+
+# test ingest throws an error if a data set to clean is not in the zip file
+@responses.activate
+def test_ingest_error_on_missing_dataset():
+    responses.add(responses.GET, url, body=make_zip(members))
+    with pytest.raises(ValueError, match="does not have the raw data and names files of: wpbc."):
+        ingest(url, new_directory('missing_dataset'), clean_to=new_directory('missing_dataset_cleaned'),
+               datasets=['wdbc', 'wpbc'])
@@ -0,0 +1,98 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+import sys
+from sklearn import set_config
+from sklearn.compose import make_column_transformer, make_column_selector
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.batch_predict import predict_chunk
+from src.model_artifact import save_model_artifact, load_pipeline, update_model_metadata
+from src.numpy_predictor import NumpyKNNPredictor
+from src.prediction_cache import PredictionCache
+
+# Test files setup
+set_config(transform_output="pandas")
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').dropna()
+features = cleaned_data.drop(columns=['diagnosis'])
+artifact_dir = 'tests/test_prediction_cache1'
+
+cancer_fit = make_pipeline(
+    make_column_transformer(
+        (StandardScaler(), make_column_selector(dtype_include='number')),
+        remainder='passthrough',
+        verbose_feature_names_out=False
+    ),
+    KNeighborsClassifier(n_neighbors=3)
+).fit(features, cleaned_data['diagnosis'])
+save_model_artifact(cancer_fit, artifact_dir)
+
+# Tests
+
+# test PredictionCache throws an error on invalid sizes,
+# or a model without a version
+def test_prediction_cache_error_on_invalid_input():
+    with pytest.raises(ValueError, match="max_size must be a positive integer."):
+        PredictionCache(load_pipeline(artifact_dir), max_size=0)
+    with pytest.raises(ValueError, match="quantum must be positive."):
+        PredictionCache(load_pipeline(artifact_dir), quantum=0)
+    with pytest.raises(ValueError, match="model_version must be given for models without artifact metadata."):
+        PredictionCache(cancer_fit)
+
+# test cached predictions match the model's, and a repeated batch is served from the cache
+@pytest.mark.parametrize("model", [
+    load_pipeline(artifact_dir),
+    NumpyKNNPredictor.from_artifact(artifact_dir, algorithm='gemm'),
+    cancer_fit
+])
+def test_prediction_cache_matches_model(model):
+    cache = PredictionCache(model, model_version='v1')
+    assert np.allclose(cache.predict_proba(features), model.predict_proba(features))
+    assert np.array_equal(cache.predict(features), model.predict(features))
+    stats = cache.stats()
+    assert stats['misses'] == features.shape[0]
+    assert stats['hits'] == features.shape[0]
+    assert stats['hit_rate'] == 0.5
+
+# test cached predictions apply the decision threshold saved in the model artifact
+def test_prediction_cache_applies_decision_threshold():
+    threshold_dir = 'tests/test_prediction_cache2'
+    save_model_artifact(cancer_fit, threshold_dir)
+    update_model_metadata(threshold_dir, {'decision_threshold': {'pos_label': 'Malignant', 'threshold': 0.3}})
+    for model in [load_pipeline(threshold_dir), NumpyKNNPredictor.from_artifact(threshold_dir)]:
+        predicted = PredictionCache(model).predict(features)
+        assert predicted.tolist() == predict_chunk(load_pipeline(threshold_dir), features)['predicted'].tolist()
+        assert np.array_equal(predicted, NumpyKNNPredictor.from_artifact(threshold_dir).predict(features))
+    # with n_neighbors=3 a single malignant neighbour is enough
+    assert (predicted == 'Malignant').sum() > (cancer_fit.predict(features) == 'Malignant').sum()
+
+# test rows that only differ by floating point noise, or repeat within a batch,
+# share one cache entry
+def test_prediction_cache_canonicalizes_rows():
+    cache = PredictionCache(load_pipeline(artifact_dir))
+    noisy = pd.concat([features.iloc[:5], features.iloc[:5] * (1 + 1e-12)], ignore_index=True)
+    cache.predict_proba(noisy)
+    assert cache.stats()['size'] == 5
+    assert cache.stats()['misses'] == 5
+
+# test the model version is part of the key
+def test_prediction_cache_keys_include_model_version():
+    model = load_pipeline(artifact_dir)
+    scaled = model[:-1].transform(features.iloc[:3])
+    assert PredictionCache(model).row_keys(scaled) == PredictionCache(model).row_keys(scaled)
+    assert PredictionCache(model).row_keys(scaled) != PredictionCache(model, model_version='other').row_keys(scaled)
+
+# test the least recently used rows are evicted once the cache is full
+def test_prediction_cache_evicts_least_recently_used():
+    cache = PredictionCache(load_pipeline(artifact_dir), max_size=3)
+    cache.predict_proba(features.iloc[[0, 1, 2]])
+    cache.predict_proba(features.iloc[[0]])
+    cache.predict_proba(features.iloc[[3]])
+    assert cache.stats()['evictions'] == 1
+    cache.predict_proba(features.iloc[[0, 2, 3]])
+    assert cache.stats()['hits'] == 4
+    cache.predict_proba(features.iloc[[1]])
+    assert cache.stats()['misses'] == 5
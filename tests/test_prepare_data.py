@@ -0,0 +1,80 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+import pandera as pa
+import sys
+from sklearn import config_context
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.prepare_data import read_column_names, clean_and_validate, make_preprocessor, split_and_scale
+from src.datasets import DATASETS
+
+# Test files setup
+data_config = pd.read_csv('tests/test_data_config.csv')
+bcw_data_config = pd.read_csv('tests/test_bcw_data_config.csv')
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').rename(columns={'diagnosis': 'class'})
+
+# Tests
+
+# test read_column_names reads the column names from a .names file
+def test_read_column_names():
+    colnames = read_column_names('tests/test_wdbc.names')
+    assert len(colnames) == 32
+    assert colnames[:3] == ['id_number', 'diagnosis', 'mean_radius']
+
+# test read_column_names throws an error if the .names file does not exist
+def test_read_column_names_error_on_missing_file():
+    with pytest.raises(FileNotFoundError, match="The name_file file does not exist."):
+        read_column_names('tests/missing.names')
+
+# test clean_and_validate returns the cleaned data without the id column
+def test_clean_and_validate():
+    cancer = clean_and_validate('tests/test_wdbc.data', 'tests/test_wdbc.names', data_config)
+    assert isinstance(cancer, pd.DataFrame)
+    assert cancer.shape == (10, 31)
+    assert 'id_number' not in cancer.columns
+    assert set(cancer['diagnosis']) == {'Malignant'}
+
+# test clean_and_validate throws an error if the data does not conform to the configuration
+def test_clean_and_validate_error_on_invalid_data():
+    strict_config = data_config.copy()
+    strict_config.loc[strict_config['column'] == 'mean_radius', 'max'] = 10
+    with pytest.raises(pa.errors.SchemaErrors):
+        clean_and_validate('tests/test_wdbc.data', 'tests/test_wdbc.names', strict_config)
+
+# test clean_and_validate reads, cleans and validates another data set of the archive by its spec;
+# its samples may share scores, and rows with missing values are dropped after validation
+def test_clean_and_validate_dataset():
+    bcw = clean_and_validate('tests/test_bcw.data', 'tests/test_bcw.names', bcw_data_config,
+                             DATASETS['breast-cancer-wisconsin'])
+    assert bcw.shape == (9, 10)
+    assert 'sample_code_number' not in bcw.columns
+    assert bcw['class'].value_counts().to_dict() == {'Benign': 8, 'Malignant': 1}
+    assert bcw.duplicated().sum() == 1
+
+# test make_preprocessor casts the precision before scaling only for float32
+def test_make_preprocessor():
+    assert isinstance(make_preprocessor(), ColumnTransformer)
+    preprocessor = make_preprocessor('float32')
+    assert isinstance(preprocessor, Pipeline)
+    assert isinstance(preprocessor[-1], ColumnTransformer)
+
+# test split_and_scale returns stratified train and test sets, scaled on the train set
+def test_split_and_scale():
+    with config_context(transform_output="pandas"):
+        split = split_and_scale(cleaned_data, make_preprocessor(), random_state=522)
+    assert split['train'].shape == (70, 31)
+    assert split['test'].shape == (30, 31)
+    assert split['train']['class'].value_counts()['Malignant'] == 27
+    assert np.allclose(split['scaled_train'].drop(columns=['class']).mean(), 0)
+    assert split['scaled_test'].index.equals(split['test'].index)
+    assert list(split['scaled_train']['class']) == list(split['train']['class'])
+
+# test split_and_scale throws an error on a wrong input type or a missing class column
+def test_split_and_scale_error_on_invalid_input():
+    with pytest.raises(TypeError, match="cleaned_data must be a pandas data frame."):
+        split_and_scale([1, 2, 3], make_preprocessor())
+    with pytest.raises(ValueError, match="The class column 'class' is not in the data frame."):
+        split_and_scale(cleaned_data.drop(columns=['class']), make_preprocessor())
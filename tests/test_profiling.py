@@ -0,0 +1,134 @@
+import pytest
+import os
+import glob
+import pstats
+import tracemalloc
+import sys
+import click
+import numpy as np
+from click.testing import CliRunner
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiling import (record_rows, profile_arguments, peak_rss_mb, append_to_manifest, read_manifest,
+                           run_profiled, profiled)
+from src.cli import load_command
+
+# Test files setup
+work_dir = 'tests/test_profiling1'
+os.makedirs(work_dir, exist_ok=True)
+
+
+def fresh_manifest(name):
+    manifest = os.path.join(work_dir, name + '.jsonl')
+    if os.path.exists(manifest):
+        os.remove(manifest)
+    return manifest
+
+
+def allocate(n_rows, fail=False):
+    # holds n_rows KiB when it returns
+    data = bytearray(n_rows * 1024)
+    record_rows(n_rows)
+    if fail:
+        raise RuntimeError("Stage failed.")
+    return len(data) // 1024
+
+
+@click.command()
+@click.option('--n-rows', type=int, default=1024)
+@profiled
+def toy_stage(n_rows):
+    allocate(n_rows)
+    click.echo(f"options: {n_rows}")
+
+# Tests
+
+# test record_rows and profile_arguments do nothing when no run is profiled
+def test_no_active_run():
+    record_rows(10)
+    assert profile_arguments() == []
+
+# test peak_rss_mb reports the peak resident memory of the process
+def test_peak_rss_mb():
+    assert peak_rss_mb() > 1
+
+# test records appended to the manifest are read back in order
+def test_append_and_read_manifest():
+    manifest = fresh_manifest('append')
+    append_to_manifest({'stage': 'a', 'path': work_dir}, manifest)
+    append_to_manifest({'stage': 'b', 'value': np.int64(3)}, manifest)
+    assert read_manifest(manifest) == [{'stage': 'a', 'path': work_dir}, {'stage': 'b', 'value': '3'}]
+
+# test read_manifest throws an error if the manifest does not exist
+def test_read_manifest_error_on_missing_file():
+    with pytest.raises(FileNotFoundError, match="The manifest file does not exist."):
+        read_manifest(os.path.join(work_dir, 'missing.jsonl'))
+
+# test run_profiled records time, memory, top allocations and rows of a call
+def test_run_profiled():
+    manifest = fresh_manifest('run')
+    assert run_profiled(allocate, (1024,), {}, 'allocate', manifest) == 1024
+    [record] = read_manifest(manifest)
+    assert record['stage'] == 'allocate'
+    assert record['status'] == 'ok'
+    assert record['wall_s'] > 0 and record['cpu_s'] > 0
+    assert record['peak_traced_mb'] >= 1
+    assert record['rows'] == 1024
+    assert record['rows_per_s'] == pytest.approx(1024 / record['wall_s'])
+    # the buffer is still held when the function returns, so it is the top allocation
+    assert record['top_allocations'][0]['location'].startswith(os.path.abspath(__file__))
+    assert record['top_allocations'][0]['size_mb'] == pytest.approx(1, rel=0.01)
+    assert not tracemalloc.is_tracing()
+
+# test run_profiled records a failed call and re-raises its exception
+def test_run_profiled_error():
+    manifest = fresh_manifest('error')
+    with pytest.raises(RuntimeError, match="Stage failed."):
+        run_profiled(allocate, (16,), {'fail': True}, 'allocate', manifest)
+    [record] = read_manifest(manifest)
+    assert record['status'] == 'RuntimeError'
+    assert record['options'] == {'fail': True}
+    assert not tracemalloc.is_tracing()
+
+# test nested runs are recorded separately, and the outer run's peak includes the inner run's
+def test_run_profiled_nested():
+    manifest = fresh_manifest('nested')
+
+    def outer():
+        assert profile_arguments() == ['--profile', f'--manifest={manifest}']
+        run_profiled(allocate, (2048,), {}, 'inner', manifest)
+        record_rows(5)
+    run_profiled(outer, (), {}, 'outer', manifest)
+    inner, outer_record = read_manifest(manifest)
+    assert (inner['stage'], inner['rows']) == ('inner', 2048)
+    assert (outer_record['stage'], outer_record['rows']) == ('outer', 5)
+    assert outer_record['peak_traced_mb'] >= inner['peak_traced_mb'] >= 2
+    assert not tracemalloc.is_tracing()
+
+# test run_profiled writes cProfile statistics when asked
+def test_run_profiled_stats():
+    manifest = fresh_manifest('stats')
+    stats_to = os.path.join(work_dir, 'allocate.prof')
+    run_profiled(allocate, (16,), {}, 'allocate', manifest, stats_to=stats_to)
+    assert read_manifest(manifest)[0]['profile_stats'] == stats_to
+    assert any(function[2] == 'allocate' for function in pstats.Stats(stats_to).stats)
+
+# test a profiled command runs as before without --profile and is recorded with it
+def test_profiled_command():
+    manifest = fresh_manifest('command')
+    result = CliRunner().invoke(toy_stage, ['--n-rows=64', f'--manifest={manifest}'])
+    assert result.exit_code == 0
+    assert result.output == "options: 64\n"
+    assert not os.path.exists(manifest)
+
+    result = CliRunner().invoke(toy_stage, ['--n-rows=64', '--profile', f'--manifest={manifest}'])
+    assert result.exit_code == 0
+    [record] = read_manifest(manifest)
+    assert record['stage'] == 'test_profiling'
+    assert record['options'] == {'n_rows': 64}
+    assert record['rows'] == 64
+
+# test every script has the profiling options
+def test_scripts_are_profiled():
+    for script in glob.glob('scripts/*.py'):
+        names = [param.name for param in load_command(script).params]
+        assert {'profile', 'profile_stats', 'manifest'} <= set(names), script
@@ -0,0 +1,115 @@
+import pytest
+import os
+import glob
+import json
+import shutil
+import sys
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.sharded_data import find_shards, clean_and_validate_shards, write_report
+from src.prepare_data import read_column_names, clean_and_validate
+
+# Test files setup
+work_dir = 'tests/test_sharded_data1'
+os.makedirs(work_dir, exist_ok=True)
+data_config = pd.read_csv('tests/test_data_config.csv')
+colnames = read_column_names('tests/test_wdbc.names')
+with open('tests/test_wdbc.data') as f:
+    raw_lines = f.readlines()
+
+
+def write_shards(name, lines_per_shard):
+    # splits the 10 test rows into shards of the given sizes
+    directory = os.path.join(work_dir, name)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    start = 0
+    for i, n_lines in enumerate(lines_per_shard):
+        with open(os.path.join(directory, f"day_{i:02d}.data"), 'w') as f:
+            f.writelines(raw_lines[start:start + n_lines])
+        start += n_lines
+    return directory
+
+
+def read_partitions(directory):
+    return pd.concat([pd.read_csv(path) for path in sorted(glob.glob(os.path.join(directory, '*.csv')))],
+                     ignore_index=True)
+
+# Tests
+
+# test find_shards lists a directory, a glob pattern or a single file
+def test_find_shards():
+    directory = write_shards('find', [4, 3, 3])
+    open(os.path.join(directory, '.hidden'), 'w').close()
+    expected = [os.path.join(directory, f"day_{i:02d}.data") for i in range(3)]
+    assert find_shards(directory) == expected
+    assert find_shards(os.path.join(directory, 'day_0[12].data')) == expected[1:]
+    assert find_shards(expected[0]) == expected[:1]
+
+# test find_shards throws an error if no file matches
+def test_find_shards_error_on_no_match():
+    with pytest.raises(FileNotFoundError, match="No raw data files match"):
+        find_shards(os.path.join(work_dir, 'missing_*.data'))
+
+# test the partitions of valid shards hold the same data as cleaning the whole file, with any number of workers
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_clean_and_validate_shards(n_jobs):
+    shards = find_shards(write_shards('valid', [4, 0, 3, 3]))
+    partitions_to = os.path.join(work_dir, f'valid_partitions_{n_jobs}')
+    report = clean_and_validate_shards(shards, colnames, data_config, partitions_to, n_jobs=n_jobs)
+    assert report['valid']
+    assert report['rows'] == 10
+    assert report['duplicate_rows'] == 0
+    assert report['partitions'] == partitions_to
+    assert [shard['rows'] for shard in report['shards']] == [4, 0, 3, 3]
+    # the empty shard has no partition
+    assert sorted(os.listdir(partitions_to)) == ['part-00000.csv', 'part-00002.csv', 'part-00003.csv']
+    expected = clean_and_validate('tests/test_wdbc.data', 'tests/test_wdbc.names', data_config)
+    pd.testing.assert_frame_equal(read_partitions(partitions_to), expected)
+    assert not os.path.exists(partitions_to + '.tmp')
+
+# test the null fractions are checked across all shards, not per shard
+def test_clean_and_validate_shards_null_fraction():
+    directory = write_shards('nulls', [2, 8])
+    # 1 of 2 rows of the first shard, but 1 of 10 rows overall, is missing its mean radius (max_nullable 0.1)
+    with open(os.path.join(directory, 'day_00.data'), 'w') as f:
+        f.write(raw_lines[0].replace(',M,17.99,', ',M,,') + raw_lines[1])
+    report = clean_and_validate_shards(find_shards(directory), colnames, data_config,
+                                       os.path.join(work_dir, 'nulls_partitions'))
+    assert report['valid']
+    assert report['null_fractions']['mean_radius'] == pytest.approx(0.1)
+
+    with open(os.path.join(directory, 'day_01.data'), 'a') as f:
+        f.write(raw_lines[2].replace(',M,19.69,', ',M,,').replace('84300903', '1'))
+    report = clean_and_validate_shards(find_shards(directory), colnames, data_config,
+                                       os.path.join(work_dir, 'nulls_partitions_2'))
+    assert not report['valid']
+    assert [failure['column'] for failure in report['global_failures']] == ['mean_radius']
+    assert not os.path.exists(os.path.join(work_dir, 'nulls_partitions_2'))
+
+# test rows duplicated across shards and invalid rows fail validation, and no partitions are written
+def test_clean_and_validate_shards_invalid():
+    directory = write_shards('invalid', [5, 5])
+    with open(os.path.join(directory, 'day_01.data'), 'a') as f:
+        f.write(raw_lines[0].replace('842302', '1'))
+        f.write(raw_lines[3].replace(',M,11.42,', ',M,99,'))
+    partitions_to = os.path.join(work_dir, 'invalid_partitions')
+    report = clean_and_validate_shards(find_shards(directory), colnames, data_config, partitions_to, n_jobs=2)
+    assert not report['valid']
+    assert report['duplicate_rows'] == 1
+    assert report['global_failures'][0]['check'] == "Duplicate rows found."
+    assert [shard['failures'] for shard in report['shards']] == [0, 1]
+    assert report['shards'][1]['failure_cases'][0]['column'] == 'mean_radius'
+    assert report['partitions'] is None
+    assert not os.path.exists(partitions_to)
+
+    write_report(report, os.path.join(work_dir, 'report', 'validation_report.json'))
+    with open(os.path.join(work_dir, 'report', 'validation_report.json')) as f:
+        assert json.load(f)['duplicate_rows'] == 1
+
+# test clean_and_validate_shards throws an error on invalid arguments
+def test_clean_and_validate_shards_errors():
+    with pytest.raises(ValueError, match="shards must not be empty."):
+        clean_and_validate_shards([], colnames, data_config, work_dir)
+    with pytest.raises(ValueError, match="n_jobs must be a positive integer."):
+        clean_and_validate_shards(['tests/test_wdbc.data'], colnames, data_config, work_dir, n_jobs=0)
@@ -0,0 +1,103 @@
+import pytest
+import os
+import zipfile
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.synthetic_data import fit_generator, generate_rows, to_raw_text, write_synthetic_data
+from src.prepare_data import clean_and_validate
+
+# Test files setup
+os.makedirs('tests/test_synthetic_data1', exist_ok=True)
+data_config = pd.read_csv('tests/test_data_config.csv')
+# the cleaned test data in the raw layout: an id column and the class column first
+raw_data = pd.read_csv('tests/test_cleaned_data.csv')
+raw_data.insert(0, 'id_number', np.arange(1, raw_data.shape[0] + 1) * 11)
+raw_data['diagnosis'] = raw_data['diagnosis'].map({'Malignant': 'M', 'Benign': 'B'})
+features = list(raw_data.columns[2:])
+generator = fit_generator(raw_data, data_config)
+config = data_config.set_index('column').loc[features]
+
+# Tests
+
+# test generate_rows returns rows in the raw layout, with the class frequencies of the data
+def test_generate_rows():
+    rows = generate_rows(generator, 5000, start_id=101, random_state=1)
+    assert list(rows.columns) == list(raw_data.columns)
+    assert list(rows['id_number']) == list(range(101, 5101))
+    assert rows['diagnosis'].value_counts(normalize=True)['B'] == pytest.approx(61 / 99, abs=0.03)
+    assert not rows.duplicated().any()
+
+# test generated features stay within the range of the data and the data configuration
+def test_generate_rows_ranges():
+    rows = generate_rows(generator, 5000, random_state=2)
+    assert (rows[features].min() >= raw_data[features].min()).all()
+    assert (rows[features].max() <= raw_data[features].max()).all()
+    assert (rows[features].min() >= config['min']).all()
+    assert (rows[features].max() <= config['max']).all()
+
+# test generated features keep the class-conditional correlations of the data
+def test_generate_rows_correlations():
+    rows = generate_rows(generator, 20000, random_state=3)
+    for label in ['M', 'B']:
+        expected = raw_data.loc[raw_data['diagnosis'] == label, features].corr(method='spearman')
+        actual = rows.loc[rows['diagnosis'] == label, features].corr(method='spearman')
+        assert np.abs(expected - actual).to_numpy().mean() < 0.06
+
+# test generate_rows writes the requested fraction of missing values in every feature
+def test_generate_rows_null_fraction():
+    rows = generate_rows(generator, 1000, null_fraction=0.05, random_state=4)
+    assert (rows[features].isna().mean() == 0.05).all()
+    assert rows[['id_number', 'diagnosis']].notna().all().all()
+
+# test generate_rows throws errors on invalid arguments
+def test_generate_rows_errors():
+    with pytest.raises(ValueError, match="n_rows must be a positive integer."):
+        generate_rows(generator, 0)
+    with pytest.raises(ValueError, match="null_fraction must be between 0 and the max_nullable of every feature."):
+        generate_rows(generator, 10, null_fraction=0.5)
+
+# test fit_generator throws errors on invalid data
+def test_fit_generator_errors():
+    with pytest.raises(TypeError, match="data and data_config must be pandas data frames."):
+        fit_generator(raw_data.to_numpy(), data_config)
+    with pytest.raises(ValueError, match="The column 'id' is not in the data frame."):
+        fit_generator(raw_data, data_config, id_column='id')
+    with pytest.raises(ValueError, match="The feature columns must not have missing values."):
+        fit_generator(raw_data.assign(mean_radius=np.nan), data_config)
+    with pytest.raises(ValueError, match="The class 'X' must have at least two rows."):
+        fit_generator(pd.concat([raw_data, raw_data.iloc[:1].assign(diagnosis='X')]), data_config)
+
+# test to_raw_text matches pandas' CSV output, with missing values as empty fields
+def test_to_raw_text():
+    rows = generate_rows(generator, 200, null_fraction=0.05, random_state=5)
+    expected = rows.to_csv(header=False, index=False, float_format='%.6g')
+    assert to_raw_text(rows, generator).decode() == expected
+
+# test write_synthetic_data writes the same rows in CSV and zip files whatever the number of workers
+def test_write_synthetic_data():
+    write_synthetic_data(generator, 'tests/test_synthetic_data1/one.csv', 2500, chunk_size=1000, random_state=6)
+    write_synthetic_data(generator, 'tests/test_synthetic_data1/two.zip', 2500, chunk_size=1000, n_jobs=2,
+                         random_state=6)
+    with open('tests/test_synthetic_data1/one.csv', 'rb') as f:
+        text = f.read()
+    with zipfile.ZipFile('tests/test_synthetic_data1/two.zip') as archive:
+        assert archive.namelist() == ['wdbc.data']
+        assert archive.read('wdbc.data') == text
+    written = pd.read_csv('tests/test_synthetic_data1/one.csv', header=None)
+    assert written.shape == (2500, 32)
+    assert list(written[0]) == list(range(1, 2501))
+
+# test written synthetic data passes the cleaning and validation of the raw data
+def test_write_synthetic_data_validates():
+    write_synthetic_data(generator, 'tests/test_synthetic_data1/wdbc.data', 1000, null_fraction=0.05, random_state=7)
+    cancer = clean_and_validate('tests/test_synthetic_data1/wdbc.data', 'tests/test_wdbc.names', data_config)
+    assert cancer.shape == (1000, 31)
+
+# test write_synthetic_data throws errors on invalid arguments
+def test_write_synthetic_data_errors():
+    with pytest.raises(ValueError, match="The output file must end in one of"):
+        write_synthetic_data(generator, 'tests/test_synthetic_data1/data.json', 10)
+    with pytest.raises(ValueError, match="chunk_size must be a positive integer."):
+        write_synthetic_data(generator, 'tests/test_synthetic_data1/data.csv', 10, chunk_size=0)
@@ -0,0 +1,76 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+import sys
+from sklearn.model_selection import GridSearchCV
+from sklearn.neighbors import KNeighborsClassifier
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.tuning_cache import hash_inputs, hash_file, write_cv_results, read_cache_key, read_cv_results
+
+# Test files setup
+cleaned_data = pd.read_csv('tests/test_cleaned_data.csv').dropna()
+params = {'parameter_grid': {'n_neighbors': [1, 3, 5]}, 'cv': 3}
+
+grid = GridSearchCV(
+    KNeighborsClassifier(),
+    param_grid={'n_neighbors': [1, 3, 5], 'weights': ['uniform', 'distance']},
+    cv=3
+).fit(cleaned_data.drop(columns=['diagnosis']), cleaned_data['diagnosis'])
+
+if not os.path.exists('tests/test_tuning_cache1'):
+    os.makedirs('tests/test_tuning_cache1')
+cv_results_path = 'tests/test_tuning_cache1/cv_results.npz'
+
+# Tests
+
+# test hash_inputs function throws an error
+# if the dataframe is not a dataframe or params is not a dictionary
+def test_hash_inputs_error_on_wrong_input_format():
+    with pytest.raises(TypeError, match="dataframe must be a pandas data frame."):
+        hash_inputs([1, 2, 3], params)
+    with pytest.raises(TypeError, match="params must be a dictionary."):
+        hash_inputs(cleaned_data, [1, 2, 3])
+
+# test hash_inputs is stable for unchanged inputs
+# and changes when the data or parameters change
+def test_hash_inputs_changes_with_inputs():
+    key = hash_inputs(cleaned_data, params)
+    assert key == hash_inputs(cleaned_data.copy(), dict(params))
+    changed_data = cleaned_data.copy()
+    changed_data.iloc[0, 1] += 1
+    assert key != hash_inputs(changed_data, params)
+    assert key != hash_inputs(cleaned_data, {**params, 'cv': 5})
+    assert key != hash_inputs(cleaned_data.astype({'mean_radius': np.float32}), params)
+
+# test hash_file function returns the same digest for the same contents
+def test_hash_file():
+    assert hash_file('tests/test_wdbc.data') == hash_file('tests/test_wdbc.data')
+    assert hash_file('tests/test_wdbc.data') != hash_file('tests/test_wdbc.names')
+
+# test write_cv_results function throws an error
+# if cv_results is not a dictionary or the directory does not exist
+def test_write_cv_results_error_on_wrong_input():
+    with pytest.raises(TypeError, match="cv_results must be a dictionary."):
+        write_cv_results([1, 2, 3], cv_results_path, 'key')
+    with pytest.raises(FileNotFoundError, match='The directory provided does not exist.'):
+        write_cv_results(grid.cv_results_, 'tests/no_such_dir/cv_results.npz', 'key')
+
+# test read_cv_results function throws an error if the file does not exist
+# and read_cache_key returns None (a cache miss)
+def test_read_cv_results_missing_file():
+    with pytest.raises(FileNotFoundError, match='The cv_results file does not exist.'):
+        read_cv_results('tests/test_tuning_cache1/missing.npz')
+    assert read_cache_key('tests/test_tuning_cache1/missing.npz') is None
+
+# test cv_results round trip through the columnar file without pickling
+def test_cv_results_round_trip():
+    write_cv_results(grid.cv_results_, cv_results_path, 'key-1')
+    assert read_cache_key(cv_results_path) == 'key-1'
+    cv_results = read_cv_results(cv_results_path)
+    assert cv_results.shape[0] == 6
+    assert cv_results['params'].tolist() == grid.cv_results_['params']
+    assert np.array_equal(cv_results['mean_test_score'], grid.cv_results_['mean_test_score'])
+    assert cv_results['param_n_neighbors'].tolist() == list(grid.cv_results_['param_n_neighbors'])
+    best = cv_results.loc[cv_results['rank_test_score'].idxmin(), 'params']
+    assert best == grid.best_params_
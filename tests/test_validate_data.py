@@ -156,3 +156,11 @@ def test_validate_data_error_on_invalid_dataframe_type():
 def test_valid_w_invalid_data(invalid_data, description):
     with pytest.raises(pa.errors.SchemaErrors):
         validate_data(schema=valid_schema, dataframe=invalid_data)
+
+# test build_schema_from_DataFrame skips the duplicate rows check without unique_rows
+def test_build_schema_from_DataFrame_without_unique_rows():
+    schema = build_schema_from_DataFrame(data_config=data_config_df, expected_columns=colnames, unique_rows=False)
+    validated = validate_data(schema=schema, dataframe=case_duplicate)
+    assert validated.shape == case_duplicate.shape
+    with pytest.raises(pa.errors.SchemaErrors):
+        validate_data(schema=schema, dataframe=case_missing_obs)